@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Benchmarks for decoration, loading and execution
+
+Summary :
+    Measures the main costs of the framework as the number of test cases
+    grows, and writes the measurements as JSON so that they can be compared
+    between releases.
+
+Use Case :
+    As a maintainer I want to measure the cost of generating, decorating,
+    loading and executing test methods So that performance regressions are
+    detected.
+
+Measurements (for each number of test cases) :
+    generate_seconds : GenerateTestMethods.__call__
+    decorate_seconds : applying several stacked DecorateTestMethod decorators
+                       (zero with --fused, where they are applied during
+                       generation)
+    load_seconds : unittest.TestLoader.loadTestsFromTestCase
+    run_seconds : executing the loaded suite
+    run_overhead_per_test_us : run_seconds per test method in microseconds
+    peak_bytes_per_case : tracemalloc peak during generation per test case
+
+Usage (from the root of the repository) :
+    $ PYTHONPATH=. python benchmarks/bench_repeatedtestframework.py \
+          --sizes 100 1000 --output bench_output.json
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+import repeatedtestframework
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import DecorateTestMethod
+from repeatedtestframework import expectedFailure
+from repeatedtestframework import skip
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000, 1000000]
+
+
+# noinspection PyUnusedLocal
+def _wrapper(index, a, b):
+    """A trivial test method, so the framework overhead dominates"""
+
+    # noinspection PyShadowingNames
+    def test_method(self):
+        pass
+
+    return test_method
+
+
+def _test_cases(size):
+    return [{'a': i, 'b': i + 1} for i in range(size)]
+
+
+def _new_class():
+    return type('BenchmarkCases', (unittest.TestCase, object), {})
+
+
+def _decorators(count):
+    """A list of count decorators, each matching a fraction of the cases"""
+    available = [
+        lambda: skip('benchmark skip',
+                     criteria=lambda data: data['a'] % 97 == 0),
+        lambda: expectedFailure(criteria=lambda data: data['a'] % 89 == 0),
+        lambda: DecorateTestMethod(criteria=lambda data: data['a'] % 83 == 0,
+                                   decorator_method=lambda method: method),
+    ]
+    return [available[i % len(available)]() for i in range(count)]
+
+
+def _timed(func, *args):
+    """Return the result of func and the elapsed time in seconds"""
+    gc.collect()
+    start = time.perf_counter() if hasattr(time, 'perf_counter') \
+        else time.time()
+    result = func(*args)
+    end = time.perf_counter() if hasattr(time, 'perf_counter') \
+        else time.time()
+    return result, end - start
+
+
+def measure(size, decorators=3, lazy=False, run=True, fused=False):
+    """Measure each of the costs for the given number of test cases"""
+    cases = _test_cases(size)
+    measurement = {'cases': size, 'decorators': decorators, 'lazy': lazy,
+                   'fused': fused}
+
+    generator = GenerateTestMethods(
+        test_name='Benchmark',
+        test_method=_wrapper,
+        test_cases=cases,
+        lazy=lazy,
+        decorators=_decorators(decorators) if fused else None)
+
+    # Memory is measured separately, as tracing slows the generation
+    if tracemalloc is not None:
+        tracemalloc.start()
+        generator(_new_class())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        measurement['peak_bytes_per_case'] = peak / float(size)
+
+    cls, measurement['generate_seconds'] = _timed(generator, _new_class())
+
+    def decorate(cls_):
+        for decorator in _decorators(0 if fused else decorators):
+            cls_ = decorator(cls_)
+        return cls_
+
+    cls, measurement['decorate_seconds'] = _timed(decorate, cls)
+
+    loader = unittest.TestLoader()
+    suite, measurement['load_seconds'] = _timed(
+        loader.loadTestsFromTestCase, cls)
+
+    if run:
+        _, seconds = _timed(suite.run, unittest.TestResult())
+        measurement['run_seconds'] = seconds
+        measurement['run_overhead_per_test_us'] = seconds * 1e6 / size
+    return measurement
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the repeated test framework')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='numbers of test cases to measure')
+    parser.add_argument('--decorators', type=int, default=3,
+                        help='number of stacked decorators')
+    parser.add_argument('--lazy', action='store_true',
+                        help='generate the test methods lazily')
+    parser.add_argument('--fused', action='store_true',
+                        help='apply the decorators during generation')
+    parser.add_argument('--no-run', dest='run', action='store_false',
+                        help='do not execute the test methods')
+    parser.add_argument('--output', default=None,
+                        help='file to write the JSON results to '
+                             '(default is standard output)')
+    args = parser.parse_args(argv)
+
+    report = {
+        'framework_version': repeatedtestframework.__version__,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'results': [measure(size, args.decorators, args.lazy, args.run,
+                            args.fused)
+                    for size in args.sizes],
+    }
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
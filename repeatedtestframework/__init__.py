@@ -3,6 +3,34 @@ from .repeatedtestframework import GenerateTestMethods,\
                                     skip,\
                                     skipIf,\
                                     skipUnless,\
-                                    expectedFailure
+                                    expectedFailure,\
+                                    MethodRegistry,\
+                                    case_digest
+from .criteria import Criteria
+from .sources import CaseSource,\
+                     CSVSource,\
+                     JSONLSource,\
+                     NDJSONSource
+from .fixtures import FixtureCache
+from .combinations import CombinationCase,\
+                          Combinations
+from .instrumentation import CaseTiming,\
+                             Instrumentation
+from .scheduling import DurationHistory,\
+                        ResultStore,\
+                        lpt_partition
+from .caching import ResultCache
+from .loader import RegistryLoader
+from .runners import PrioritySuite,\
+                     ProcessPoolSuite,\
+                     ThreadPoolSuite
+from six import PY2 as _PY2
+if not _PY2:
+    from .asyncsupport import AsyncioSuite
+    from .payloads import MappedPayloadStore,\
+                          Payload,\
+                          PayloadCase,\
+                          PayloadSource,\
+                          SharedPayloadStore
 from . import version
 from .version import __version__
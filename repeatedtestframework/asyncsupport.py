@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.asyncsupport : Coroutine test methods
+
+Summary :
+    Support for test methods which are coroutine functions, either executed
+    one at a time on their own event loop, or executed concurrently on a
+    single event loop.
+
+Use Case :
+    As a user I want to write my test methods as coroutines, so that I do
+    not need to create an event loop within every test method.
+
+Testable Statements :
+    Can I generate test methods which are coroutine functions
+    Can I execute the coroutine test methods of a class concurrently
+    Are failures, skips and expected failures reported as normal
+
+.. note::
+
+    This module requires Python 3.5 or later.
+"""
+import asyncio
+import functools
+import sys
+import unittest
+from concurrent import futures as _futures
+
+from .runners import _GeneratedTestSuite, _RecordingResult,\
+    _ResultAggregator
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+def synchronous(coroutine_function):
+    """Wrap a coroutine test method so that it can be called as normal
+
+       Each call executes the coroutine on a new event loop. The original
+       coroutine function is kept as the ``_rtf_coroutine`` attribute so that
+       it can be executed directly by the :class:`AsyncioSuite`, as long as
+       the test method has not been wrapped since.
+    """
+    @functools.wraps(coroutine_function)
+    def test_method(self):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine_function(self))
+        finally:
+            loop.close()
+
+    test_method._rtf_coroutine = coroutine_function
+    test_method._rtf_synchronous = test_method
+    return test_method
+
+
+def _direct_coroutine(method):
+    """The coroutine function of a test method which can be awaited directly
+
+       Returns None unless the test method is exactly the wrapper created by
+       :func:`synchronous`; functools.wraps copies the attributes of the
+       wrapper onto any decorator, so the identity of the wrapper is checked.
+    """
+    function = getattr(method, '__func__', method)
+    if getattr(function, '_rtf_synchronous', None) is function:
+        return function._rtf_coroutine
+    return None
+
+
+async def _run_test(test, coroutine_function, result):
+    """Execute a single coroutine test method, reporting into result"""
+    method = getattr(test, test._testMethodName)
+    expecting_failure = (
+        getattr(method, '__unittest_expecting_failure__', False) or
+        getattr(test, '__unittest_expecting_failure__', False))
+
+    result.startTest(test)
+    try:
+        # A skip decorator may be applied to the class or the method
+        for item in (type(test), method):
+            if getattr(item, '__unittest_skip__', False):
+                result.addSkip(test,
+                               getattr(item, '__unittest_skip_why__', ''))
+                return
+
+        try:
+            test.setUp()
+        except unittest.SkipTest as exc:
+            result.addSkip(test, str(exc))
+            return
+        except Exception:
+            result.addError(test, sys.exc_info())
+            return
+
+        success = False
+        try:
+            await coroutine_function(test)
+        except unittest.SkipTest as exc:
+            result.addSkip(test, str(exc))
+        except Exception as exc:
+            if expecting_failure:
+                result.addExpectedFailure(test, sys.exc_info())
+            elif isinstance(exc, test.failureException):
+                result.addFailure(test, sys.exc_info())
+            else:
+                result.addError(test, sys.exc_info())
+        else:
+            success = True
+
+        try:
+            test.tearDown()
+        except Exception:
+            result.addError(test, sys.exc_info())
+            success = False
+        test.doCleanups()
+
+        if success:
+            if expecting_failure:
+                result.addUnexpectedSuccess(test)
+            else:
+                result.addSuccess(test)
+    finally:
+        result.stopTest(test)
+
+
+class AsyncioSuite(_GeneratedTestSuite):
+    """A test suite which executes coroutine test methods concurrently"""
+
+    def __init__(self, test_class, concurrency=100, history=None):
+        """Execute the coroutine test methods of a class on one event loop
+
+        Up to ``concurrency`` coroutine test methods are in progress at any
+        one time, so test methods which spend their time waiting (for
+        instance on a local server) overlap rather than executing one after
+        another. The outcome of each test is reported into the result passed
+        to ``run`` as each test completes.
+
+        The ``setUp`` and ``tearDown`` methods are executed for each test
+        method, and the ``skip`` and ``expectedFailure`` decorators are
+        honoured. A coroutine test method which has been wrapped (by
+        ``DecorateTestMethod``, or by the ``cache``, ``instrumentation`` or
+        ``max_failures`` arguments of ``GenerateTestMethods``) is executed
+        with all of it's wrappers, on it's own event loop in one of
+        ``concurrency`` worker threads, so it still overlaps with the other
+        test methods. Test methods which are not coroutines are executed as
+        normal, one at a time.
+
+        If ``history`` (a ``repeatedtestframework.DurationHistory``) is
+        given, the test methods are started longest first.
+
+        :param test_class: A TestCase class decorated by GenerateTestMethods
+        :param concurrency: optional The maximum number of coroutine test methods in progress.
+        :param history: optional The durations used to order the test methods.
+
+        :type test_class: type
+        :type concurrency: int
+        :type history: repeatedtestframework.DurationHistory
+        """
+        super(AsyncioSuite, self).__init__(test_class, history)
+
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self._concurrency = concurrency
+
+    async def _worker(self, names, aggregator, executor):
+        """Execute test methods until there are none left, or told to stop"""
+        loop = asyncio.get_event_loop()
+        for name in names:
+            if aggregator.shouldStop:
+                break
+            test = self._test_class(name)
+            recording = _RecordingResult()
+            method = getattr(test, name)
+            coroutine_function = _direct_coroutine(method)
+            if coroutine_function is not None:
+                await _run_test(test, coroutine_function, recording)
+            elif hasattr(method, '_rtf_coroutine'):
+                # The wrappers are synchronous, so must run in a thread
+                await loop.run_in_executor(executor, test.run, recording)
+            else:
+                test.run(recording)
+            aggregator.report(recording)
+
+    async def _run_all(self, aggregator, executor):
+        names = iter(self._names())
+        await asyncio.gather(*[self._worker(names, aggregator, executor)
+                               for _ in range(self._concurrency)])
+
+    def run(self, result, debug=False):
+        aggregator = _ResultAggregator(result)
+        if not self._class_fixture('setUpClass', aggregator):
+            return result
+
+        loop = asyncio.new_event_loop()
+        try:
+            with _futures.ThreadPoolExecutor(self._concurrency) as executor:
+                loop.run_until_complete(self._run_all(aggregator, executor))
+        finally:
+            loop.close()
+
+        self._class_fixture('tearDownClass', aggregator)
+        return result
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.caching : Cache of passing test cases
+
+Summary :
+    An on disk cache of the test cases which have passed, keyed by the
+    content of the test case, the test method and a user supplied salt, so
+    that unchanged passing test cases need not be executed again.
+
+Use Case :
+    As a user I want to only execute the test cases which have changed since
+    they last passed, so that my continuous integration runs are quick.
+
+Testable Statements :
+    Is a passing test case skipped as a cached pass on the next run
+    Is the cache invalidated when the test case, test method or salt changes
+    Are failing test cases always executed
+"""
+import hashlib
+import inspect
+import os
+import sys
+import threading
+import unittest
+
+from .repeatedtestframework import _canonical, case_digest
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+#: The reason reported for a test method skipped by the cache
+CACHED_PASS = 'cached pass'
+
+
+def _fingerprint(test_method):
+    """A digest of the source (or failing that the bytecode) of a callable"""
+    try:
+        content = inspect.getsource(test_method).encode('utf-8')
+    except (IOError, OSError, TypeError):
+        code = getattr(getattr(test_method, '__func__', test_method),
+                       '__code__', None)
+        if code is None:
+            content = repr(test_method).encode('utf-8')
+        else:
+            # Bytecode differs between Python versions
+            content = _code_content(code) + sys.version.encode('utf-8')
+    return hashlib.sha1(content).hexdigest()
+
+
+def _code_content(code):
+    """The bytecode, constants and names of a code object and the code
+       objects nested within it
+
+       The marshalled form of a code object isn't used, as it depends on
+       the reference counts of the objects within it.
+    """
+    parts = [code.co_code, _canonical(code.co_names).encode('utf-8')]
+    for constant in code.co_consts:
+        parts.append(_code_content(constant) if inspect.iscode(constant)
+                     else _canonical(constant).encode('utf-8'))
+    return b'\0'.join(parts)
+
+
+class _PassRecorder(object):
+    """A proxy for a TestResult which records the cache keys of a test
+       when the test succeeds
+    """
+
+    def __init__(self, result):
+        self._result = result
+
+    def addSuccess(self, test):
+        for cache, key in test.__dict__.pop('_rtf_cache_keys', ()):
+            cache.add(key)
+        self._result.addSuccess(test)
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+
+def _record_passes(test_class):
+    """Wrap the run method of a TestCase class so that the cache keys of
+       each test are recorded when the whole test (including tearDown, the
+       cleanups and every subTest) succeeds
+    """
+    original = test_class.run
+    if getattr(original, '_rtf_record_passes', False):
+        return
+
+    def run(self, result=None):
+        if result is not None:
+            original(self, _PassRecorder(result))
+            return result
+
+        result = self.defaultTestResult()
+        result.startTestRun()
+        try:
+            original(self, _PassRecorder(result))
+        finally:
+            result.stopTestRun()
+        return result
+
+    run._rtf_record_passes = True
+    test_class.run = run
+
+
+class ResultCache(object):
+    """An on disk record of the test cases which have passed
+
+       The cache is a text file with the key of one passing test case per
+       line. Each key is a digest of :
+
+            - the test case data (see :func:`case_digest`)
+            - the source of the ``test_method`` wrapper, or it's bytecode if
+              the source is not available
+            - the ``salt``, and the version of the framework
+
+       so a test case is executed again whenever it's data or the test
+       method changes. Changes to code called by the test method are not
+       detected; change the ``salt`` (for instance to the version of the
+       code under test) to invalidate the whole cache, or delete the file.
+    """
+
+    def __init__(self, path, salt='', omit=False):
+        """Open the cache, loading the keys from path if it exists
+
+        :param path: The file holding the keys of the passing test cases
+        :param salt: optional Any string which invalidates the cache when changed
+        :param omit: optional If True a cached pass is not generated at all, rather than being generated and skipped.
+
+        :type path: str
+        :type salt: str
+        :type omit: bool
+        """
+        self._path = path
+        self._salt = salt
+        self.omit = omit
+        self._lock = threading.Lock()
+
+        self._passed = set()
+        if os.path.exists(path):
+            with open(path) as cache:
+                self._passed.update(line.strip() for line in cache)
+            self._passed.discard('')
+
+    @staticmethod
+    def fingerprint(test_method):
+        """A digest of the source or bytecode of the test method wrapper"""
+        return _fingerprint(test_method)
+
+    def key(self, fingerprint, test_data):
+        """The cache key of a test case
+
+        :param fingerprint: The fingerprint of the test_method wrapper
+        :param test_data: The test case data
+        """
+        return hashlib.sha1(':'.join([
+            __version__, self._salt, fingerprint, case_digest(test_data)
+        ]).encode('utf-8')).hexdigest()
+
+    def __contains__(self, key):
+        return key in self._passed
+
+    def __len__(self):
+        return len(self._passed)
+
+    def add(self, key):
+        """Record a passing test case, appending it's key to the file"""
+        with self._lock:
+            if key in self._passed:
+                return
+            self._passed.add(key)
+            with open(self._path, 'a') as cache:
+                cache.write(key + '\n')
+
+    def clear(self):
+        """Discard every cached pass, and remove the file"""
+        with self._lock:
+            self._passed.clear()
+            if os.path.exists(self._path):
+                os.remove(self._path)
+
+    def wrap(self, method, key):
+        """Return the test method for a test case
+
+        A cached pass is replaced by a test method which is skipped with the
+        reason ``'cached pass'``; otherwise the test method is wrapped so that
+        the key is recorded when the test succeeds, which requires the
+        ``watch`` method to have been applied to the class. A test whose
+        ``tearDown``, cleanups or subTests fail is not recorded, nor is an
+        unexpected success.
+
+        :param method: The generated test method
+        :param key: The cache key of the test case
+        """
+        if key in self._passed:
+            @unittest.skip(CACHED_PASS)
+            def cached(self):
+                pass
+
+            return cached
+
+        cache = self
+
+        def test_method(self):
+            self.__dict__.setdefault('_rtf_cache_keys', []).append(
+                (cache, key))
+            return method(self)
+
+        return test_method
+
+    @staticmethod
+    def watch(test_class):
+        """Record the keys of the test methods of a class when they succeed
+
+        :param test_class: The TestCase class whose test methods are wrapped
+        """
+        _record_passes(test_class)
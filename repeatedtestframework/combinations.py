@@ -0,0 +1,373 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.combinations : Combinatorial test cases
+
+Summary :
+    Generates test cases as combinations of the values of several parameter
+    axes; either every combination (generated lazily), or a covering array
+    in which every pair (or every n-tuple) of values appears in at least one
+    test case, with constraints to exclude invalid combinations.
+
+Use Case :
+    As a user I want to test my code with combinations of several
+    parameters, without generating millions of test cases.
+
+Testable Statements :
+    Can I generate every combination of the axis values lazily
+    Does a pairwise reduction cover every pair of values
+    Are the combinations excluded by the constraints never generated
+    Does each test case record the axis values it came from
+"""
+import itertools
+import random
+import re
+from collections import OrderedDict
+
+import six as _six
+
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+# Python 3 introduced the collections.abc module
+if _six.PY2:
+    from collections import Iterable, Mapping
+else:
+    from collections.abc import Iterable, Mapping
+
+
+class CombinationCase(dict):
+    """A test case generated from the values of the parameter axes
+
+       The test case is a dictionary of axis name to value, so it is passed
+       to the test_method as normal. The ``axis_indices`` attribute is an
+       ordered dictionary of axis name to the position of the value within
+       the axis, and the ``label`` and ``slug`` attributes describe the
+       combination for use in the method name and doc templates (for instance
+       ``method_name_template='test_{test_name}_{test_data.slug}'``).
+    """
+
+    def __init__(self, values, axis_indices):
+        super(CombinationCase, self).__init__(values)
+        self.axis_indices = axis_indices
+
+    @property
+    def label(self):
+        """The axis names and values, for instance ``os=linux, python=3.8``
+        """
+        return ', '.join('{}={}'.format(axis, self[axis])
+                         for axis in self.axis_indices)
+
+    @property
+    def slug(self):
+        """The label as an identifier, for instance ``os_linux__python_3_8``
+        """
+        return '__'.join(
+            '{}_{}'.format(axis, re.sub(r'\W+', '_', str(self[axis])))
+            for axis in self.axis_indices)
+
+
+def _extended(assignment, axis, position):
+    """A copy of an assignment of axis to value position, with one more"""
+    extended = dict(assignment)
+    extended[axis] = position
+    return extended
+
+
+class _PartialCase(dict):
+    """A candidate test case in which only some axes have a value
+
+       Retrieving an axis without a value (or iterating over the case)
+       raises KeyError, so that a constraint which depends on it is
+       treated as unknown rather than as false.
+    """
+
+    def __init__(self, values, names):
+        super(_PartialCase, self).__init__(values)
+        self._names = names
+
+    def _unassigned(self, key):
+        return key in self._names and not dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if self._unassigned(key):
+            raise KeyError(key)
+        return super(_PartialCase, self).get(key, default)
+
+    def __contains__(self, key):
+        if self._unassigned(key):
+            raise KeyError(key)
+        return dict.__contains__(self, key)
+
+    def _incomplete(self, *args):
+        raise KeyError('the test case is incomplete')
+
+    __iter__ = __len__ = keys = values = items = _incomplete
+
+
+class Combinations(Iterable):
+    """Test cases which are combinations of the values of parameter axes"""
+
+    def __init__(self, axes, strength=None, constraints=(), candidates=5,
+                 seed=0, max_search=100000):
+        """Define the axes and how they are combined
+
+        Without a ``strength`` every combination of the axis values is a
+        test case (the cartesian product); the test cases are generated one
+        at a time as they are iterated, and are never held in memory.
+
+        With a ``strength`` of ``n`` the test cases are a covering array :
+        every combination of ``n`` values from ``n`` different axes appears
+        in at least one test case, which needs far fewer test cases than the
+        full product (``strength=2`` is pairwise testing). The covering array
+        is built by a deterministic greedy search, so every process builds
+        the same test cases in the same order.
+
+        Each of the ``constraints`` is called with a candidate test case (a
+        dictionary of axis name to value) and returns False if that
+        combination is invalid; an invalid combination is never generated,
+        and a value pair which only appears in invalid combinations is not
+        covered. The constraints are also called with partial test cases, in
+        which retrieving an axis without a value raises KeyError (which is
+        taken to mean the constraint can't yet tell); a combination of
+        values which a constraint rejects outright is never searched for.
+        When the greedy choices for a combination of values are all
+        invalid, up to ``max_search`` partial test cases are searched for a
+        valid one; a combination which is still not covered is listed by
+        the ``uncovered`` attribute.
+
+        :param axes: A Mapping (or sequence of pairs) of axis name to the values of the axis
+        :param strength: optional The number of axes whose every combination is covered
+        :param constraints: optional Callables which return False for an invalid test case
+        :param candidates: optional The number of test cases considered for each one generated
+        :param seed: optional The seed for the choice between equally good test cases
+        :param max_search: optional The partial test cases searched for a combination the greedy search can't cover
+
+        :type axes: Mapping | list
+        :type strength: int | None
+        :type constraints: list[ Callable ]
+        :type candidates: int
+        :type seed: int
+        :type max_search: int
+        """
+        if isinstance(axes, Mapping):
+            axes = list(axes.items())
+        self._names = [name for name, _ in axes]
+        self._values = [list(values) for _, values in axes]
+
+        if not self._names:
+            raise ValueError('at least one axis is needed')
+        if not all(self._values):
+            raise ValueError('every axis needs at least one value')
+        if strength is not None and not 1 <= strength <= len(self._names):
+            raise ValueError(
+                'strength must be between 1 and the number of axes')
+        if candidates < 1:
+            raise ValueError('candidates must be at least 1')
+        if max_search < 1:
+            raise ValueError('max_search must be at least 1')
+
+        self._strength = strength
+        self._constraints = list(constraints)
+        self._candidates = candidates
+        self._seed = seed
+        self._max_search = max_search
+        self._covering = None
+        self._uncovered = []
+
+    @property
+    def axes(self):
+        """The axis names, in order"""
+        return list(self._names)
+
+    @property
+    def uncovered(self):
+        """The combinations of values which the covering array does not
+           include, although no constraint was shown to exclude them (each
+           a dictionary of axis name to value)
+        """
+        iter(self)
+        return [dict(combination) for combination in self._uncovered]
+
+    def _case(self, positions):
+        """The test case for a value position on each axis"""
+        return CombinationCase(
+            ((name, values[position]) for name, values, position
+             in zip(self._names, self._values, positions)),
+            OrderedDict(zip(self._names, positions)))
+
+    def _allowed(self, case):
+        return all(constraint(case) for constraint in self._constraints)
+
+    def _excluded(self, assignment):
+        """True if a constraint rejects a partial assignment of axis to
+           value position
+        """
+        case = _PartialCase(
+            ((self._names[axis], self._values[axis][position])
+             for axis, position in assignment.items()), self._names)
+        for constraint in self._constraints:
+            try:
+                if not constraint(case):
+                    return True
+            except KeyError:
+                continue
+        return False
+
+    def _product(self):
+        """Every allowed combination, generated lazily"""
+        for positions in itertools.product(
+                *[range(len(values)) for values in self._values]):
+            case = self._case(positions)
+            if self._allowed(case):
+                yield case
+
+    def __iter__(self):
+        if self._strength is None or self._strength == len(self._names):
+            return self._product()
+        if self._covering is None:
+            self._covering = self._build_covering()
+        return iter(self._covering)
+
+    def __len__(self):
+        if self._strength is None and not self._constraints:
+            count = 1
+            for values in self._values:
+                count *= len(values)
+            return count
+        return sum(1 for _ in self)
+
+    def _tuples(self, assignment):
+        """The n-tuples of an assignment of axis to value position"""
+        return itertools.combinations(sorted(assignment.items()),
+                                      self._strength)
+
+    def _gain(self, uncovered, assignment, axis, position):
+        """The uncovered n-tuples covered by adding axis=position"""
+        gain = 0
+        for others in itertools.combinations(sorted(assignment.items()),
+                                             self._strength - 1):
+            if tuple(sorted(others + ((axis, position),))) in uncovered:
+                gain += 1
+        return gain
+
+    def _candidate(self, uncovered, start, rng, randomise):
+        """Complete the n-tuple start greedily into a full assignment"""
+        assignment = dict(start)
+        axes = [axis for axis in range(len(self._names))
+                if axis not in assignment]
+        if randomise:
+            rng.shuffle(axes)
+        for axis in axes:
+            positions = list(range(len(self._values[axis])))
+            if self._constraints:
+                # Avoid the values which the constraints already reject
+                positions = [
+                    position for position in positions
+                    if not self._excluded(_extended(assignment, axis,
+                                                    position))] or positions
+            gains = [(self._gain(uncovered, assignment, axis, position),
+                      position)
+                     for position in positions]
+            best = max(gain for gain, _ in gains)
+            choices = [position for gain, position in gains if gain == best]
+            assignment[axis] = rng.choice(choices) if randomise \
+                else choices[0]
+        return assignment
+
+    def _search(self, start):
+        """Search depth first for an allowed completion of the n-tuple start
+
+           The partial assignments which a constraint rejects are not
+           extended. Returns None if there is no allowed completion, or if
+           the search gives up after max_search partial assignments (when
+           the n-tuple is recorded as uncovered).
+        """
+        axes = [axis for axis in range(len(self._names))
+                if axis not in dict(start)]
+        assignment = dict(start)
+        searched = 0
+        # A stack of the value positions still to try for each axis
+        pending = [list(range(len(self._values[axes[0]])))] if axes else []
+
+        while pending:
+            depth = len(pending) - 1
+            if not pending[-1]:
+                pending.pop()
+                assignment.pop(axes[depth], None)
+                continue
+            if searched == self._max_search:
+                self._uncovered.append(
+                    tuple((self._names[axis], self._values[axis][position])
+                          for axis, position in start))
+                return None
+            searched += 1
+
+            assignment[axes[depth]] = pending[-1].pop(0)
+            if self._excluded(assignment):
+                continue
+            if depth + 1 < len(axes):
+                pending.append(
+                    list(range(len(self._values[axes[depth + 1]]))))
+            elif self._allowed(self._assigned_case(assignment)):
+                return assignment
+
+        if not axes and self._allowed(self._assigned_case(assignment)):
+            return assignment
+        return None
+
+    def _assigned_case(self, assignment):
+        return self._case([assignment[axis]
+                           for axis in range(len(self._names))])
+
+    def _build_covering(self):
+        """Build the covering array by greedy search"""
+        rng = random.Random(self._seed)
+        ordered = [tuple(zip(axes, positions))
+                   for axes in itertools.combinations(
+                       range(len(self._names)), self._strength)
+                   for positions in itertools.product(
+                       *[range(len(self._values[axis])) for axis in axes])]
+        # The n-tuples which a constraint rejects outright are never covered
+        uncovered = set(n_tuple for n_tuple in ordered
+                        if not self._constraints or
+                        not self._excluded(dict(n_tuple)))
+        self._uncovered = []
+        cases = []
+        next_tuple = 0
+
+        while uncovered:
+            while ordered[next_tuple] not in uncovered:
+                next_tuple += 1
+            starts = [ordered[next_tuple]]
+            uncovered_list = None
+            for _ in range(self._candidates - 1):
+                if uncovered_list is None:
+                    uncovered_list = sorted(uncovered)
+                starts.append(rng.choice(uncovered_list))
+
+            best, best_covered = None, None
+            for attempt, start in enumerate(starts):
+                assignment = self._candidate(uncovered, start, rng,
+                                             randomise=attempt > 0)
+                if not self._allowed(self._assigned_case(assignment)):
+                    continue
+                covered = uncovered.intersection(self._tuples(assignment))
+                if best is None or len(covered) > len(best_covered):
+                    best, best_covered = assignment, covered
+
+            if best is None:
+                # The greedy choices are invalid - search for any valid case
+                best = self._search(starts[0])
+                if best is None:
+                    # The tuple only appears in invalid combinations, or the
+                    # search gave up; see the uncovered attribute
+                    uncovered.discard(starts[0])
+                    continue
+                best_covered = uncovered.intersection(self._tuples(best))
+
+            uncovered.difference_update(best_covered)
+            cases.append(self._assigned_case(best))
+        return cases
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.criteria : Declarative criteria for decorators
+
+Summary :
+    Criteria for the decorators which are written as a Mapping of field
+    lookups (for instance ``{'platform': 'win', 'size__gt': 1000000}``)
+    rather than as a callable, so that the matching test methods can be
+    found from an index of the test case values.
+
+Use Case :
+    As a user I want to decorate a few test cases out of a huge data set,
+    without the criteria being evaluated for every test case.
+
+Testable Statements :
+    Can I write criteria as field equality, membership and ranges
+    Are the matching test cases found from an index
+    Do declarative and callable criteria select the same test cases
+"""
+import bisect
+import numbers
+from array import array
+
+import six as _six
+
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+# The lookup operators, and their evaluation against a single value
+_OPERATORS = {
+    'eq': lambda value, other: value == other,
+    'ne': lambda value, other: value != other,
+    'in': lambda value, other: value in other,
+    'gt': lambda value, other: value > other,
+    'gte': lambda value, other: value >= other,
+    'lt': lambda value, other: value < other,
+    'lte': lambda value, other: value <= other,
+}
+
+
+def _family(value):
+    """The group of types which can be ordered against value"""
+    if isinstance(value, numbers.Real):
+        return 'number'
+    if isinstance(value, _six.string_types):
+        return 'text'
+    if isinstance(value, bytes):
+        return 'bytes'
+    return None
+
+
+class FieldIndex(object):
+    """An index of the values of a single field over all of the test cases
+
+       Equality and membership are answered from a dictionary of value to
+       the positions of the test cases; ranges are answered by bisecting the
+       sorted values of the same type family as the bound, and by comparing
+       the values of no family (for instance Decimal) directly. Unhashable
+       values are kept in a list which is searched.
+    """
+
+    def __init__(self, cases, field):
+        """Index the field of every test case
+
+        :param cases: The test case Mappings, in registry order
+        :param field: The key to index
+        """
+        self._values = {}
+        self._unhashable = []
+        self._present = array('l')
+        self._ordered = {}
+
+        values = self._values
+        for position, case in enumerate(cases):
+            try:
+                value = case[field]
+            except KeyError:
+                continue
+            self._present.append(position)
+            try:
+                positions = values.get(value)
+            except TypeError:
+                self._unhashable.append((position, value))
+                continue
+            if positions is None:
+                values[value] = [position]
+            else:
+                positions.append(position)
+
+    def equal(self, value):
+        """The positions of the test cases where the field equals value"""
+        if value != value:
+            # NaN equals nothing, although a dict finds it by identity
+            return []
+        try:
+            positions = list(self._values.get(value, ()))
+        except TypeError:
+            positions = []
+        positions.extend(position for position, other in self._unhashable
+                         if other == value)
+        return positions
+
+    def _range(self, operator, bound):
+        """The positions of the test cases where the field is in range"""
+        if bound != bound:
+            # Nothing is in a range bounded by NaN
+            return []
+        family = _family(bound)
+        if family is None:
+            # Values which cannot be indexed by order are compared directly
+            positions = [position
+                         for value, positions in self._values.items()
+                         if _compare(operator, value, bound)
+                         for position in positions]
+            positions.extend(position for position, value in self._unhashable
+                             if _compare(operator, value, bound))
+            return positions
+
+        if family not in self._ordered:
+            # NaN compares False with everything, and would break the sort
+            values = sorted(value for value in self._values
+                            if _family(value) == family and value == value)
+            self._ordered[family] = values
+
+        values = self._ordered[family]
+        if operator == 'gt':
+            selected = values[bisect.bisect_right(values, bound):]
+        elif operator == 'gte':
+            selected = values[bisect.bisect_left(values, bound):]
+        elif operator == 'lt':
+            selected = values[:bisect.bisect_left(values, bound)]
+        else:
+            selected = values[:bisect.bisect_right(values, bound)]
+        positions = [position for value in selected
+                     for position in self._values[value]]
+
+        # Values outside the families may still be ordered against the bound
+        if None not in self._ordered:
+            self._ordered[None] = [value for value in self._values
+                                   if _family(value) is None]
+        positions.extend(position for value in self._ordered[None]
+                         if _compare(operator, value, bound)
+                         for position in self._values[value])
+        positions.extend(position for position, value in self._unhashable
+                         if _compare(operator, value, bound))
+        return positions
+
+    def lookup(self, operator, value):
+        """The positions of the test cases which match a single lookup"""
+        if operator == 'eq':
+            return self.equal(value)
+        if operator == 'in':
+            positions = set()
+            for other in value:
+                positions.update(self.equal(other))
+            return positions
+        if operator == 'ne':
+            equal = set(self.equal(value))
+            return [position for position in self._present
+                    if position not in equal]
+        return self._range(operator, value)
+
+
+def _compare(operator, value, other):
+    """Evaluate a lookup operator, treating incomparable values as False"""
+    try:
+        return bool(_OPERATORS[operator](value, other))
+    except (TypeError, ArithmeticError):
+        # Decimal raises InvalidOperation when ordered against NaN
+        return False
+
+
+class Criteria(object):
+    """Declarative criteria for DecorateTestMethod and it's shortcuts
+
+       Each key of the Mapping is a field of the test case data, optionally
+       followed by a double underscore and an operator :
+
+            - ``field`` or ``field__eq`` : the field equals the value
+            - ``field__ne`` : the field is present and does not equal the value
+            - ``field__in`` : the field is one of the values
+            - ``field__gt``, ``field__gte``, ``field__lt``, ``field__lte`` :
+              the field is greater than (or equal to), or less than (or
+              equal to) the value
+
+       A test case matches if every lookup matches; a test case without the
+       field never matches.
+    """
+
+    def __init__(self, lookups):
+        """Parse the lookups
+
+        :param lookups: Mapping of field lookup to value
+        :type lookups: Mapping
+        """
+        self._lookups = []
+        for lookup, value in lookups.items():
+            field, separator, operator = lookup.rpartition('__')
+            if not separator or operator not in _OPERATORS:
+                field, operator = lookup, 'eq'
+            if operator == 'in':
+                value = list(value)
+            self._lookups.append((field, operator, value))
+
+    def __call__(self, test_data):
+        """Return True if the test case matches every lookup"""
+        for field, operator, value in self._lookups:
+            try:
+                field_value = test_data[field]
+            except KeyError:
+                return False
+            if not _compare(operator, field_value, value):
+                return False
+        return True
+
+    def positions(self, registry):
+        """Return the registry positions of the matching test methods
+
+        Each lookup is answered from the index of it's field, which is built
+        by the registry the first time the field is used, so the cost is in
+        proportion to the number of matches rather than the number of test
+        cases.
+
+        :param registry: The registry of the generated test methods
+        :type registry: repeatedtestframework.MethodRegistry
+        """
+        if not self._lookups:
+            return list(_six.moves.range(len(registry)))
+
+        candidates = None
+        for field, operator, value in self._lookups:
+            found = registry.field_index(field).lookup(operator, value)
+            candidates = set(found) if candidates is None \
+                else candidates.intersection(found)
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, dict(
+            ('{}__{}'.format(field, operator), value)
+            for field, operator, value in self._lookups))
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.fixtures : Shared fixtures for generated test methods
+
+Summary :
+    A cache of expensive resources (for instance a parsed model file, or a
+    local database) shared between the generated test methods, keyed by a
+    function of the test case data, with least recently used eviction and
+    teardown of evicted values.
+
+Use Case :
+    As a user I want many of my test cases to share an expensive resource,
+    without each test method creating it again.
+
+Testable Statements :
+    Is each value created once, and shared by the test methods which need it
+    Are the least recently used values evicted and torn down
+    Is each value created once when the test methods execute in parallel
+    Is a value which is in use torn down only once it is released
+"""
+import atexit
+import contextlib
+import sys
+import threading
+from collections import OrderedDict
+
+import six as _six
+
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+class FixtureCache(object):
+    """A cache of shared values, keyed by a function of the test case data
+
+       Each value is created by calling ``factory`` with it's key, the first
+       time a test method asks for it. The cache is safe to use from the
+       ``ThreadPoolSuite`` and the ``AsyncioSuite``; when several threads ask
+       for the same missing key at the same time the value is only created
+       once, and a value taken with :meth:`lease` is not torn down until
+       every lease of it has ended, even if it is evicted in the meantime.
+       Each worker process of a ``ProcessPoolSuite`` imports the test
+       module, and so has it's own cache.
+
+       A cache passed in the ``fixtures`` argument of GenerateTestMethods is
+       cleared (tearing down every value) when the ``tearDownClass`` of the
+       test class executes; any other cache is cleared when the process
+       exits.
+    """
+
+    def __init__(self, factory, key=None, max_entries=None, max_size=None,
+                 sizeof=None, teardown=None):
+        """Create an empty cache
+
+        :param factory: Called with the key to create each value
+        :param key: optional A callable which returns the key for the test case data, or the name of a test case field to use as the key; by default the test case data must be passed to ``get`` as the key itself.
+        :param max_entries: optional The maximum number of values kept
+        :param max_size: optional The maximum total size of the values kept
+        :param sizeof: optional Returns the size of a value; defaults to sys.getsizeof
+        :param teardown: optional Called with each value as it is evicted or cleared
+
+        :type factory: Callable
+        :type key: Callable | str | None
+        :type max_entries: int | None
+        :type max_size: int | None
+        :type sizeof: Callable | None
+        :type teardown: Callable | None
+        """
+        if not callable(factory):
+            raise TypeError('factory is not callable')
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        if max_size is not None and max_size < 1:
+            raise ValueError('max_size must be at least 1')
+
+        if isinstance(key, _six.string_types):
+            field = key
+            key = lambda test_data: test_data[field]  # noqa: E731
+
+        self._factory = factory
+        self._key = key
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._sizeof = sizeof or sys.getsizeof
+        self._teardown = teardown
+
+        # Key to (value, size), least recently used first
+        self._values = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # A lock for each key whose value is being created
+        self._creating = {}
+
+        # The id of each leased value to [value, number of leases], and the
+        # ids of the leased values which are waiting to be torn down
+        self._leases = {}
+        self._pending = set()
+
+        self.hits = 0
+        self.misses = 0
+
+        atexit.register(self.clear)
+
+    def get(self, test_data):
+        """Return the value for a test case, creating it if needed
+
+        The value may be evicted and torn down by another thread while it is
+        still being used; when the test methods execute in parallel use
+        :meth:`lease` instead.
+
+        :param test_data: The test case data (or the key if no ``key`` was given)
+        """
+        return self._get(test_data, False)
+
+    @contextlib.contextmanager
+    def lease(self, test_data):
+        """A context manager which holds the value for a test case
+
+        The value is created if needed, and is not torn down (even if it is
+        evicted or the cache is cleared) until the ``with`` block ends.
+
+        :param test_data: The test case data (or the key if no ``key`` was given)
+        """
+        value = self._get(test_data, True)
+        try:
+            yield value
+        finally:
+            self._release(value)
+
+    def _get(self, test_data, lease):
+        key = self._key(test_data) if self._key is not None else test_data
+
+        with self._lock:
+            if key in self._values:
+                return self._hit(key, lease)
+            creating = self._creating.setdefault(key, [threading.Lock(), 0])
+            creating[1] += 1
+
+        try:
+            with creating[0]:
+                with self._lock:
+                    if key in self._values:
+                        return self._hit(key, lease)
+                value = self._factory(key)
+                with self._lock:
+                    self.misses += 1
+                    self._add(key, value)
+                    if lease:
+                        self._hold(value)
+                    evicted = self._unheld(self._evict())
+        finally:
+            with self._lock:
+                creating[1] -= 1
+                if not creating[1]:
+                    del self._creating[key]
+
+        self._tear_down(evicted)
+        return value
+
+    def _hit(self, key, lease):
+        """Return a cached value, marking it as the most recently used"""
+        value, size = self._values.pop(key)
+        self._values[key] = (value, size)
+        self.hits += 1
+        if lease:
+            self._hold(value)
+        return value
+
+    def _hold(self, value):
+        """Record a lease of a value; called while holding the lock"""
+        self._leases.setdefault(id(value), [value, 0])[1] += 1
+
+    def _unheld(self, values):
+        """Return the values which can be torn down now, and mark the
+           leased values to be torn down when their last lease ends;
+           called while holding the lock
+        """
+        ready = []
+        for value in values:
+            if id(value) in self._leases:
+                self._pending.add(id(value))
+            else:
+                ready.append(value)
+        return ready
+
+    def _release(self, value):
+        """End a lease of a value, tearing it down if it is waiting"""
+        with self._lock:
+            lease = self._leases[id(value)]
+            lease[1] -= 1
+            if lease[1]:
+                return
+            del self._leases[id(value)]
+            if id(value) not in self._pending:
+                return
+            self._pending.discard(id(value))
+        self._tear_down([value])
+
+    def _add(self, key, value):
+        size = self._sizeof(value) if self._max_size is not None else 0
+        self._values[key] = (value, size)
+        self._size += size
+
+    def _evict(self):
+        """Remove the least recently used values until within the limits
+
+           The most recently added value is always kept. Returns the evicted
+           values, which are torn down once the lock is released.
+        """
+        evicted = []
+        while len(self._values) > 1 and (
+                (self._max_entries is not None and
+                 len(self._values) > self._max_entries) or
+                (self._max_size is not None and
+                 self._size > self._max_size)):
+            _, (value, size) = self._values.popitem(last=False)
+            self._size -= size
+            evicted.append(value)
+        return evicted
+
+    def _tear_down(self, values):
+        if self._teardown is not None:
+            for value in values:
+                self._teardown(value)
+
+    def clear(self):
+        """Remove (and tear down) every value
+
+           A leased value is torn down when it's last lease ends.
+        """
+        with self._lock:
+            values = self._unheld(
+                [value for value, _ in self._values.values()])
+            self._values.clear()
+            self._size = 0
+        self._tear_down(values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.instrumentation : Timing of generated test methods
+
+Summary :
+    Records the wall time, processor time, outcome and (optionally) the peak
+    memory allocation of every generated test method which is executed.
+
+Use Case :
+    As a user I want to know which of my generated test cases are slow, so
+    that I can improve them or schedule them better.
+
+Testable Statements :
+    Is a record kept of every test method executed
+    Can I find the slowest test cases
+    Can I export the records as JSON or CSV
+"""
+import csv
+import json
+import threading
+import time
+import unittest
+from collections import namedtuple
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+# Python 2 does not have the high resolution clocks
+_wall_clock = getattr(time, 'perf_counter', time.time)
+_cpu_clock = getattr(time, 'process_time', None) or time.clock
+
+#: The record kept for each execution of a generated test method
+CaseTiming = namedtuple('CaseTiming', ['index', 'test_name', 'group',
+                                       'test_data', 'wall_time', 'cpu_time',
+                                       'peak_memory', 'outcome'])
+
+_FIELDS = ['index', 'test_name', 'group', 'wall_time', 'cpu_time',
+           'peak_memory', 'outcome', 'test_data']
+
+
+class Instrumentation(object):
+    """Records the timing of each generated test method
+
+       Pass an instance as the ``instrumentation`` argument of one or more
+       ``GenerateTestMethods`` decorators; each generated test method is then
+       wrapped so that every execution is recorded.
+    """
+
+    def __init__(self, trace_memory=False):
+        """Create an empty set of records
+
+        :param trace_memory: optional Also record the peak memory allocated during each test method using tracemalloc (which slows the test methods).
+
+        :type trace_memory: bool
+        """
+        if trace_memory and tracemalloc is None:
+            raise RuntimeError('trace_memory requires the tracemalloc module')
+        self._trace_memory = trace_memory
+        self._records = []
+        self._lock = threading.Lock()
+
+    @property
+    def records(self):
+        """A list of the :class:`CaseTiming` records, in execution order"""
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        """Discard all of the records"""
+        with self._lock:
+            del self._records[:]
+
+    def _record(self, timing):
+        with self._lock:
+            self._records.append(timing)
+
+    def wrap(self, method, group, name, index, test_data):
+        """Wrap a generated test method so that each execution is recorded
+
+        :param method: The generated test method
+        :param group: The test_name of the GenerateTestMethods decorator
+        :param name: The name of the generated test method
+        :param index: The index of the test case
+        :param test_data: The test case data
+        """
+        instrumentation = self
+
+        def test_method(self):
+            started = False
+            if instrumentation._trace_memory:
+                started = not tracemalloc.is_tracing()
+                if started:
+                    tracemalloc.start()
+                elif hasattr(tracemalloc, 'reset_peak'):
+                    tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+
+            outcome = 'error'
+            wall, cpu = _wall_clock(), _cpu_clock()
+            try:
+                result = method(self)
+                outcome = 'success'
+                return result
+            except unittest.SkipTest:
+                outcome = 'skipped'
+                raise
+            except self.failureException:
+                outcome = 'failure'
+                raise
+            finally:
+                wall, cpu = _wall_clock() - wall, _cpu_clock() - cpu
+                peak = None
+                if instrumentation._trace_memory:
+                    _, peak = tracemalloc.get_traced_memory()
+                    peak = max(peak - before, 0)
+                    if started:
+                        tracemalloc.stop()
+                if getattr(test_method, '__unittest_expecting_failure__',
+                           False):
+                    outcome = {'success': 'unexpectedSuccess',
+                               'failure': 'expectedFailure',
+                               'error': 'expectedFailure'}.get(outcome,
+                                                               outcome)
+                instrumentation._record(CaseTiming(
+                    index, name, group, test_data, wall, cpu, peak, outcome))
+
+        return test_method
+
+    def slowest(self, count=10, key='wall_time'):
+        """Return the slowest records
+
+        :param count: optional The number of records to return
+        :param key: optional The field to order by - ``wall_time``, ``cpu_time`` or ``peak_memory``.
+        """
+        return sorted((record for record in self.records
+                       if getattr(record, key) is not None),
+                      key=lambda record: getattr(record, key),
+                      reverse=True)[:count]
+
+    def by_group(self):
+        """Return a dictionary of group to the list of records for that group
+        """
+        groups = {}
+        for record in self.records:
+            groups.setdefault(record.group, []).append(record)
+        return groups
+
+    def histogram(self, bins=10, key='wall_time'):
+        """Return a histogram of the records for each group
+
+        The histogram for each group is a list of ``(low, high, count)``
+        tuples, with ``bins`` equal width bins between the smallest and
+        largest value within that group.
+
+        :param bins: optional The number of bins in each histogram
+        :param key: optional The field to measure - ``wall_time``, ``cpu_time`` or ``peak_memory``.
+        """
+        histograms = {}
+        for group, records in self.by_group().items():
+            values = [getattr(record, key) for record in records
+                      if getattr(record, key) is not None]
+            if not values:
+                histograms[group] = []
+                continue
+            low, high = min(values), max(values)
+            width = (high - low) / float(bins) or 1
+            counts = [0] * bins
+            for value in values:
+                counts[min(int((value - low) / width), bins - 1)] += 1
+            histograms[group] = [(low + width * bin_no,
+                                  low + width * (bin_no + 1), count)
+                                 for bin_no, count in enumerate(counts)]
+        return histograms
+
+    def to_json(self, stream):
+        """Write the records as a JSON list of objects to the stream
+
+           Test data which cannot be represented in JSON is written as it's
+           repr.
+        """
+        json.dump([dict(zip(_FIELDS, [getattr(record, field)
+                                      for field in _FIELDS]))
+                   for record in self.records], stream, default=repr,
+                  indent=2)
+
+    def to_csv(self, stream):
+        """Write the records as CSV to the stream, with a header row
+
+           The test data is written as it's repr.
+        """
+        writer = csv.writer(stream)
+        writer.writerow(_FIELDS)
+        for record in self.records:
+            writer.writerow([getattr(record, field) for field in _FIELDS[:-1]]
+                            + [repr(record.test_data)])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.loader : Loading the generated test methods
+
+Summary :
+    A unittest TestLoader which takes the names of the generated test
+    methods from the registry of the class, in test case index order, rather
+    than scanning and sorting every attribute of the class, and which can
+    select the test methods by test case index range or by name pattern.
+
+Use Case :
+    As a user I want to load a class with hundreds of thousands of generated
+    test methods quickly, and to execute a part of the data set.
+
+Testable Statements :
+    Are the generated test methods loaded in test case index order
+    Are the test methods which are not generated still loaded
+    Can I select the test methods by a range of test case indices
+    Can I select the test methods by name pattern
+"""
+import fnmatch
+import re
+import unittest
+
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+def _pattern(name_pattern):
+    """A name pattern as unittest's -k option interprets it"""
+    return name_pattern if '*' in name_pattern else \
+        '*{}*'.format(name_pattern)
+
+
+class RegistryLoader(unittest.TestLoader):
+    """A TestLoader which loads the generated test methods from the registry
+
+       For a class decorated by GenerateTestMethods the test method names
+       are taken from the ``_RTF_METHODS`` registry, in test case index
+       order, followed by the names of the test methods which were defined
+       on the class before it was decorated; the attributes of the class are
+       never scanned. Any other class (including a subclass of a decorated
+       class, and a class with a collapsed test method) is loaded as
+       normal.
+    """
+
+    def __init__(self, index_range=None, name_patterns=None):
+        """Create a loader, optionally selecting the test methods
+
+        :param index_range: optional A (start, stop) pair; only the generated test methods whose test case index is at least start and less than stop are loaded.
+        :param name_patterns: optional Only the test methods whose fully qualified name matches one of these patterns are loaded; patterns without a ``*`` match any name containing them, as for the ``-k`` option of unittest.
+
+        :type index_range: tuple(int, int) | None
+        :type name_patterns: list[ str ] | None
+        """
+        super(RegistryLoader, self).__init__()
+        if index_range is not None:
+            start, stop = index_range
+            if start > stop:
+                raise ValueError('index_range start must not be after stop')
+        self._index_range = index_range
+        if name_patterns is not None:
+            self.testNamePatterns = [_pattern(name_pattern)
+                                     for name_pattern in name_patterns]
+
+    def _name_filter(self, test_case_class):
+        """A function which returns True for the selected method names"""
+        patterns = getattr(self, 'testNamePatterns', None)
+        if not patterns:
+            return None
+        matcher = re.compile('|'.join(fnmatch.translate(pattern)
+                                      for pattern in patterns)).match
+        prefix = '{}.{}.'.format(
+            test_case_class.__module__,
+            getattr(test_case_class, '__qualname__',
+                    test_case_class.__name__))
+        return lambda name: matcher(prefix + name) is not None
+
+    def getTestCaseNames(self, testCaseClass):
+        """Return the selected test method names of a TestCase class"""
+        if '_RTF_METHODS' not in testCaseClass.__dict__ or \
+                testCaseClass.__dict__.get('_RTF_COLLAPSED') is not None or \
+                self.testMethodPrefix != 'test':
+            names = super(RegistryLoader, self).getTestCaseNames(
+                testCaseClass)
+            # From Python 3.7 the TestLoader applies the name patterns itself
+            if hasattr(unittest.TestLoader, 'testNamePatterns'):
+                return names
+            return self._filtered(testCaseClass, names)
+
+        # noinspection PyProtectedMember
+        registry = testCaseClass._RTF_METHODS
+        if self._index_range is not None:
+            names = registry.names_in_range(*self._index_range)
+        else:
+            names = testCaseClass.__dict__.get('_RTF_OTHER_TESTS', []) + \
+                registry.names()
+
+        names = [name for name in names if name.startswith('test')]
+        return self._filtered(testCaseClass, names)
+
+    def _filtered(self, test_case_class, names):
+        """The names which match the name patterns"""
+        selected = self._name_filter(test_case_class)
+        if selected is None:
+            return names
+        return [name for name in names if selected(name)]
@@ -0,0 +1,383 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.payloads : Shared payloads for test cases
+
+Summary :
+    Stores the large binary values of test cases (bytes, arrays and numpy
+    arrays) once, in a memory mapped file or in shared memory, and passes
+    lightweight handles in their place; each test method receives a read
+    only memoryview (or numpy array) of the shared data, so the payloads are
+    neither copied into, nor pickled for, each worker process.
+
+Use Case :
+    As a user I want test cases with payloads of tens of megabytes each to
+    execute in several processes, without each process holding it's own
+    copy of every payload.
+
+Testable Statements :
+    Can I store the payloads of my test cases in a memory mapped file
+    Can I store the payloads of my test cases in shared memory
+    Is each payload passed to the test method without being copied
+    Are the handles small when the test cases are pickled
+"""
+import atexit
+import mmap
+import os
+import tempfile
+import threading
+
+import six as _six
+
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+# Python 3 introduced the collections.abc module
+if _six.PY2:
+    from collections import Mapping, Sequence
+else:
+    from collections.abc import Mapping, Sequence
+
+try:
+    from multiprocessing import shared_memory as _shared_memory
+except ImportError:  # Python before 3.8
+    _shared_memory = None
+
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
+# Payloads within a file are aligned for any numpy dtype
+_ALIGNMENT = 64
+
+# The buffers opened by this process, keyed by the location of the store
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def _mapped_file(path, size):
+    """The memory map of a payload file, at least size bytes long"""
+    with _buffers_lock:
+        buffer = _buffers.get(('file', path))
+        if buffer is None or len(buffer) < size:
+            with open(path, 'rb') as payload_file:
+                buffer = mmap.mmap(payload_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+            _buffers[('file', path)] = buffer
+        return buffer
+
+
+def _shared_block(name):
+    """A read only buffer of the shared memory block with the given name
+
+       Where possible the buffer is a separate memory map of the block, so
+       that the block itself can be closed while views of it still exist.
+    """
+    with _buffers_lock:
+        buffer = _buffers.get(('shm', name))
+        if buffer is None:
+            try:
+                block = _shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:  # Python before 3.13 always tracks
+                block = _shared_memory.SharedMemory(name=name)
+            if hasattr(block, '_fd'):
+                buffer = mmap.mmap(block._fd, block.size,
+                                   access=mmap.ACCESS_READ)
+                block.close()
+            else:
+                # The block can't be mapped separately on Windows, so it is
+                # kept open for the life of the process
+                _buffers[('shm-block', name)] = block
+                buffer = block.buf.toreadonly()
+            _buffers[('shm', name)] = buffer
+        return buffer
+
+
+class Payload(object):
+    """A handle to a single payload held in a payload store
+
+       The handle holds only the location, size and type of the payload,
+       so it is cheap to pickle; the data is only accessed when the handle
+       is resolved.
+    """
+    __slots__ = ('location', 'offset', 'nbytes', 'format', 'shape', 'dtype')
+
+    def __init__(self, location, offset, nbytes, format, shape, dtype=None):
+        self.location = location
+        self.offset = offset
+        self.nbytes = nbytes
+        self.format = format
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def view(self):
+        """A read only memoryview of the payload, with it's original shape"""
+        kind, name = self.location
+        if kind == 'file':
+            buffer = _mapped_file(name, self.offset + self.nbytes)
+        else:
+            buffer = _shared_block(name)
+        view = memoryview(buffer)[self.offset:self.offset + self.nbytes]
+        return view.cast(self.format, self.shape)
+
+    def array(self):
+        """A read only numpy array of the payload (requires numpy)"""
+        if _numpy is None:
+            raise RuntimeError('Payload.array requires numpy')
+        return _numpy.frombuffer(
+            self.view().cast('B'), dtype=self.dtype or 'B').reshape(
+            self.shape)
+
+    def resolve(self):
+        """The value passed to the test method
+
+           A numpy array if the payload was stored from a numpy array,
+           otherwise a memoryview.
+        """
+        return self.array() if self.dtype is not None else self.view()
+
+    def __repr__(self):
+        return '<{} {} bytes at {}:{}>'.format(
+            self.__class__.__name__, self.nbytes, self.location[1],
+            self.offset)
+
+
+class _PayloadStore(object):
+    """Base class for the stores of payloads"""
+
+    def add(self, value):
+        """Store a copy of a value, and return it's handle
+
+        :param value: Any object supporting the buffer protocol (for instance bytes, array.array or a numpy array)
+        :rtype: Payload
+        """
+        view = memoryview(value)
+        dtype = None
+        if _numpy is not None and isinstance(value, _numpy.ndarray):
+            dtype = value.dtype.str
+        data = view.cast('B') if view.c_contiguous \
+            else memoryview(view.tobytes())
+
+        # memoryview can only cast to native single character formats
+        format, shape = view.format, list(view.shape)
+        try:
+            data.cast(format, shape)
+        except (TypeError, ValueError):
+            format, shape = 'B', [view.nbytes]
+
+        location, offset = self._write(data)
+        return Payload(location, offset, view.nbytes, format, shape, dtype)
+
+    def _write(self, data):
+        """Store the bytes of a payload, returning (location, offset)"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the stored payloads"""
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class MappedPayloadStore(_PayloadStore):
+    """A store of payloads in a memory mapped file
+
+       Every process maps the same file, so each payload is held once in
+       the page cache of the operating system however many processes read
+       it.
+    """
+
+    def __init__(self, path=None):
+        """Create an empty payload file
+
+        :param path: optional The payload file; by default a temporary file which is removed when the store is closed.
+        :type path: str | None
+        """
+        self._temporary = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(suffix='.payloads')
+            os.close(handle)
+        self.path = path
+        self._file = open(path, 'w+b')
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        atexit.register(self.close)
+
+    def _write(self, data):
+        with self._lock:
+            offset = -self._size % _ALIGNMENT + self._size
+            self._file.seek(offset)
+            self._file.write(data)
+            self._file.flush()
+            self._size = offset + data.nbytes
+        return ('file', self.path), offset
+
+    def close(self):
+        """Close the payload file, removing it if it is temporary
+
+           The handles of a store can't be resolved once it is closed.
+        """
+        if self._file.closed or os.getpid() != self._pid:
+            return
+        self._file.close()
+        with _buffers_lock:
+            buffer = _buffers.pop(('file', self.path), None)
+        if buffer is not None:
+            try:
+                buffer.close()
+            except BufferError:  # Views of the payloads still exist
+                pass
+        if self._temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SharedPayloadStore(_PayloadStore):
+    """A store of payloads in shared memory (requires Python 3.8)
+
+       Each payload is copied into it's own ``multiprocessing.shared_memory``
+       block; other processes attach to the block by name the first time
+       they resolve one of it's handles.
+    """
+
+    def __init__(self):
+        """Create an empty store"""
+        if _shared_memory is None:
+            raise RuntimeError('SharedPayloadStore requires the '
+                               'multiprocessing.shared_memory module')
+        self._blocks = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        atexit.register(self.close)
+
+    def _write(self, data):
+        block = _shared_memory.SharedMemory(create=True,
+                                            size=max(data.nbytes, 1))
+        block.buf[:data.nbytes] = data
+        with self._lock:
+            self._blocks.append(block)
+        return ('shm', block.name), 0
+
+    def close(self):
+        """Release and remove every shared memory block
+
+           Only the process which created the store removes the blocks; the
+           handles of a store can't be resolved once it is closed.
+        """
+        if os.getpid() != self._pid:
+            return
+        with self._lock:
+            blocks, self._blocks = self._blocks, []
+        for block in blocks:
+            # Views of the payload keep their own memory map alive
+            with _buffers_lock:
+                _buffers.pop(('shm', block.name), None)
+            block.close()
+            block.unlink()
+
+    def __len__(self):
+        return len(self._blocks)
+
+
+class PayloadCase(Mapping):
+    """A test case whose large values are held in a payload store
+
+       The case holds a :class:`Payload` handle in place of each large
+       value, and resolves the handle each time the value is retrieved, so
+       the test method receives a read only memoryview (or numpy array) of
+       the shared data. Pickling the case pickles only the handles.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def handle(self, key):
+        """The Payload handle of a key, or None if the value is inline"""
+        value = self._data[key]
+        return value if isinstance(value, Payload) else None
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        return value.resolve() if isinstance(value, Payload) else value
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(self._data)
+
+
+class PayloadSource(Sequence):
+    """A source of test cases whose large values are held in a store
+
+       Each test case is copied into a :class:`PayloadCase`, with every
+       value which supports the buffer protocol and is at least
+       ``min_size`` bytes long (or every value of one of the ``fields``)
+       moved into the ``store``. The source can be passed directly as the
+       ``test_cases`` argument of ``GenerateTestMethods``.
+    """
+
+    def __init__(self, test_cases, store, fields=None, min_size=65536):
+        """Move the large values of the test cases into the store
+
+        :param test_cases: The test case Mappings
+        :param store: The store which holds the payloads
+        :param fields: optional The keys whose values are always stored; by default the size of each value decides.
+        :param min_size: optional The size in bytes of the smallest value stored, when no fields are given.
+
+        :type test_cases: Iterable[ Mapping ]
+        :type store: MappedPayloadStore | SharedPayloadStore
+        :type fields: list[ str ] | None
+        :type min_size: int
+        """
+        if min_size < 1:
+            raise ValueError('min_size must be at least 1')
+        self._store = store
+        self._fields = set(fields) if fields is not None else None
+        self._min_size = min_size
+        self._cases = []
+        for index, case in enumerate(test_cases):
+            if not isinstance(case, Mapping):
+                raise TypeError(
+                    "test_cases item {} is not a Mapping".format(index))
+            self._cases.append(PayloadCase(dict(
+                (key, self._store_value(key, value))
+                for key, value in case.items())))
+
+    def _store_value(self, key, value):
+        """Return the handle for a stored value, or the value itself"""
+        if self._fields is not None and key not in self._fields:
+            return value
+        if isinstance(value, (_six.text_type, Payload)):
+            return value
+        try:
+            nbytes = memoryview(value).nbytes
+        except TypeError:
+            return value
+        if not nbytes or (self._fields is None and
+                          nbytes < self._min_size):
+            return value
+        return self._store.add(value)
+
+    def __getitem__(self, index):
+        return self._cases[index]
+
+    def __len__(self):
+        return len(self._cases)
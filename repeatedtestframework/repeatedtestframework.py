@@ -17,8 +17,17 @@ Testable Statements :
     ...
 """
 import six as _six
+import bisect
+import hashlib
+import os
+import re
+import string
+import sys
+import threading
 import unittest
+from array import array
 
+from .criteria import Criteria, FieldIndex
 from .version import __version__ as __version__
 
 __author__ = 'Tony Flury : anthony.flury@btinternet.com'
@@ -26,9 +35,408 @@ __created__ = '17 Jan 2017'
 
 # Python 3 introduced the collections.abc module
 if _six.PY2:
-    from collections import Iterable, Mapping
+    from collections import Iterable, Mapping, Sequence
 else:
-    from collections.abc import Iterable, Mapping
+    from collections.abc import Iterable, Mapping, Sequence
+
+# Coroutine test methods are only possible with Python 3
+if _six.PY2:
+    def _iscoroutinefunction(func):
+        return False
+else:
+    from inspect import iscoroutinefunction as _iscoroutinefunction
+    from . import asyncsupport as _asyncsupport
+
+# The environment variable which overrides the shard of every decorator
+_SHARD_ENVIRONMENT = 'RTF_SHARD'
+
+# The default repr of an object includes it's address
+_IDENTITY_REPR = re.compile(r'^<.* at 0x[0-9a-fA-F]+>$', re.DOTALL)
+
+# Test data keys which clash with the arguments of TestCase.subTest
+_SUBTEST_RESERVED = ('index', 'msg')
+
+
+def _canonical(value):
+    """A stable string for value, independent of dict and set ordering"""
+    if isinstance(value, Mapping):
+        return '{' + ','.join(sorted(
+            _canonical(key) + ':' + _canonical(item)
+            for key, item in value.items())) + '}'
+    if isinstance(value, (set, frozenset)):
+        return 'set(' + ','.join(sorted(_canonical(item)
+                                        for item in value)) + ')'
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__ + '(' +
+                ','.join(_canonical(item) for item in value) + ')')
+    if value is None or isinstance(
+            value, _six.string_types + _six.integer_types +
+            (_six.text_type, bytes, bytearray, bool, float, complex)):
+        return repr(value)
+
+    # The repr of a buffer (a memoryview, an array, or a large numpy array)
+    # is it's address or is truncated, so the content is hashed
+    try:
+        view = memoryview(value)
+    except TypeError:
+        pass
+    else:
+        return '{}({},{},{})'.format(
+            type(value).__name__, view.format, list(view.shape),
+            hashlib.sha1(view.tobytes()).hexdigest())
+
+    text = repr(value)
+    if _IDENTITY_REPR.search(text):
+        raise TypeError(
+            'test data value {} has a repr which depends on it\'s address, '
+            'so has no stable digest; define __repr__ for '
+            '{}'.format(text, type(value).__name__))
+    return text
+
+
+def case_digest(test_data):
+    """Return a stable hexadecimal digest of the test data of a test case
+
+       The digest is the same in every process and every run (unlike the
+       builtin ``hash``), and nested or unhashable values (dictionaries,
+       lists and sets) are allowed. Values which support the buffer
+       protocol (for instance arrays and numpy arrays) are digested by
+       their content; any other value is digested by it's repr, and a
+       TypeError is raised for an object whose repr is the default
+       ``<... at 0x...>``, which includes it's address.
+
+       :param test_data: The test case data
+       :type test_data: Mapping
+    """
+    return hashlib.sha1(_canonical(test_data).encode('utf-8')).hexdigest()
+
+
+def _parse_shard(shard):
+    """Return the (k, n) shard, overridden by the environment variable"""
+    environment = os.environ.get(_SHARD_ENVIRONMENT)
+    if environment:
+        try:
+            shard = tuple(int(part) for part in environment.split('/'))
+        except ValueError:
+            shard = ()
+        if len(shard) != 2:
+            raise ValueError(
+                '{} must be of the form k/n : {!r}'.format(
+                    _SHARD_ENVIRONMENT, environment))
+
+    if shard is None:
+        return None
+
+    if len(shard) != 2:
+        raise ValueError('shard must be a (k, n) tuple')
+    k, n = shard
+    if n < 1 or not 0 <= k < n:
+        raise ValueError(
+            'shard must satisfy 0 <= k < n : ({}, {})'.format(k, n))
+    return k, n
+
+
+class _MethodTemplate(object):
+    """A method name or documentation template, parsed once
+
+       The plain ``test_name`` fields are substituted when the template is
+       parsed, leaving a format string which refers to ``index`` and
+       ``test_data`` (and to ``test_name`` by item or attribute, for
+       instance ``{test_name[0]}``). A template with no remaining fields
+       is a constant.
+    """
+    __slots__ = ('template', '_test_name', '_format', '_constant',
+                 '_uses_data')
+
+    def __init__(self, template, test_name):
+        self.template = template
+        self._test_name = test_name
+        parts, remaining, self._uses_data = [], False, False
+        for literal, field, spec, conversion in \
+                string.Formatter().parse(template):
+            parts.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is None:
+                continue
+
+            if field == 'test_name' and '{' not in spec:
+                value = test_name
+                if conversion:
+                    value = ('{!' + conversion + '}').format(value)
+                parts.append(format(value, spec).replace(
+                    '{', '{{').replace('}', '}}'))
+                continue
+
+            remaining = True
+            if re.match(r'test_data\b', field):
+                self._uses_data = True
+            parts.append('{' + field +
+                         ('!' + conversion if conversion else '') +
+                         (':' + spec if spec else '') + '}')
+
+        compiled = ''.join(parts)
+        self._format = compiled.format if remaining else None
+        self._constant = None if remaining else compiled.format()
+
+    def __call__(self, index, test_data):
+        if self._format is None:
+            return self._constant
+        return self._format(index=index, test_data=test_data,
+                            test_name=self._test_name)
+
+    def lazy(self, index, test_data):
+        """Return the formatted template, or a placeholder which formats the
+           template when it is used
+
+           The placeholder is only used when the template refers to test
+           data which may be expensive to format, so most documentation
+           strings are still a real ``str``.
+        """
+        if self._format is None:
+            return self._constant
+        if not self._uses_data or _is_small(test_data):
+            return self(index, test_data)
+        return _LazyDocString(self, index, test_data)
+
+
+# The values of a test case which are cheap enough to format at once
+_SCALAR_TYPES = _six.integer_types + (float, bool, type(None))
+_SMALL_ITEMS = 16
+_SMALL_TEXT = 80
+
+
+def _is_small(test_data):
+    """True if a test case is small enough to be formatted immediately"""
+    if not isinstance(test_data, Mapping) or len(test_data) > _SMALL_ITEMS:
+        return False
+    for value in test_data.values():
+        if isinstance(value, (_six.text_type, bytes)):
+            if len(value) > _SMALL_TEXT:
+                return False
+        elif not isinstance(value, _SCALAR_TYPES):
+            return False
+    return True
+
+
+class _LazyDocString(object):
+    """A documentation string which is only formatted when it is used
+
+       The documentation string behaves as the formatted string when it is
+       printed, compared or when any string method is called, but it is not
+       cached, so large test data is never held as a string.
+    """
+    __slots__ = ('_template', '_index', '_test_data')
+
+    def __init__(self, template, index, test_data):
+        self._template = template
+        self._index = index
+        self._test_data = test_data
+
+    def __str__(self):
+        return self._template(self._index, self._test_data)
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        return str(self) == other
+
+    def __ne__(self, other):
+        return str(self) != other
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __bool__(self):
+        return bool(str(self))
+
+    __nonzero__ = __bool__
+
+    def __len__(self):
+        return len(str(self))
+
+    def __add__(self, other):
+        return str(self) + other
+
+    def __radd__(self, other):
+        return other + str(self)
+
+    def __getattr__(self, name):
+        if name in self.__slots__:
+            raise AttributeError(name)
+        return getattr(str(self), name)
+
+
+class MethodRegistry(Mapping):
+    """The registry of the test methods generated on a TestCase class
+
+       The registry is available as the ``_RTF_METHODS`` attribute of a class
+       decorated by GenerateTestMethods. For each generated test method the
+       registry holds the method name, the index of the test case and the
+       test case data, in parallel arrays in the order they were generated.
+       Test methods can be looked up by name or by test case index.
+
+       For compatibility the registry is also a Mapping of method name to a
+       dictionary with the keys ``index`` and ``test_data``; these
+       dictionaries are created on demand.
+    """
+
+    def __init__(self, group=''):
+        """Create an empty registry
+
+        :param group: optional The test_name of the GenerateTestMethods decorator
+        """
+        self.group = group
+        self._names = []
+        self._cases = []
+        self._indices = array('l')
+        self._positions = {}
+
+        # Only needed when the test case indices are not consecutive
+        self._by_index = None
+        self._consecutive = True
+        self._ascending = True
+
+        # Indexes of the test case fields used by declarative criteria
+        self._field_indices = {}
+
+        # Test case index to the indices of it's duplicate test cases
+        self._aliases = {}
+
+    def add(self, name, index, case):
+        """Register a generated test method
+
+        :param name: The name of the generated test method
+        :param index: The index of the test case
+        :param case: The test case data
+        """
+        if self._field_indices:
+            self._field_indices = {}
+
+        position = self._positions.get(name)
+        if position is not None:
+            # The same name generated twice - the later test method wins
+            self._cases[position] = case
+            self._indices[position] = index
+            self._by_index = None
+            self._consecutive = False
+            self._ascending = False
+            return
+
+        if self._indices and index != self._indices[-1] + 1:
+            self._consecutive = False
+            if index < self._indices[-1]:
+                self._ascending = False
+        self._positions[name] = len(self._names)
+        self._names.append(name)
+        self._cases.append(case)
+        self._indices.append(index)
+        if self._by_index is not None:
+            self._by_index[index] = self._positions[name]
+
+    def _position_of_index(self, index):
+        """The position within the registry of a test case index"""
+        if self._consecutive:
+            position = index - self._indices[0] if self._indices else -1
+            if 0 <= position < len(self._indices):
+                return position
+            raise KeyError(index)
+        if self._by_index is None:
+            self._by_index = dict(
+                (case_index, position)
+                for position, case_index in enumerate(self._indices))
+        return self._by_index[index]
+
+    def entries(self):
+        """Generate the (name, index, test_data) of every test method"""
+        return _six.moves.zip(self._names, self._indices, self._cases)
+
+    def names(self):
+        """The names of the generated test methods in generation order"""
+        return list(self._names)
+
+    def indices(self):
+        """The test case indices of the generated test methods in order"""
+        return list(self._indices)
+
+    def names_in_range(self, start, stop):
+        """The names of the test methods whose test case index is at least
+           start and less than stop, in generation order
+        """
+        if self._ascending:
+            return self._names[bisect.bisect_left(self._indices, start):
+                               bisect.bisect_left(self._indices, stop)]
+        return [name for name, index in _six.moves.zip(self._names,
+                                                       self._indices)
+                if start <= index < stop]
+
+    def entry(self, name):
+        """Return the (index, test_data) for a test method name"""
+        position = self._positions[name]
+        return self._indices[position], self._cases[position]
+
+    def by_index(self, index):
+        """Return the (name, test_data) for a test case index"""
+        position = self._position_of_index(index)
+        return self._names[position], self._cases[position]
+
+    def name_of(self, index):
+        """Return the test method name for a test case index"""
+        return self._names[self._position_of_index(index)]
+
+    def add_alias(self, index, alias):
+        """Record that test case alias is a duplicate of test case index
+
+        :param index: The index of the test case which was generated
+        :param alias: The index of the duplicate test case
+        """
+        aliases = self._aliases.setdefault(index, [])
+        if alias not in aliases:
+            aliases.append(alias)
+
+    def aliases(self, index):
+        """The indices of the duplicates of a test case, in order"""
+        return list(self._aliases.get(index, ()))
+
+    def duplicates(self):
+        """A dictionary of test case index to the indices of it's duplicates
+        """
+        return dict((index, list(aliases))
+                    for index, aliases in self._aliases.items())
+
+    def field_index(self, field):
+        """Return the index of a test case field, building it if needed
+
+        :param field: The key of the test case data to index
+        :rtype: repeatedtestframework.criteria.FieldIndex
+        """
+        index = self._field_indices.get(field)
+        if index is None:
+            index = self._field_indices[field] = FieldIndex(self._cases,
+                                                            field)
+        return index
+
+    def select(self, criteria):
+        """Generate the (name, index, test_data) of the matching methods
+
+        :param criteria: Declarative criteria, answered from the field indexes
+        :type criteria: repeatedtestframework.Criteria
+        """
+        for position in criteria.positions(self):
+            yield (self._names[position], self._indices[position],
+                   self._cases[position])
+
+    def __getitem__(self, name):
+        index, case = self.entry(name)
+        return {'index': index, 'test_data': case}
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
 
 
 class GenerateTestMethods(object):
@@ -40,7 +448,20 @@ class GenerateTestMethods(object):
                  test_cases=None,
                  method_name_template="test_{index:03d}_{test_name}",
                  method_doc_template="{test_name} {index:03d}: "
-                                     "{test_data}"
+                                     "{test_data}",
+                 lazy=False,
+                 collapse=False,
+                 batch_size=None,
+                 batch_format='records',
+                 instrumentation=None,
+                 shard=None,
+                 shard_by='index',
+                 history=None,
+                 cache=None,
+                 decorators=None,
+                 duplicates=None,
+                 fixtures=None,
+                 max_failures=None
                  ):
         """Automatically generates test cases based on the data sets
 
@@ -61,6 +482,9 @@ class GenerateTestMethods(object):
             test_method **must** be a wrapping function which contains the actual
             test exacution method as a closure. This is illustrated in the example code below
 
+        If the callable returned by ``test_method`` is a coroutine function,
+        the generated test method executes the coroutine on a new event loop.
+
         ``test_cases`` is a iterator for which each entry is a Mapping (for
         instance a dict). Each dict is unpacked as arguments into the callable
         specified by the test_method arguemnt. By default the dict should contain
@@ -71,7 +495,11 @@ class GenerateTestMethods(object):
         of the test methods to be created.
 
         ``method_doc_template`` is a python format string which defines the
-        documentation string of the test methods to be created.
+        documentation string of the test methods to be created. For a large
+        test case the documentation string is only formatted when it is used
+        (for instance in verbose test output), so that large test data is not
+        converted to a string for every test method; such a documentation
+        string is not a ``str``, so is not shown by ``inspect.getdoc``.
 
         Both the ``method_name_template`` and ``method_doc_template`` can contain
         the following keys :
@@ -80,17 +508,150 @@ class GenerateTestMethods(object):
             - ``index`` : the value is the start from zero index of the appropriate entry in the `test_case` iterator for this test case
             - ``test_data`` : the value is the appropriate entry within the test_cases iterator for this test case.
 
+        ``lazy`` determines when the test methods are built. By default every
+        test method is built when the class is decorated. If ``lazy`` is True
+        only the method names are registered on the class, and each test
+        method is built (by calling ``test_method``) the first time it is
+        retrieved from an instance - for instance when the unittest loader
+        creates the test case, or when a single test is selected by name.
+
+        ``collapse`` generates a single test method for all of the test
+        cases, rather than one test method per test case. The single test
+        method is named ``test_<test_name>``, and executes each test case
+        within ``self.subTest(index=index, **test_data)`` so that each failing
+        test case is still reported separately (a ``msg`` key in the test
+        data is left out of the ``subTest`` parameters, since it would clash
+        with the message argument of ``subTest``); a collapsed test
+        method needs ``subTest``, so it can't be used on Python 2. The
+        ``test_cases`` iterator is only iterated when the test method is
+        executed, so a streamed iterator is never held in memory (but a
+        one-shot iterator such as a generator can only be executed once).
+
+        ``batch_size`` executes ``test_method`` once for each batch of
+        ``batch_size`` consecutive test cases, rather than once for each test
+        case; this is intended for tests which can check many test cases in
+        one call (for instance using numpy). In batch mode ``test_method``
+        is called with the signature :
+
+            *test_method* (indices: list, batch: object)
+
+        where ``batch`` is a list of the test case Mappings if
+        ``batch_format`` is ``'records'``, or a dictionary of key to a list of
+        values if ``batch_format`` is ``'columns'``. ``test_method`` must
+        return a pass/fail mask with one entry per test case (a list or an
+        array, but not a tuple), or a tuple of the mask and a sequence of
+        failure messages. A test method is still generated for each test
+        case; the batch is evaluated when the first of it's test methods is
+        executed, and each test method fails if it's entry in the mask is
+        false. The outcome of the batch is kept until each of it's test
+        methods which is not skipped has executed, or until the
+        ``tearDownClass`` method of the class executes. An exception raised by ``test_method`` is reported as an error
+        by every test method in the batch.
+
+        ``instrumentation`` is an optional
+        ``repeatedtestframework.Instrumentation`` instance; each generated
+        test method is wrapped so that the wall time, processor time, outcome
+        and (optionally) peak memory allocation of every execution is
+        recorded against the test case index, method name and test data.
+
+        ``shard`` is an optional ``(k, n)`` tuple; only the test cases in
+        shard ``k`` (counting from zero) of ``n`` are turned into test
+        methods, so that a large suite can be split between ``n`` workers
+        without each worker generating every test method. If ``shard_by`` is
+        ``'index'`` a test case is in shard ``index % n``; if ``shard_by`` is
+        ``'hash'`` the shard is taken from :func:`case_digest`, so a test case
+        stays in the same shard when other test cases are added or removed.
+        If ``shard_by`` is ``'duration'`` the test cases are balanced
+        between the shards by their duration in earlier runs, taken from
+        ``history`` (a ``repeatedtestframework.DurationHistory``); every
+        shard must use the same history. Whichever is used the ``n`` shards
+        together contain every test case exactly once, and each test case
+        keeps it's original index. The ``RTF_SHARD``
+        environment variable (for instance ``RTF_SHARD=2/8``) overrides
+        ``shard`` for every decorator.
+
+        ``cache`` is an optional ``repeatedtestframework.ResultCache``; a
+        test case which passed on an earlier run with the same test case
+        data, the same ``test_method`` and the same cache salt is skipped
+        with the reason ``'cached pass'`` (or if the cache was created with
+        ``omit=True`` is not generated at all). Every other test case is
+        executed as normal, and recorded in the cache if it passes.
+
+        ``decorators`` is an optional list of the decorators returned by
+        ``DecorateTestMethod``, ``skip``, ``skipIf``, ``skipUnless`` and
+        ``expectedFailure``. Rather than each decorator making a separate
+        pass over every test method once the class is created, the
+        decorators are applied as each test method is generated, in list
+        order (so the first decorator in the list is the innermost). The
+        result is the same as stacking the decorators on the class, except
+        that a test case which matches a ``skip`` (or ``skipIf`` or
+        ``skipUnless``) decorator is not built at all : ``test_method`` is
+        not called for the test case, and the test method is a stub which
+        is shared by all the test cases skipped for the same reason (and
+        which has no documentation string).
+
+        ``duplicates`` determines how test cases with the same data are
+        handled. By default every test case generates a test method. If
+        ``duplicates`` is ``'collapse'`` only the first of each set of
+        identical test cases generates a test method, and the indices of the
+        others are recorded as it's aliases in the registry (see
+        ``MethodRegistry.aliases``). If ``duplicates`` is ``'raise'`` a
+        duplicate test case raises a ValueError. Test cases are compared
+        using :func:`case_digest`, so nested and unhashable values are
+        allowed.
+
+        ``fixtures`` is an optional list of
+        ``repeatedtestframework.FixtureCache`` instances which are scoped to
+        the test class : each is cleared (tearing down it's values) when the
+        ``tearDownClass`` method of the class executes.
+
+        ``max_failures`` is an optional limit on the number of test methods
+        from this decorator which fail (or raise an error). Once the limit
+        is reached every later test method from this decorator is skipped as
+        soon as it starts, with a reason naming the ``test_name``, while the
+        test methods from other decorators execute as normal. Test methods
+        which are expected to fail are not counted. The count is reset when
+        the ``tearDownClass`` method of the class executes, so each run of
+        the class (and each chunk of a ``ProcessPoolSuite``) counts it's own
+        failures.
+
         :param test_name: mandatory valid python identifier for these tests
         :param test_method: mandatory the actual test method to execute
         :param test_cases: mandatory a list of tuples defining the actual test cases
         :param method_name_template: optional A format string for the test method name
         :param method_doc_template: optional A format string for the test doc string
+        :param lazy: optional build test methods only when first accessed
+        :param collapse: optional generate a single test method using subTest
+        :param batch_size: optional execute test_method for batches of this many test cases
+        :param batch_format: optional 'records' or 'columns'
+        :param instrumentation: optional records the timing of each test method
+        :param shard: optional only generate the test cases in shard k of n
+        :param shard_by: optional 'index', 'hash' or 'duration'
+        :param history: optional the durations used when shard_by is 'duration'
+        :param cache: optional skip test cases which passed on an earlier run
+        :param decorators: optional decorators applied as the test methods are generated
+        :param duplicates: optional None, 'collapse' or 'raise'
+        :param fixtures: optional fixture caches cleared by tearDownClass
+        :param max_failures: optional skip the remaining test methods after this many failures
 
         :type test_name: str
         :type test_method: Callable
         :type test_cases: list[ Mapping ] | None
         :type method_name_template: str
         :type method_doc_template: str
+        :type lazy: bool
+        :type collapse: bool
+        :type batch_size: int | None
+        :type batch_format: str
+        :type instrumentation: repeatedtestframework.Instrumentation
+        :type shard: tuple(int, int) | None
+        :type shard_by: str
+        :type history: repeatedtestframework.DurationHistory
+        :type cache: repeatedtestframework.ResultCache
+        :type decorators: list[ Callable ] | None
+        :type duplicates: str | None
+        :type fixtures: list[ repeatedtestframework.FixtureCache ] | None
+        :type max_failures: int | None
 
         """
         if not self._isidentifier(test_name):
@@ -109,8 +670,80 @@ class GenerateTestMethods(object):
         else:
             self._test_cases = test_cases
 
-        self._method_name_template = method_name_template
-        self._method_doc_template = method_doc_template
+        self._method_name_template = _MethodTemplate(method_name_template,
+                                                     test_name)
+        self._method_doc_template = _MethodTemplate(method_doc_template,
+                                                    test_name)
+        self._lazy = lazy
+        self._collapse = collapse
+
+        # The (criteria, decorator) pairs applied as each method is built,
+        # and the (criteria, reason) pairs of the skip decorators
+        self._decorations = []
+        self._skips = []
+        for number, decorator in enumerate(decorators or ()):
+            if not hasattr(decorator, '_rtf_decoration'):
+                raise TypeError(
+                    'decorators item {} is not a DecorateTestMethod '
+                    'decorator'.format(number))
+            if decorator._rtf_decoration is None:
+                continue
+            criteria, decorator, skip_reason = decorator._rtf_decoration
+            if skip_reason is None:
+                self._decorations.append((criteria, decorator))
+            else:
+                self._skips.append((criteria, skip_reason))
+        self._skip_stubs = {}
+
+        if duplicates not in (None, 'collapse', 'raise'):
+            raise ValueError(
+                "duplicates must be one of None, 'collapse' or 'raise'")
+        self._duplicates = duplicates
+        self._fixtures = list(fixtures or ())
+
+        # Decorators for each test case of a collapsed test method
+        self._case_decorators = []
+
+        if batch_size is not None:
+            if batch_size < 1:
+                raise ValueError('batch_size must be at least 1')
+            if batch_format not in ('records', 'columns'):
+                raise ValueError(
+                    "batch_format must be either 'records' or 'columns'")
+            if collapse:
+                raise ValueError(
+                    'batch_size cannot be used with a collapsed test method')
+        if collapse and _six.PY2:
+            raise ValueError(
+                'A collapsed test method requires subTest (Python 3.4+)')
+        self._batch_size = batch_size
+        self._batch_format = batch_format
+        self._instrumentation = instrumentation
+
+        if shard_by not in ('index', 'hash', 'duration'):
+            raise ValueError(
+                "shard_by must be one of 'index', 'hash' or 'duration'")
+        if shard_by == 'duration' and history is None:
+            raise ValueError("shard_by 'duration' requires a history")
+        self._shard = _parse_shard(shard)
+        self._shard_by = shard_by
+        self._history = history
+
+        self._cache = cache
+        self._fingerprint = cache.fingerprint(test_method) \
+            if cache is not None else None
+
+        if max_failures is not None and max_failures < 1:
+            raise ValueError('max_failures must be at least 1')
+        self._max_failures = max_failures
+        self._failures = _FailureCount()
+
+        # The registry of the class, set when the class is decorated
+        self._registry = None
+
+        # Outcomes of the batches which are in progress
+        self._batches = {}
+        self._batch_lock = threading.Lock()
 
     @staticmethod
     def _isidentifier(name):
@@ -128,27 +761,422 @@ class GenerateTestMethods(object):
                 'Invalid type: Decorator target is not '
                 'unittest.TestCase subclass')
 
-        cls._RTF_DECORATED = True
-        cls._RTF_METHODS = {}
+        # The test methods which are not generated, found while the class
+        # is still small; see repeatedtestframework.RegistryLoader
+        cls._RTF_OTHER_TESTS = unittest.TestLoader().getTestCaseNames(cls)
 
-        for index, case in enumerate(self._test_cases):
+        cls._RTF_DECORATED = True
+        cls._RTF_METHODS = registry = MethodRegistry(self._test_name)
+        # A GenerateTestMethods stacked above replaces _RTF_METHODS
+        self._registry = registry
+        cls._RTF_COLLAPSED = self if self._collapse else None
+
+        # The outcomes of any batch whose test methods were not all executed
+        # (for instance when some were not loaded) are discarded at the end
+        if self._cache is not None:
+            self._cache.watch(cls)
+
+        cleared = list(self._fixtures)
+        if self._batch_size is not None:
+            cleared.append(self._batches)
+        # Each run of the class starts with no failures
+        if self._max_failures is not None:
+            cleared.append(self._failures)
+        if cleared:
+            _clear_fixtures(cls, cleared)
+
+        if self._collapse:
+            name = 'test_' + self._test_name
+            setattr(cls, name, self._build_collapsed_method(name))
+            return cls
+
+        for index, case in self._unique_cases(registry):
             if not isinstance(case, Mapping):
                 raise TypeError(
                     "test_cases item {} is not a Mapping".format(index))
 
-            # Add in the test data as a single item
-            test_data = {'index': index, 'test_data': case}
+            if self._cache is not None and self._cache.omit and \
+                    self._cache.key(self._fingerprint, case) in self._cache:
+                continue
+
+            name = self._method_name_template(index, case)
+
+            method = self._skip_stub(case)
+            if method is None:
+                method = _LazyTestMethod(self, cls, name, registry) \
+                    if self._lazy else self._build_method(name, index, case)
+            setattr(cls, name, method)
+            registry.add(name, index, case)
+        return cls
 
+    def _iter_cases(self):
+        """Yield the (index, test case) for each test case in the shard"""
+        if self._shard is None:
+            return enumerate(self._test_cases)
+
+        k, n = self._shard
+        if self._shard_by == 'duration':
+            cases = self._test_cases if isinstance(
+                self._test_cases, Sequence) else list(self._test_cases)
+            shard = self._history.partition(self._test_name,
+                                            enumerate(cases), n)[k]
+            return ((index, cases[index]) for index in sorted(shard))
+
+        if self._shard_by == 'hash':
+            return ((index, case)
+                    for index, case in enumerate(self._test_cases)
+                    if not isinstance(case, Mapping) or
+                    int(case_digest(case), 16) % n == k)
+
+        # Only the test cases in the shard need to be retrieved
+        if isinstance(self._test_cases, Sequence):
+            return ((index, self._test_cases[index])
+                    for index in _six.moves.range(
+                        k, len(self._test_cases), n))
+        return ((index, case)
+                for index, case in enumerate(self._test_cases)
+                if index % n == k)
+
+    def _unique_cases(self, registry):
+        """Yield the (index, test case) for each test case in the shard,
+           handling duplicate test cases as requested
+        """
+        if self._duplicates is None:
+            return self._iter_cases()
+        return self._without_duplicates(registry)
+
+    def _without_duplicates(self, registry):
+        first = {}
+        for index, case in self._iter_cases():
+            if isinstance(case, Mapping):
+                original = first.setdefault(case_digest(case), index)
+                if original != index:
+                    if self._duplicates == 'raise':
+                        raise ValueError(
+                            'test_cases item {} is a duplicate of item '
+                            '{}'.format(index, original))
+                    registry.add_alias(original, index)
+                    continue
+            yield index, case
+
+    def _skip_stub(self, case):
+        """Return the shared skip stub if the test case is to be skipped
+
+           When several skip decorators match, the reason of the last
+           (i.e. the outermost) is used.
+        """
+        for criteria, reason in reversed(self._skips):
+            if criteria(case):
+                if reason not in self._skip_stubs:
+                    self._skip_stubs[reason] = _skip_stub(reason)
+                return self._skip_stubs[reason]
+        return None
+
+    def _build_method(self, name, index, case, decorators=()):
+        """Create the actual test method for a single test case
+
+           The ``decorators`` argument and the matching ``decorators``
+           passed to the constructor are applied, and the method name and
+           doc string are set once on the final method.
+        """
+
+        if self._batch_size is not None:
+            test_method = self._build_batch_case(index)
+        else:
             # Pass test_data as individual arguments to the test method
+            if 'index' in case:
+                raise TypeError(
+                    "Test case {} has an 'index' key, which clashes with the "
+                    "index argument of the test method".format(index))
             test_method = self._method(index, **case)
 
-            test_method.__name__ = self._method_name_template.format(
-                test_name=self._test_name, index=index, test_data=case)
-            test_method.__doc__ = self._method_doc_template.format(
-                test_name=self._test_name, index=index, test_data=case)
-            setattr(cls, test_method.__name__, test_method)
-            cls._RTF_METHODS[test_method.__name__] = test_data
-        return cls
+        # A coroutine test method is executed on it's own event loop
+        coroutine_function = None
+        if _iscoroutinefunction(test_method):
+            coroutine_function = test_method
+            test_method = _asyncsupport.synchronous(test_method)
+
+        if self._cache is not None:
+            test_method = self._cache.wrap(
+                test_method, self._cache.key(self._fingerprint, case))
+
+        if self._instrumentation is not None:
+            test_method = self._instrumentation.wrap(
+                test_method, self._test_name, name, index, case)
+
+        if self._max_failures is not None:
+            test_method = self._limit_failures(test_method)
+
+        for criteria, decorator in self._decorations:
+            if criteria(case):
+                test_method = decorator(test_method)
+        for decorator in decorators:
+            test_method = decorator(test_method)
+
+        # The AsyncioSuite executes a wrapped coroutine with it's wrappers
+        if coroutine_function is not None and \
+                not hasattr(test_method, '_rtf_coroutine'):
+            test_method._rtf_coroutine = coroutine_function
+
+        test_method.__name__ = name
+        test_method.__doc__ = self._method_doc_template.lazy(index, case)
+        return test_method
+
+    def _limit_failures(self, method):
+        """Wrap a test method so that it counts the failures of the group,
+           and is skipped once the group has reached max_failures
+        """
+        generator = self
+
+        def test_method(self):
+            if generator._failures.count >= generator._max_failures:
+                raise unittest.SkipTest(
+                    '{} aborted after {} failures'.format(
+                        generator._test_name, generator._max_failures))
+            try:
+                return method(self)
+            except unittest.SkipTest:
+                raise
+            except Exception:
+                # The decorators may have been applied to an outer wrapper
+                if not (getattr(test_method, '__unittest_expecting_failure__',
+                                False) or
+                        getattr(getattr(self, self._testMethodName, None),
+                                '__unittest_expecting_failure__', False)):
+                    generator._failures.add()
+                raise
+
+        return test_method
+
+    def _build_batch_case(self, index):
+        """Create the test method for a single test case in batch mode"""
+        generator = self
+
+        def test_method(self):
+            passed, message = generator._batch_outcome(type(self), index)
+            if not passed:
+                self.fail(message or 'test case {} failed'.format(index))
+
+        return test_method
+
+    def _evaluate_batch(self, registry, number):
+        """Call test_method for a batch of test cases
+
+           Returns the (mask, messages, error) for the batch, and the
+           number of test cases in the batch.
+        """
+        start = number * self._batch_size
+        indices, cases = [], []
+        for index in _six.moves.range(start, start + self._batch_size):
+            try:
+                cases.append(registry.by_index(index)[1])
+            except KeyError:
+                continue
+            indices.append(index)
+
+        if self._batch_format == 'columns':
+            batch = {}
+            for case in cases:
+                for key, value in case.items():
+                    batch.setdefault(key, []).append(value)
+        else:
+            batch = cases
+
+        try:
+            outcome = self._method(indices, batch)
+            mask, messages = outcome if isinstance(outcome, tuple) \
+                else (outcome, None)
+            if len(mask) != len(indices):
+                raise ValueError(
+                    'test_method returned a mask of {} entries for a batch '
+                    'of {} test cases'.format(len(mask), len(indices)))
+        except Exception:
+            return (None, None, sys.exc_info()), indices
+        return (mask, messages, None), indices
+
+    def _asks_outcome(self, test_class, name, case):
+        """True if the test method of a test case will request it's outcome
+
+           A skipped test method (including a cached pass) never executes,
+           so the batch is not kept for it.
+        """
+        method = getattr(test_class, name, None)
+        if isinstance(method, _LazyTestMethod):
+            return self._cache is None or \
+                self._cache.key(self._fingerprint, case) not in self._cache
+        return method is not None and \
+            not getattr(method, '__unittest_skip__', False)
+
+    def _batch_outcome(self, test_class, index):
+        """Return the (passed, message) for a single test case in a batch
+
+           The batch is evaluated the first time one of it's test cases is
+           requested, and discarded once all of it's test cases which are
+           not skipped have been requested (or when the tearDownClass of
+           the class executes).
+        """
+        number = index // self._batch_size
+        with self._batch_lock:
+            if number not in self._batches:
+                registry = self._registry
+                outcome, indices = self._evaluate_batch(registry, number)
+                positions = dict(
+                    (case_index, position)
+                    for position, case_index in enumerate(indices))
+                waiting = sum(
+                    1 for case_index in indices
+                    if case_index == index or self._asks_outcome(
+                        test_class, *registry.by_index(case_index)))
+                self._batches[number] = [outcome, positions, waiting]
+            batch = self._batches[number]
+            batch[2] -= 1
+            if batch[2] <= 0:
+                del self._batches[number]
+
+        (mask, messages, error), positions, _ = batch
+        if error is not None:
+            _six.reraise(*error)
+
+        position = positions[index]
+        message = messages[position] if messages is not None else None
+        return bool(mask[position]), message
+
+    def add_case_decorator(self, criteria, decorator):
+        """Record a decorator for the test cases of a collapsed test method
+
+           The decorator is applied to the test method for each test case
+           for which criteria returns True, as each test case is executed.
+        """
+        self._case_decorators.append((criteria, decorator))
+
+    def _build_collapsed_method(self, name):
+        """Create the single test method which executes every test case"""
+        generator = self
+
+        def test_method(self):
+            for index, case in generator._unique_cases(generator._registry):
+                params = {key: value for key, value in case.items()
+                          if key not in _SUBTEST_RESERVED}
+                with self.subTest(index=index, **params):
+                    generator._execute_case(self, index, case)
+
+        test_method.__name__ = name
+        test_method.__doc__ = '{}: all test cases'.format(self._test_name)
+        return test_method
+
+    def _execute_case(self, test, index, case):
+        """Execute a single test case of a collapsed test method"""
+        if not isinstance(case, Mapping):
+            raise TypeError(
+                "test_cases item {} is not a Mapping".format(index))
+
+        method = self._skip_stub(case) or self._build_method(
+            self._method_name_template(index, case), index, case)
+        for criteria, decorator in self._case_decorators:
+            if criteria(case):
+                method = decorator(method)
+
+        # Within a subTest an expected failure is simply not reported
+        if getattr(method, '__unittest_expecting_failure__', False):
+            try:
+                method(test)
+            except Exception:
+                return
+            raise test.failureException(
+                'Unexpected success of test case {}'.format(index))
+
+        method(test)
+
+
+class _FailureCount(object):
+    """The number of failures of the test methods from one decorator"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self):
+        with self._lock:
+            self.count += 1
+
+    def clear(self):
+        """Reset the count, at the end of a run of the class"""
+        with self._lock:
+            self.count = 0
+
+
+def _clear_fixtures(cls, fixtures):
+    """Wrap the tearDownClass of cls so that it clears the fixtures (or
+       anything else with a clear method)"""
+    original = cls.__dict__.get('tearDownClass')
+
+    def tearDownClass(klass):
+        try:
+            if original is not None:
+                original.__get__(None, klass)()
+            else:
+                super(cls, klass).tearDownClass()
+        finally:
+            for fixture in fixtures:
+                fixture.clear()
+
+    cls.tearDownClass = classmethod(tearDownClass)
+
+
+def _skip_stub(reason, doc=None):
+    """A test method which is skipped, shared by many skipped test cases
+       unless it is given the documentation string of a single test method
+    """
+    @unittest.skip(reason)
+    def skipped(self):
+        pass
+
+    skipped.__doc__ = doc
+    skipped._rtf_skip_stub = True
+    return skipped
+
+
+class _LazyTestMethod(object):
+    """Placeholder for a generated test method which is not yet built
+
+       Retrieving the placeholder from the class returns the placeholder
+       itself (so that loaders can see a callable), while retrieving it from
+       an instance builds the real test method, replaces the placeholder on
+       the class and returns the bound method.
+    """
+    __slots__ = ('_generator', '_cls', '_name', '_registry', '_decorators')
+
+    def __init__(self, generator, cls, name, registry):
+        self._generator = generator
+        self._cls = cls
+        self._name = name
+        self._registry = registry
+        self._decorators = ()
+
+    def add_decorator(self, decorator):
+        """Record a decorator to be applied when the method is built"""
+        self._decorators += (decorator,)
+
+    def doc(self, index, case):
+        """The documentation string of the test method, formatted lazily"""
+        # noinspection PyProtectedMember
+        return self._generator._method_doc_template.lazy(index, case)
+
+    def build(self):
+        """Build the test method, and replace the placeholder on the class"""
+        index, case = self._registry.entry(self._name)
+        method = self._generator._build_method(self._name, index, case,
+                                               self._decorators)
+        setattr(self._cls, self._name, method)
+        return method
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return self.build().__get__(instance, owner)
+
+    def __call__(self, instance, *args, **kwargs):
+        return self.build()(instance, *args, **kwargs)
 
 
 # noinspection PyPep8Naming
@@ -156,17 +1184,20 @@ def DecorateTestMethod(criteria=lambda test_data: True, decorator_method=None,
                        decorator_args=None, decorator_kwargs=None):
     """A decorator to allow generated test methods to be deocorated (e.g.. skipped)
 
-    :param criteria: A callable which will return boolean. The callable is passed a relevant item from test_input list (from the ``GenerateTestMethods``) call. The ``criteria`` should return a boolean value which determines if the test method which will be generated for this test_input item should be deoctorated or not.
+    :param criteria: A callable which will return boolean. The callable is passed a relevant item from test_input list (from the ``GenerateTestMethods``) call. The ``criteria`` should return a boolean value which determines if the test method which will be generated for this test_input item should be deoctorated or not. Alternatively a Mapping of declarative lookups (see ``repeatedtestframework.Criteria``), for instance ``{'platform': 'win', 'size__gt': 1000}``, which is answered from an index of the test cases.
     :param decorator_method: A decorator called which will be used to decorate the test_method.
     :param decorator_args:  A typle of the positional arguments passed to the ``decorator_method`` callable.
     :param decorator_kwargs: A dictionary of keyword arguments passed to the ``decorator_method`` callable.
 
-    :type criteria: Callable -> Boolean
+    :type criteria: Callable -> Boolean | Mapping
     :type decorator_method: Callable -> Callable
     :type decorator_args: tuple
     :type decorator_kwargs: dict
 
     """
+    if isinstance(criteria, Mapping):
+        criteria = Criteria(criteria)
+
     # Double check the attribute validity
     if not (callable(criteria)):
         raise TypeError('criteria is not callable')
@@ -180,12 +1211,21 @@ def DecorateTestMethod(criteria=lambda test_data: True, decorator_method=None,
     if decorator_kwargs is None:
         decorator_kwargs = {}
 
-    # noinspection PyProtectedMember
-    def _iter_method_data(cls_):
-        """Helper method to iterate around the data for each method """
-        for method_name, test_data in cls_._RTF_METHODS.items():
-            yield method_name, test_data['index'], test_data[
-                'test_data'], getattr(cls_, method_name)
+    if decorator_args or decorator_kwargs:
+        # The decorator_method is called for each test method, as the
+        # decorator it returns may keep state for a single test method
+        def decorator(method):
+            return decorator_method(*decorator_args,
+                                    **decorator_kwargs)(method)
+    else:
+        decorator = decorator_method
+
+    # A skipped test method is replaced by a stub shared by every test
+    # method skipped by this decorator, rather than being wrapped
+    skip_reason = None
+    if decorator_method is unittest.skip:
+        skip_reason = decorator_kwargs['reason'] \
+            if 'reason' in decorator_kwargs else decorator_args[0]
 
     def class_wrapper(cls):
         """ Function returned by the decorator to wrap the class
@@ -199,30 +1239,62 @@ def DecorateTestMethod(criteria=lambda test_data: True, decorator_method=None,
                 'decorate a TestCase class which is already decorated '
                 'by GenerateTestMethods')
 
-        for name, index, data, method in _iter_method_data(cls):
-
-            # Create a temp dictionary to allow unpacking of test data dictionary
-            # Unpacking within the dictionary initialiser is allowed in Py3 - but having
-            # a separate code segment of Py3 is overkill.
-            criteria_data = {'index': data}
-            criteria_data.update(**data)
-
-            if criteria(data):
-                if decorator_args or decorator_kwargs:
-                    new_method = decorator_method(
-                        *decorator_args,
-                        **decorator_kwargs)(method)
-                else:
-                    new_method = decorator_method(method)
-
-                new_method.__name__ = name
-                new_method.__doc__ = method.__doc__
-                setattr(cls, name, new_method)
+        # A collapsed test method is decorated as each test case is executed
+        collapsed = getattr(cls, '_RTF_COLLAPSED', None)
+        if collapsed is not None:
+            collapsed.add_case_decorator(criteria, decorator)
+            return cls
+
+        # noinspection PyProtectedMember
+        registry = cls._RTF_METHODS
+        if isinstance(criteria, Criteria):
+            matching = registry.select(criteria)
+        else:
+            matching = (entry for entry in registry.entries()
+                        if criteria(entry[2]))
+
+        # Only the test methods which match are retrieved from the class
+        for name, index, data in matching:
+            method = getattr(cls, name)
+
+            # Each skipped test method keeps it's own documentation string
+            if skip_reason is not None:
+                doc = method.doc(index, data) \
+                    if isinstance(method, _LazyTestMethod) else method.__doc__
+                setattr(cls, name, _skip_stub(skip_reason, doc))
+                continue
+
+            # A skipped test method is never executed, so is not decorated
+            if getattr(method, '_rtf_skip_stub', False):
+                continue
+
+            # A lazy test method is decorated only when it is built
+            if isinstance(method, _LazyTestMethod):
+                method.add_decorator(decorator)
+                continue
+
+            new_method = decorator(method)
+            if hasattr(method, '_rtf_coroutine') and \
+                    not hasattr(new_method, '_rtf_coroutine'):
+                new_method._rtf_coroutine = method._rtf_coroutine
+            new_method.__name__ = name
+            new_method.__doc__ = method.__doc__
+            setattr(cls, name, new_method)
         return cls
 
+    # Allows the decorator to be passed to GenerateTestMethods
+    class_wrapper._rtf_decoration = (criteria, decorator, skip_reason)
     return class_wrapper
 
 
+def _undecorated(cls):
+    """A decorator which leaves the class unchanged"""
+    return cls
+
+
+_undecorated._rtf_decoration = None
+
+
 # --------------------------------------------------------------------------
 # A set of shortcuts for common test method decorators
 #
@@ -239,7 +1311,7 @@ def skip(reason, criteria=lambda test_data: True):
     :param criteria: A callable which will return True if a given method should be decorated. This is the same as the criteria attribute to the DecorateTestMethod. By default all methods will be skipped.
 
     :type reason: str
-    :type criteria: callable(dict) -> bool
+    :type criteria: callable(dict) -> bool | Mapping
     """
     return DecorateTestMethod(criteria=criteria,
                               decorator_method=unittest.skip,
@@ -256,14 +1328,14 @@ def skipIf(condition, reason, criteria=lambda test_data: True):
 
     :type condition: bool
     :type reason: str
-    :type criteria: callable(dict) -> bool
+    :type criteria: callable(dict) -> bool | Mapping
     """
     if condition:
         return DecorateTestMethod(criteria=criteria,
                                   decorator_method=unittest.skip,
                                   decorator_kwargs={'reason': reason})
     else:
-        return lambda x: x
+        return _undecorated
 
 
 # noinspection PyPep8Naming
@@ -276,14 +1348,14 @@ def skipUnless(condition, reason, criteria=lambda test_data: True):
 
     :type condition: bool
     :type reason: str
-    :type criteria: callable(dict) -> bool
+    :type criteria: callable(dict) -> bool | Mapping
     """
     if not condition:
         return DecorateTestMethod(criteria=criteria,
                                   decorator_method=unittest.skip,
                                   decorator_kwargs={'reason': reason})
     else:
-        return lambda x: x
+        return _undecorated
 
 
 # noinspection PyPep8Naming
@@ -292,7 +1364,7 @@ def expectedFailure(criteria=lambda test_data: True):
 
     :param criteria: A callable which will return True if a given method should be decorated. This is the same as the criteria atrribute to the DecorateTestMethod. By default all methods will be skipped
 
-    :type criteria: callable(dict) -> bool
+    :type criteria: callable(dict) -> bool | Mapping
     """
     return DecorateTestMethod(criteria=criteria,
                               decorator_method=unittest.expectedFailure)
@@ -0,0 +1,587 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.runners : Parallel execution of generated test methods
+
+Summary :
+    Test suites which execute the test methods generated by
+    GenerateTestMethods in parallel, while reporting the results into a
+    single normal unittest result.
+
+Use Case :
+    As a user I want to execute a large number of generated test methods on
+    all of the available processors so as to reduce the test execution time.
+
+Testable Statements :
+    Can I execute the generated test methods in a pool of processes
+    Can I execute the generated test methods in a pool of threads
+    Can I execute the test methods which failed recently first
+    Can I limit a run to a time budget
+    Are failures, skips and expected failures reported as normal
+"""
+import importlib
+import sys
+import threading
+import time
+import unittest
+
+import six as _six
+
+from . import repeatedtestframework as _framework
+from .version import __version__ as __version__
+
+try:
+    from concurrent import futures as _futures
+except ImportError:  # Python 2 without the futures backport
+    _futures = None
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+# Outcomes recorded for each test method
+SUCCESS = 'success'
+FAILURE = 'failure'
+ERROR = 'error'
+SKIPPED = 'skipped'
+EXPECTED_FAILURE = 'expectedFailure'
+UNEXPECTED_SUCCESS = 'unexpectedSuccess'
+SUBTEST_FAILURE = 'subTestFailure'
+SUBTEST_ERROR = 'subTestError'
+
+#: The reason reported for a test method not executed within the budget
+BUDGET_SKIP = 'not run (budget)'
+
+
+class RemoteTestError(Exception):
+    """An error raised by a test method executed elsewhere
+
+       The exception message is the formatted traceback of the original error.
+    """
+
+
+class RemoteTestFailure(AssertionError):
+    """A failure of a test method executed elsewhere
+
+       The exception message is the formatted traceback of the original
+       failure.
+    """
+
+
+class _TestProxy(object):
+    """Stands in for a test case which was executed in another process"""
+    failureException = AssertionError
+
+    def __init__(self, test_id, description, short_description):
+        self._id = test_id
+        self._description = description
+        self._short_description = short_description
+
+    @classmethod
+    def from_test(cls, test):
+        """Create a proxy which describes the given test"""
+        return cls(test.id(), str(test), test.shortDescription())
+
+    def id(self):
+        return self._id
+
+    def shortDescription(self):
+        return self._short_description
+
+    def __str__(self):
+        return self._description
+
+    def __repr__(self):
+        return '<{} {}>'.format(self.__class__.__name__, self._id)
+
+
+def _describe(test_class, name, index, case):
+    """Create a proxy which describes a test method without executing it
+
+       A lazy test method is not built, and the test case is not
+       initialised, so describing a test method is cheap.
+    """
+    method = vars(test_class).get(name)
+    # noinspection PyProtectedMember
+    if isinstance(method, _framework._LazyTestMethod):
+        doc = method.doc(index, case)
+    else:
+        doc = getattr(method, '__doc__', None)
+
+    # TestCase.id, __str__ and shortDescription only need the method name
+    # and documentation string
+    test = test_class.__new__(test_class)
+    test._testMethodName, test._testMethodDoc = name, doc
+    return _TestProxy.from_test(test)
+
+
+class _RecordingResult(unittest.TestResult):
+    """A test result which records the outcome of each test in order
+
+       The outcomes are recorded as (test, outcome, detail) tuples, where
+       detail is the formatted traceback, the skip reason or None.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(_RecordingResult, self).__init__(*args, **kwargs)
+        self.outcomes = []
+
+    def _record(self, test, outcome, detail=None):
+        self.outcomes.append((test, outcome, detail))
+
+    def addSuccess(self, test):
+        self._record(test, SUCCESS)
+
+    def addFailure(self, test, err):
+        self._record(test, FAILURE, self._exc_info_to_string(err, test))
+
+    def addError(self, test, err):
+        self._record(test, ERROR, self._exc_info_to_string(err, test))
+
+    def addSkip(self, test, reason):
+        self._record(test, SKIPPED, reason)
+
+    def addExpectedFailure(self, test, err):
+        self._record(test, EXPECTED_FAILURE,
+                     self._exc_info_to_string(err, test))
+
+    def addUnexpectedSuccess(self, test):
+        self._record(test, UNEXPECTED_SUCCESS)
+
+    def addSubTest(self, test, subtest, err):
+        if err is None:
+            return
+        outcome = (SUBTEST_FAILURE
+                   if issubclass(err[0], test.failureException)
+                   else SUBTEST_ERROR)
+        self._record(test, outcome,
+                     (subtest, self._exc_info_to_string(err, test)))
+
+
+def _replay(result, test, outcomes):
+    """Report the recorded outcomes of a single test into a result"""
+    result.startTest(test)
+    for outcome, detail in outcomes:
+        if outcome == SUCCESS:
+            result.addSuccess(test)
+        elif outcome == FAILURE:
+            result.addFailure(test, (RemoteTestFailure,
+                                     RemoteTestFailure(detail), None))
+        elif outcome == ERROR:
+            result.addError(test, (RemoteTestError,
+                                   RemoteTestError(detail), None))
+        elif outcome == SKIPPED:
+            result.addSkip(test, detail)
+        elif outcome == EXPECTED_FAILURE:
+            result.addExpectedFailure(test, (RemoteTestFailure,
+                                             RemoteTestFailure(detail), None))
+        elif outcome == UNEXPECTED_SUCCESS:
+            result.addUnexpectedSuccess(test)
+        elif outcome == SUBTEST_FAILURE:
+            subtest, text = detail
+            result.addSubTest(test, subtest, (RemoteTestFailure,
+                                              RemoteTestFailure(text), None))
+        elif outcome == SUBTEST_ERROR:
+            subtest, text = detail
+            result.addSubTest(test, subtest, (RemoteTestError,
+                                              RemoteTestError(text), None))
+    result.stopTest(test)
+
+
+def _group_outcomes(outcomes):
+    """Group the recorded outcomes by test, preserving the test order"""
+    grouped = []
+    for test, outcome, detail in outcomes:
+        if not grouped or grouped[-1][0] is not test:
+            grouped.append((test, []))
+        grouped[-1][1].append((outcome, detail))
+    return grouped
+
+
+def _class_path(cls):
+    """Return the (module, qualified name) pair used to import a class"""
+    return cls.__module__, getattr(cls, '__qualname__', cls.__name__)
+
+
+def _import_class(module_name, qualname):
+    """Import a class given it's module and qualified name"""
+    target = importlib.import_module(module_name)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+    return target
+
+
+def _run_chunk(module_name, qualname, indices):
+    """Execute a chunk of generated test methods within a worker process
+
+       The test class is imported by the worker, and the test methods are
+       rebuilt from the case indices, so the test methods themselves never
+       need to be pickled.
+    """
+    cls = _import_class(module_name, qualname)
+    # noinspection PyProtectedMember
+    registry = cls._RTF_METHODS
+    result = _RecordingResult()
+    unittest.TestSuite(
+        cls(registry.name_of(index)) for index in indices).run(result)
+
+    # Convert to picklable descriptions for return to the parent process
+    outcomes = []
+    for test, recorded in _group_outcomes(result.outcomes):
+        described = []
+        for outcome, detail in recorded:
+            if outcome in (SUBTEST_FAILURE, SUBTEST_ERROR):
+                detail = (_TestProxy.from_test(detail[0]), detail[1])
+            described.append((outcome, detail))
+        outcomes.append((_TestProxy.from_test(test), described))
+    return outcomes
+
+
+def _check_class(test_class):
+    """Confirm that test class has generated test methods"""
+    if not hasattr(test_class, '_RTF_DECORATED'):
+        raise TypeError(
+            'Incorrect usage; test_class must be a TestCase class which is '
+            'decorated by GenerateTestMethods')
+    # A collapsed test method is not in the registry, so nothing would run
+    if getattr(test_class, '_RTF_COLLAPSED', None) is not None:
+        raise TypeError(
+            'Incorrect usage; the test methods of test_class are collapsed '
+            'into a single test method, which these suites cannot execute')
+
+
+class _GeneratedTestSuite(unittest.TestSuite):
+    """Base class for suites which execute the generated test methods"""
+
+    def __init__(self, test_class, history=None):
+        super(_GeneratedTestSuite, self).__init__()
+        _check_class(test_class)
+        self._test_class = test_class
+        self._history = history
+
+    def _indices(self):
+        """The case indices of the generated test methods in order
+
+           With a history the order is longest first, so that the workers
+           all finish at about the same time.
+        """
+        # noinspection PyProtectedMember
+        registry = self._test_class._RTF_METHODS
+        if self._history is None:
+            return registry.indices()
+        return self._history.order(
+            registry.group,
+            ((index, case) for _, index, case in registry.entries()))
+
+    def _names(self):
+        """The names of the generated test methods in execution order"""
+        # noinspection PyProtectedMember
+        registry = self._test_class._RTF_METHODS
+        if self._history is None:
+            return registry.names()
+        return [registry.name_of(index) for index in self._indices()]
+
+    def _class_fixture(self, fixture, aggregator):
+        """Execute a class level fixture, reporting any error
+
+           Returns False if the fixture raised an exception.
+        """
+        cls = self._test_class
+        if getattr(cls, '__unittest_skip__', False):
+            return True
+        try:
+            getattr(cls, fixture)()
+        except Exception:
+            aggregator.report_error('{} ({}.{})'.format(
+                fixture, *_class_path(cls)), sys.exc_info())
+            return False
+        return True
+
+    def countTestCases(self):
+        # noinspection PyProtectedMember
+        return len(self._test_class._RTF_METHODS)
+
+
+class ProcessPoolSuite(_GeneratedTestSuite):
+    """A test suite which executes generated test methods in processes"""
+
+    def __init__(self, test_class, max_workers=None, chunk_size=100,
+                 history=None):
+        """Execute the generated test methods of a class in a process pool
+
+        The test methods of the class are split into chunks of consecutive
+        cases, and each chunk is executed by a worker process. The worker
+        imports the test class itself and rebuilds the test methods from the
+        case indices, so the test class must be importable (i.e. defined at
+        the top level of a module). The outcome of every test is reported
+        into the result passed to ``run``, in case index order.
+
+        If ``history`` (a ``repeatedtestframework.DurationHistory``) is
+        given, the test methods are instead balanced between the chunks by
+        their duration (using longest processing time first scheduling), so
+        that the slow test cases are spread between the workers, and the
+        outcomes are reported chunk by chunk, longest first within each
+        chunk.
+
+        Class level fixtures (``setUpClass`` and ``tearDownClass``) are
+        executed once for each chunk.
+
+        :param test_class: A TestCase class decorated by GenerateTestMethods
+        :param max_workers: optional The maximum number of worker processes; defaults to the number of processors.
+        :param chunk_size: optional The number of test methods sent to a worker at a time.
+        :param history: optional The durations used to order the test methods.
+
+        :type test_class: type
+        :type max_workers: int
+        :type chunk_size: int
+        :type history: repeatedtestframework.DurationHistory
+        """
+        if _futures is None:
+            raise RuntimeError('ProcessPoolSuite requires the '
+                               'concurrent.futures module')
+        super(ProcessPoolSuite, self).__init__(test_class, history)
+
+        module_name, qualname = _class_path(test_class)
+        try:
+            importable = _import_class(module_name, qualname) is test_class
+        except (ImportError, AttributeError):
+            importable = False
+        if not importable:
+            raise TypeError(
+                'test_class {} cannot be imported by worker processes'.format(
+                    qualname))
+
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+
+    def _chunks(self):
+        """The chunks of case indices sent to the workers
+
+           With a history the test methods are balanced between the chunks
+           by their duration, rather than the slowest all being in the first
+           chunk; each chunk is ordered longest first.
+        """
+        if self._history is None:
+            indices = self._indices()
+            return [indices[start:start + self._chunk_size]
+                    for start in _six.moves.range(0, len(indices),
+                                                  self._chunk_size)]
+
+        # noinspection PyProtectedMember
+        registry = self._test_class._RTF_METHODS
+        count = -(-len(registry) // self._chunk_size)
+        chunks = self._history.partition(
+            registry.group,
+            ((index, case) for _, index, case in registry.entries()), count)
+        return [chunk for chunk in chunks if chunk]
+
+    def run(self, result, debug=False):
+        chunks = self._chunks()
+        module_name, qualname = _class_path(self._test_class)
+
+        with _futures.ProcessPoolExecutor(self._max_workers) as pool:
+            pending = [pool.submit(_run_chunk, module_name, qualname, chunk)
+                       for chunk in chunks]
+            for future in pending:
+                if result.shouldStop:
+                    future.cancel()
+                    continue
+                for test, outcomes in future.result():
+                    _replay(result, test, outcomes)
+        return result
+
+
+class _ResultAggregator(object):
+    """Reports outcomes from several threads into a single result
+
+       Each test is executed into it's own recording result, and the recorded
+       outcomes are then reported into the shared result while holding a
+       lock, so that the reports of different tests are never interleaved.
+    """
+
+    def __init__(self, result):
+        self._result = result
+        self._lock = threading.Lock()
+
+    @property
+    def shouldStop(self):
+        return self._result.shouldStop
+
+    def report(self, recording):
+        """Report the outcomes from a recording result"""
+        with self._lock:
+            for test, outcomes in _group_outcomes(recording.outcomes):
+                _replay(self._result, test, outcomes)
+
+    def report_error(self, description, err):
+        """Report an error which is not associated with a single test"""
+        with self._lock:
+            self._result.addError(_TestProxy(description, description, None),
+                                  err)
+
+
+class ThreadPoolSuite(_GeneratedTestSuite):
+    """A test suite which executes generated test methods in threads"""
+
+    def __init__(self, test_class, max_workers=4, history=None):
+        """Execute the generated test methods of a class in a thread pool
+
+        Suited to test methods which spend their time waiting on sockets,
+        subprocesses or files. At most ``max_workers`` test methods are
+        executing at any one time. The outcome of each test is reported into
+        the result passed to ``run`` as each test completes, so the order of
+        the reports is not deterministic. The ``skip`` and
+        ``expectedFailure`` decorators are honoured as normal.
+
+        If ``history`` (a ``repeatedtestframework.DurationHistory``) is
+        given, the test methods are started longest first, so that the
+        threads all finish at about the same time.
+
+        Class level fixtures (``setUpClass`` and ``tearDownClass``) are
+        executed once, before and after all of the test methods.
+
+        :param test_class: A TestCase class decorated by GenerateTestMethods
+        :param max_workers: optional The maximum number of concurrent test methods.
+        :param history: optional The durations used to order the test methods.
+
+        :type test_class: type
+        :type max_workers: int
+        :type history: repeatedtestframework.DurationHistory
+        """
+        if _futures is None:
+            raise RuntimeError('ThreadPoolSuite requires the '
+                               'concurrent.futures module')
+        super(ThreadPoolSuite, self).__init__(test_class, history)
+
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        self._max_workers = max_workers
+
+    def _worker(self, names, lock, aggregator):
+        """Execute test methods until there are none left, or told to stop"""
+        while not aggregator.shouldStop:
+            with lock:
+                name = next(names, None)
+            if name is None:
+                break
+            recording = _RecordingResult()
+            self._test_class(name).run(recording)
+            aggregator.report(recording)
+
+    def run(self, result, debug=False):
+        aggregator = _ResultAggregator(result)
+        if not self._class_fixture('setUpClass', aggregator):
+            return result
+
+        names = iter(self._names())
+        lock = threading.Lock()
+
+        with _futures.ThreadPoolExecutor(self._max_workers) as pool:
+            workers = [pool.submit(self._worker, names, lock, aggregator)
+                       for _ in _six.moves.range(self._max_workers)]
+            for worker in workers:
+                worker.result()
+
+        self._class_fixture('tearDownClass', aggregator)
+        return result
+
+
+def _failures(result):
+    """The number of failing outcomes reported into a result so far"""
+    return (len(result.failures) + len(result.errors) +
+            len(result.unexpectedSuccesses))
+
+
+class PrioritySuite(_GeneratedTestSuite):
+    """A test suite which executes the recently failed test methods first"""
+
+    # The clock the budget is measured by
+    _clock = staticmethod(getattr(time, 'monotonic', time.time))
+
+    def __init__(self, test_class, store, save=True, budget=None):
+        """Execute the generated test methods of a class in priority order
+
+        The test methods which failed recently are executed first, then the
+        test methods for test cases which have never been executed, then
+        every other test method, least recently executed first. The outcome
+        of each test method is recorded in the ``store`` (a
+        ``repeatedtestframework.ResultStore``), which is saved at the end of
+        the run. Combined with the ``failfast`` option of the unittest
+        runner, a regression is reported as soon as possible.
+
+        With a ``budget`` no test method is started once the run has taken
+        ``budget`` seconds; each test method which was not started is
+        reported as skipped with the reason ``'not run (budget)'``, and is
+        not recorded in the store. Since the least recently executed test
+        methods are executed first, a series of budgeted runs executes
+        every test method in turn.
+
+        Class level fixtures (``setUpClass`` and ``tearDownClass``) are
+        executed once, before and after all of the test methods.
+
+        :param test_class: A TestCase class decorated by GenerateTestMethods
+        :param store: The outcomes of earlier runs
+        :param save: optional If False the store is not saved at the end of the run.
+        :param budget: optional The wall clock time in seconds after which no test method is started.
+
+        :type test_class: type
+        :type store: repeatedtestframework.ResultStore
+        :type save: bool
+        :type budget: float | None
+        """
+        super(PrioritySuite, self).__init__(test_class)
+        if budget is not None and budget < 0:
+            raise ValueError('budget must not be negative')
+        self._store = store
+        self._save = save
+        self._budget = budget
+
+    def _indices(self):
+        # noinspection PyProtectedMember
+        registry = self._test_class._RTF_METHODS
+        return self._store.order(
+            registry.group,
+            ((index, case) for _, index, case in registry.entries()))
+
+    def _not_run(self, result, indices):
+        """Report the test methods which were not started as skipped"""
+        # noinspection PyProtectedMember
+        registry = self._test_class._RTF_METHODS
+        for index in indices:
+            name, case = registry.by_index(index)
+            test = _describe(self._test_class, name, index, case)
+            result.startTest(test)
+            result.addSkip(test, BUDGET_SKIP)
+            result.stopTest(test)
+
+    def run(self, result, debug=False):
+        started = self._clock()
+        aggregator = _ResultAggregator(result)
+        if not self._class_fixture('setUpClass', aggregator):
+            return result
+
+        # noinspection PyProtectedMember
+        registry = self._test_class._RTF_METHODS
+        try:
+            indices = self._indices()
+            for position, index in enumerate(indices):
+                if result.shouldStop:
+                    break
+                if self._budget is not None and \
+                        self._clock() - started >= self._budget:
+                    self._not_run(result, indices[position:])
+                    break
+                name, case = registry.by_index(index)
+                failures, skipped = _failures(result), len(result.skipped)
+                self._test_class(name)(result)
+                if len(result.skipped) == skipped:
+                    self._store.record(registry.group, case,
+                                       _failures(result) > failures)
+        finally:
+            if self._save:
+                self._store.save()
+
+        self._class_fixture('tearDownClass', aggregator)
+        return result
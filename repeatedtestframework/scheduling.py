@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.scheduling : Duration balanced scheduling
+
+Summary :
+    Stores the duration of each test case from earlier runs, and uses the
+    stored durations to balance the test cases between shards or workers
+    using longest processing time first scheduling.
+
+Use Case :
+    As a user I want my shards and workers to finish at the same time, even
+    when the slow test cases are clustered together within my data set.
+
+Testable Statements :
+    Can I record the duration of each test case and save it to a file
+    Is a cost estimated for test cases with no history
+    Are the test cases balanced between shards by duration
+    Are the test cases which failed recently executed first
+"""
+import heapq
+import json
+import os
+
+from .repeatedtestframework import case_digest
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+def lpt_partition(costs, bins):
+    """Partition items into bins of approximately equal total cost
+
+       Uses longest processing time first scheduling : the items are taken in
+       order of decreasing cost, and each item is added to the bin with the
+       smallest total so far. Ties are broken by the order of the items and
+       the bins, so the partition is the same every time.
+
+       :param costs: An iterable of (item, cost) pairs
+       :param bins: The number of bins
+       :return: A list of ``bins`` lists of items
+
+       :type bins: int
+    """
+    ordered = sorted(enumerate(costs),
+                     key=lambda entry: (-entry[1][1], entry[0]))
+    partition = [[] for _ in range(bins)]
+    totals = [(0, bin_no) for bin_no in range(bins)]
+    for _, (item, cost) in ordered:
+        total, bin_no = heapq.heappop(totals)
+        partition[bin_no].append(item)
+        heapq.heappush(totals, (total + cost, bin_no))
+    return partition
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+class DurationHistory(object):
+    """The durations of test cases from earlier runs
+
+       Durations are keyed by the ``test_name`` of the GenerateTestMethods
+       decorator and the :func:`case_digest` of the test case data, so a
+       duration still applies when the test case moves within the data set.
+    """
+
+    def __init__(self, path=None, default=1.0, smoothing=0.5):
+        """Create a history, loading the durations from path if it exists
+
+        A test case with no history is estimated to take the median duration
+        of the other test cases with the same ``test_name``, or the median of
+        all the durations if there are none, or ``default`` if the history is
+        empty.
+
+        :param path: optional The JSON file the durations are loaded from and saved to
+        :param default: optional The estimated duration when the history is empty
+        :param smoothing: optional The weight of a new duration against the stored duration (1.0 keeps only the latest)
+
+        :type path: str | None
+        :type default: float
+        :type smoothing: float
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError('smoothing must be greater than 0 and at most 1')
+        self._path = path
+        self._default = default
+        self._smoothing = smoothing
+        self._durations = {}
+        self._medians = None
+
+        if path is not None and os.path.exists(path):
+            with open(path) as history:
+                self._durations = json.load(history)
+
+    @staticmethod
+    def key(test_name, test_data):
+        """The key of the duration of a test case"""
+        return '{}:{}'.format(test_name, case_digest(test_data))
+
+    def record(self, test_name, test_data, duration):
+        """Record the duration of a single execution of a test case"""
+        key = self.key(test_name, test_data)
+        previous = self._durations.get(key)
+        if previous is not None:
+            duration = (self._smoothing * duration +
+                        (1 - self._smoothing) * previous)
+        self._durations[key] = duration
+        self._medians = None
+
+    def update(self, records):
+        """Record the durations from the records of an Instrumentation
+
+        Skipped test cases are ignored, since their duration says nothing
+        about the cost of executing them.
+
+        :param records: ``CaseTiming`` records, for instance ``Instrumentation.records``
+        """
+        for record in records:
+            if record.outcome != 'skipped':
+                self.record(record.group, record.test_data, record.wall_time)
+
+    def _estimates(self):
+        """The median duration for each test name, and overall"""
+        if self._medians is None:
+            groups = {}
+            for key, duration in self._durations.items():
+                groups.setdefault(key.rsplit(':', 1)[0], []).append(duration)
+            overall = (_median(list(self._durations.values()))
+                       if self._durations else self._default)
+            self._medians = overall, dict(
+                (group, _median(durations))
+                for group, durations in groups.items())
+        return self._medians
+
+    def estimate(self, test_name, test_data):
+        """Return the stored or estimated duration of a test case"""
+        duration = self._durations.get(self.key(test_name, test_data))
+        if duration is not None:
+            return duration
+        overall, groups = self._estimates()
+        return groups.get(test_name, overall)
+
+    def partition(self, test_name, cases, bins):
+        """Partition test cases into bins of approximately equal duration
+
+        :param test_name: The ``test_name`` of the GenerateTestMethods decorator
+        :param cases: An iterable of (index, test_data) pairs
+        :param bins: The number of bins
+        :return: A list of ``bins`` lists of test case indices
+        """
+        return lpt_partition(((index, self.estimate(test_name, case))
+                              for index, case in cases), bins)
+
+    def order(self, test_name, cases):
+        """Return the test case indices in order of decreasing duration
+
+        Executing test cases in this order from a shared queue keeps the
+        workers of a pool busy until close to the end of the run.
+
+        :param test_name: The ``test_name`` of the GenerateTestMethods decorator
+        :param cases: An iterable of (index, test_data) pairs
+        """
+        return [index for index, _ in sorted(
+            ((index, self.estimate(test_name, case))
+             for index, case in cases),
+            key=lambda entry: -entry[1])]
+
+    def save(self, path=None):
+        """Save the durations as JSON to path (by default the loaded path)"""
+        path = path or self._path
+        if path is None:
+            raise ValueError('No path to save the duration history to')
+        with open(path, 'w') as history:
+            json.dump(self._durations, history, indent=1, sort_keys=True)
+
+    def __len__(self):
+        return len(self._durations)
+
+    def __contains__(self, key):
+        return key in self._durations
+
+
+class ResultStore(object):
+    """The outcomes of test cases from earlier runs
+
+       For each test case the store keeps the run in which it was last
+       executed and the run in which it last failed, keyed (like the
+       :class:`DurationHistory`) by the ``test_name`` and the
+       :func:`case_digest` of the test case.
+    """
+
+    # The priorities of the test cases, in execution order
+    RECENT_FAILURE, NEW, OTHER = 0, 1, 2
+
+    def __init__(self, path=None, recent=3):
+        """Create a store, loading the outcomes from path if it exists
+
+        :param path: optional The JSON file the outcomes are loaded from and saved to
+        :param recent: optional A test case which failed within this many runs is a recent failure.
+
+        :type path: str | None
+        :type recent: int
+        """
+        if recent < 1:
+            raise ValueError('recent must be at least 1')
+        self._path = path
+        self._recent = recent
+
+        # The number of the current run, and key to [last run, last failure]
+        self.run = 1
+        self._cases = {}
+
+        if path is not None and os.path.exists(path):
+            with open(path) as store:
+                stored = json.load(store)
+            self.run = stored['run'] + 1
+            self._cases = stored['cases']
+
+    key = staticmethod(DurationHistory.key)
+
+    def record(self, test_name, test_data, failed):
+        """Record the outcome of a test case in the current run"""
+        entry = self._cases.setdefault(self.key(test_name, test_data),
+                                       [None, None])
+        entry[0] = self.run
+        if failed:
+            entry[1] = self.run
+
+    def last_run(self, test_name, test_data):
+        """The run in which the test case was last executed, or None"""
+        return self._cases.get(self.key(test_name, test_data),
+                               [None, None])[0]
+
+    def priority(self, test_name, test_data):
+        """Return the sort key of a test case
+
+        Test cases which failed within the last ``recent`` runs come first
+        (the most recent failures first), then test cases which have never
+        been executed, then every other test case, least recently executed
+        first; so a run which stops early is followed by a run which starts
+        with the test cases it did not reach.
+        """
+        last_run, last_failure = self._cases.get(
+            self.key(test_name, test_data), [None, None])
+        if last_failure is not None and \
+                self.run - last_failure <= self._recent:
+            return self.RECENT_FAILURE, -last_failure
+        if last_run is None:
+            return self.NEW, 0
+        return self.OTHER, last_run
+
+    def order(self, test_name, cases):
+        """Return the test case indices in priority order
+
+        Test cases of the same priority stay in their original order.
+
+        :param test_name: The ``test_name`` of the GenerateTestMethods decorator
+        :param cases: An iterable of (index, test_data) pairs
+        """
+        return [index for index, _ in sorted(
+            ((index, self.priority(test_name, case))
+             for index, case in cases),
+            key=lambda entry: entry[1])]
+
+    def save(self, path=None):
+        """Save the outcomes as JSON to path (by default the loaded path)"""
+        path = path or self._path
+        if path is None:
+            raise ValueError('No path to save the result store to')
+        with open(path, 'w') as store:
+            json.dump({'run': self.run, 'cases': self._cases}, store,
+                      indent=1, sort_keys=True)
+
+    def __len__(self):
+        return len(self._cases)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# repeatedtestframework.sources : File backed sources of test cases
+
+Summary :
+    Sources of test cases which are read from a data file rather than held
+    in memory.
+
+Use Case :
+    As a user I want to generate test methods from a very large data file
+    without loading the whole file into memory.
+
+Testable Statements :
+    Can I generate test methods from a JSON Lines file
+    Can I generate test methods from a CSV file
+    Is each record only parsed when it is used
+"""
+import csv
+import json
+import mmap
+from array import array
+
+import six as _six
+
+from .version import __version__ as __version__
+
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+# Python 3 introduced the collections.abc module
+if _six.PY2:
+    from collections import Mapping, Sequence
+else:
+    from collections.abc import Mapping, Sequence
+
+# Python 2 arrays do not support the long long type code
+_OFFSET_TYPECODE = 'L' if _six.PY2 else 'q'
+
+
+class CaseRecord(Mapping):
+    """A single test case within a file backed source
+
+       The record holds only a reference to the source and the position of
+       the record; the record is parsed from the file each time the data is
+       needed.
+    """
+    __slots__ = ('_source', '_index')
+
+    def __init__(self, source, index):
+        self._source = source
+        self._index = index
+
+    @property
+    def offset(self):
+        """The byte offset of this record within the data file"""
+        return self._source.offset(self._index)
+
+    def load(self):
+        """Parse and return the record as a dictionary"""
+        return self._source.load(self._index)
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __repr__(self):
+        return repr(self.load())
+
+    def __str__(self):
+        return str(self.load())
+
+
+class CaseSource(Sequence):
+    """Base class for a memory mapped file of test cases
+
+       The file is scanned once to build an index of the byte offset of each
+       record; the records themselves are only parsed when they are accessed.
+       Each item of the source is a :class:`CaseRecord`, so a source can be
+       passed directly as the ``test_cases`` argument of
+       ``GenerateTestMethods``.
+    """
+
+    def __init__(self, path, encoding='utf-8'):
+        """Open and index the data file
+
+        :param path: The path of the data file
+        :param encoding: The text encoding of the data file
+
+        :type path: str
+        :type encoding: str
+        """
+        self._path = path
+        self._encoding = encoding
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be memory mapped
+            self._map = None
+        self._offsets = array(_OFFSET_TYPECODE)
+
+        # A single parsed record is kept, so that retrieving several keys
+        # from the same record only parses it once
+        self._last = (None, None)
+        self._build_index()
+
+    def _lines(self, start=0):
+        """Generate the (offset, line) pairs from the data file"""
+        if self._map is None:
+            return
+        end = len(self._map)
+        position = start
+        while position < end:
+            line_end = self._map.find(b'\n', position)
+            if line_end == -1:
+                line_end = end
+            yield position, self._map[position:line_end]
+            position = line_end + 1
+
+    def _build_index(self):
+        """Record the offset of every record in the data file"""
+        for offset, line in self._lines():
+            if line.strip():
+                self._offsets.append(offset)
+
+    def _read(self, offset):
+        """Return the raw bytes of the record at the given offset"""
+        end = self._map.find(b'\n', offset)
+        return self._map[offset:end if end != -1 else len(self._map)]
+
+    def _parse(self, index, raw):
+        """Convert the raw bytes of a record into a dictionary"""
+        raise NotImplementedError
+
+    def offset(self, index):
+        """Return the byte offset of the record at the given index"""
+        return self._offsets[index]
+
+    def load(self, index):
+        """Parse and return the record at the given index as a dictionary"""
+        if self._last[0] != index:
+            self._last = (index, self._parse(
+                index, self._read(self._offsets[index])))
+        return self._last[1]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self._offsets)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError('{} index out of range'.format(
+                self.__class__.__name__))
+        return CaseRecord(self, index)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __iter__(self):
+        for index in range(len(self._offsets)):
+            yield CaseRecord(self, index)
+
+    def close(self):
+        """Release the memory map and the data file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class JSONLSource(CaseSource):
+    """A source of test cases from a JSON Lines file
+
+       Each non blank line of the file must be a JSON object.
+    """
+
+    def _parse(self, index, raw):
+        data = json.loads(raw.decode(self._encoding))
+        if not isinstance(data, dict):
+            raise ValueError('record {} of {} is not a JSON object'.format(
+                index, self._path))
+        return data
+
+
+# Newline delimited JSON is the same format as JSON Lines
+NDJSONSource = JSONLSource
+
+
+class CSVSource(CaseSource):
+    """A source of test cases from a CSV file
+
+       The first row of the file provides the keys for each record. Values
+       are strings unless a converter is provided for that column.
+    """
+
+    def __init__(self, path, encoding='utf-8', converters=None, **fmtparams):
+        """Open and index the CSV file
+
+        :param path: The path of the CSV file
+        :param encoding: The text encoding of the CSV file
+        :param converters: optional A dictionary mapping column names to a callable which converts the string value of that column.
+        :param fmtparams: Formatting parameters passed to ``csv.reader``
+
+        :type path: str
+        :type encoding: str
+        :type converters: dict
+        """
+        self._converters = converters if converters else {}
+        self._fmtparams = fmtparams
+        self._fields = []
+        super(CSVSource, self).__init__(path, encoding)
+
+    def _build_index(self):
+        """Record the offset of every row, allowing for quoted newlines"""
+        start, quotes = None, 0
+        for offset, line in self._lines():
+            if start is None:
+                if not line.strip():
+                    continue
+                start = offset
+            quotes += line.count(b'"')
+            # An odd number of quotes means a newline within a quoted value
+            if quotes % 2:
+                continue
+            if not self._fields:
+                self._fields = self._row(self._read_row(start))
+            else:
+                self._offsets.append(start)
+            start, quotes = None, 0
+
+    def _read_row(self, offset):
+        """Return the raw bytes of the row at the given offset"""
+        quotes, end = 0, offset
+        for end, line in self._lines(offset):
+            quotes += line.count(b'"')
+            if not quotes % 2:
+                end += len(line)
+                break
+        return self._map[offset:end]
+
+    def _read(self, offset):
+        return self._read_row(offset)
+
+    def _row(self, raw):
+        """Split the raw bytes of a row into values"""
+        if _six.PY2:
+            return next(csv.reader([raw], **self._fmtparams))
+        return next(csv.reader(
+            raw.decode(self._encoding).splitlines(True), **self._fmtparams))
+
+    def _parse(self, index, raw):
+        data = dict(zip(self._fields, self._row(raw)))
+        for key, converter in self._converters.items():
+            if key in data:
+                data[key] = converter(data[key])
+        return data
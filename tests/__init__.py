@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite
+
+Summary :
+    Collects the test modules of the package, leaving out the modules
+    which can only be imported on Python 3 when running on Python 2.
+"""
+
+import fnmatch
+import importlib
+import os
+import unittest
+
+import six
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+# Test modules using syntax or modules which only exist on Python 3
+_PY3_ONLY = ('test_asyncsupport', 'test_payloads')
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    suite = unittest.TestSuite()
+    for file_name in sorted(os.listdir(os.path.dirname(__file__))):
+        name, extension = os.path.splitext(file_name)
+        if extension != '.py' or \
+                not fnmatch.fnmatch(file_name, pattern or 'test*.py'):
+            continue
+        if six.PY2 and name in _PY3_ONLY:
+            continue
+        module = importlib.import_module('{}.{}'.format(__name__, name))
+        suite.addTests(loader.loadTestsFromModule(module))
+    return suite
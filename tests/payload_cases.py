@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Sample test cases for the payload tests
+
+Summary :
+    A decorated TestCase class with shared payloads, defined at the top
+    level of a module so that it can be imported by worker processes.
+
+    The payload stores only exist on Python 3, so these classes are kept
+    apart from the sample test cases of the runner tests; the load_tests
+    function below ensures that they are not collected directly.
+
+.. note::
+
+    This module requires Python 3.
+"""
+
+import array
+import unittest
+
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import MappedPayloadStore
+from repeatedtestframework import PayloadSource
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+# noinspection PyUnusedLocal
+def payload_wrapper(index, total, payload):
+    """Wrapper for test method - the payload is shared, and sums to total"""
+
+    # noinspection PyShadowingNames
+    def test_method(self):
+        self.assertIsInstance(payload, memoryview)
+        self.assertTrue(payload.readonly)
+        self.assertEqual(sum(payload), total)
+
+    return test_method
+
+
+PAYLOADS = MappedPayloadStore()
+
+
+@GenerateTestMethods(
+    test_name='Payload',
+    test_method=payload_wrapper,
+    test_cases=PayloadSource(
+        ({'total': sum(range(a, a + 50000)),
+          'payload': array.array('d', range(a, a + 50000))}
+         for a in range(6)),
+        PAYLOADS))
+class PayloadCases(unittest.TestCase):
+    pass
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    return unittest.TestSuite()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Sample test cases for the runner tests
+
+Summary :
+    Decorated TestCase classes defined at the top level of a module, so
+    that they can be imported by worker processes.
+
+    These classes are executed by the runner tests - they deliberately
+    contain failures, so the load_tests function below ensures that they
+    are not collected directly.
+"""
+
+import unittest
+
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import expectedFailure
+from repeatedtestframework import skip
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+# noinspection PyUnusedLocal
+def addition_wrapper(index, a, b):
+    """Wrapper for test method - a + 1 == b"""
+
+    # noinspection PyShadowingNames
+    def test_method(self):
+        self.assertEqual(a + 1, b)
+
+    return test_method
+
+
+@expectedFailure(criteria=lambda data: data['a'] == 5)
+@skip('Skipped because a == 3', criteria=lambda data: data['a'] == 3)
+@GenerateTestMethods(
+    test_name='Addition',
+    test_method=addition_wrapper,
+    test_cases=[{'a': a, 'b': a + 1 if a not in (2, 5) else 0}
+                for a in range(8)])
+class AdditionCases(unittest.TestCase):
+    pass
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    return unittest.TestSuite()
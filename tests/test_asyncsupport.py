@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for asyncsupport.py
+
+Summary :
+    Tests for test methods which are coroutine functions
+Use Case :
+    As a user I want to write my test methods as coroutines
+    So that tests which wait on the network can overlap
+
+Testable Statements :
+    Can I generate test methods which are coroutine functions
+    Can I execute the coroutine test methods of a class concurrently
+    Are failures, skips and expected failures reported as normal
+
+.. note::
+
+    This test suite requires Python 3.5 or later.
+"""
+
+import asyncio
+import functools
+import time
+import unittest
+
+import six
+
+from repeatedtestframework import AsyncioSuite
+from repeatedtestframework import DecorateTestMethod
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import expectedFailure
+from repeatedtestframework import skip
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+def _summary(result):
+    return result.testsRun, len(result.errors), len(
+        result.failures), len(result.skipped), len(
+        result.expectedFailures), len(result.unexpectedSuccesses)
+
+
+class TestCoroutineMethods(unittest.TestCase):
+    def setUp(self):
+        self.running = 0
+        self.peak = 0
+        suite_test = self
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            # noinspection PyShadowingNames
+            async def test_method(self):
+                suite_test.running += 1
+                suite_test.peak = max(suite_test.peak, suite_test.running)
+                await asyncio.sleep(0.02)
+                suite_test.running -= 1
+                self.assertEqual(a + 1, b)
+
+            return test_method
+
+        self.cls_ = type('EmptyClass', (unittest.TestCase, object), {})
+        self.test_method = wrapper
+
+    def _generate(self, num_test_cases, fail=()):
+        return GenerateTestMethods(
+            test_name='Coroutine',
+            test_method=self.test_method,
+            test_cases=[{'a': a, 'b': a + 1 if a not in fail else 0}
+                        for a in range(num_test_cases)])(self.cls_)
+
+    def test_010_SequentialExecution(self):
+        """Confirm that coroutine test methods run with the normal loader"""
+        case_cls_ = self._generate(3, fail=(1,))
+
+        suite = unittest.TestLoader().loadTestsFromTestCase(case_cls_)
+        result = suite.run(unittest.TestResult())
+
+        self.assertEqual((3, 0, 1, 0, 0, 0), _summary(result))
+        self.assertEqual(result.failures[0][0].id(),
+                         'tests.test_asyncsupport.EmptyClass.'
+                         'test_001_Coroutine')
+        self.assertEqual(self.peak, 1)
+
+    def test_020_InvalidConcurrency(self):
+        """Confirm that the concurrency must be positive"""
+        with six.assertRaisesRegex(self, ValueError, r'concurrency.*'):
+            AsyncioSuite(self._generate(2), concurrency=0)
+
+    def test_030_ConcurrentExecution(self):
+        """Confirm that coroutine test methods overlap within the bound"""
+        suite = AsyncioSuite(self._generate(20), concurrency=10)
+
+        start = time.time()
+        result = suite.run(unittest.TestResult())
+
+        self.assertEqual((20, 0, 0, 0, 0, 0), _summary(result))
+        self.assertEqual(self.peak, 10)
+        self.assertTrue(time.time() - start < 20 * 0.02)
+
+    def test_040_ConcurrentDecorators(self):
+        """Confirm that skip and expectedFailure are honoured concurrently"""
+        case_cls_ = expectedFailure(criteria=lambda data: data['a'] == 5)(
+            skip('Skipped because a == 3',
+                 criteria=lambda data: data['a'] == 3)(
+                self._generate(8, fail=(2, 5))))
+
+        result = AsyncioSuite(case_cls_).run(unittest.TestResult())
+
+        self.assertEqual((8, 0, 1, 1, 1, 0), _summary(result))
+        self.assertEqual(result.failures[0][0].id(),
+                         'tests.test_asyncsupport.EmptyClass.'
+                         'test_002_Coroutine')
+        self.assertEqual(result.skipped[0][1], 'Skipped because a == 3')
+        self.assertEqual(result.expectedFailures[0][0].id(),
+                         'tests.test_asyncsupport.EmptyClass.'
+                         'test_005_Coroutine')
+
+    def test_050_WrappedCoroutines(self):
+        """Confirm that wrapped coroutines are executed with their wrappers"""
+        called = []
+
+        def recorded(method):
+            @functools.wraps(method)
+            def wrapper(self):
+                called.append(self._testMethodName)
+                return method(self)
+            return wrapper
+
+        case_cls_ = DecorateTestMethod(
+            criteria=lambda data: data['a'] % 2 == 0,
+            decorator_method=recorded)(
+            GenerateTestMethods(
+                test_name='Coroutine',
+                test_method=self.test_method,
+                test_cases=[{'a': a, 'b': a + 1 if a != 4 else 0}
+                            for a in range(8)],
+                max_failures=5)(self.cls_))
+
+        result = AsyncioSuite(case_cls_, concurrency=4).run(
+            unittest.TestResult())
+
+        self.assertEqual((8, 0, 1, 0, 0, 0), _summary(result))
+        self.assertEqual(sorted(called),
+                         ['test_000_Coroutine', 'test_002_Coroutine',
+                          'test_004_Coroutine', 'test_006_Coroutine'])
+        self.assertGreater(self.peak, 1)
+
+    def test_060_SkippedClass(self):
+        """Confirm that a class level skip is honoured concurrently"""
+        case_cls_ = unittest.skip('Class skipped')(self._generate(2))
+
+        result = AsyncioSuite(case_cls_).run(unittest.TestResult())
+
+        self.assertEqual((2, 0, 0, 2, 0, 0), _summary(result))
+        self.assertEqual(set(reason for _, reason in result.skipped),
+                         {'Class skipped'})
+        self.assertEqual(self.peak, 0)
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestCoroutineMethods]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
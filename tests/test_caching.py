@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for caching.py
+
+Summary :
+    Tests for the cache of passing test cases
+Use Case :
+    As a user I want to only execute the test cases which have changed
+    So that my continuous integration runs are quick
+
+Testable Statements :
+    Is a passing test case skipped as a cached pass on the next run
+    Is the cache invalidated when the test case, test method or salt changes
+    Are failing test cases always executed
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import six
+
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import Instrumentation
+from repeatedtestframework import ResultCache
+from repeatedtestframework import expectedFailure
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+# noinspection PyUnusedLocal
+def _adds(index, a, b):
+    # noinspection PyShadowingNames
+    def test_method(self):
+        self.assertEqual(a + 1, b)
+
+    return test_method
+
+
+# noinspection PyUnusedLocal
+def _subtracts(index, a, b):
+    # noinspection PyShadowingNames
+    def test_method(self):
+        self.assertEqual(b - 1, a)
+
+    return test_method
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'cache.txt')
+        self.test_cases = [{'a': a, 'b': a + 1 if a != 2 else 0}
+                           for a in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _run(self, cache, test_method=_adds, test_cases=None, lazy=False):
+        cls_ = GenerateTestMethods(
+            test_name='Cached',
+            test_method=test_method,
+            test_cases=self.test_cases if test_cases is None else test_cases,
+            lazy=lazy,
+            cache=cache)(type('EmptyClass', (unittest.TestCase, object), {}))
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(cls_).run(result)
+        return cls_, result
+
+    def test_010_CachedPass(self):
+        """Confirm that passing test cases are skipped on the next run"""
+        _, result = self._run(ResultCache(self.path))
+        self.assertEqual((result.testsRun, len(result.failures),
+                          len(result.skipped)), (5, 1, 0))
+
+        # A new cache loads the passes from the file
+        cache = ResultCache(self.path)
+        self.assertEqual(len(cache), 4)
+        _, result = self._run(cache, lazy=True)
+        self.assertEqual((result.testsRun, len(result.failures),
+                          len(result.skipped)), (5, 1, 4))
+        self.assertEqual(set(reason for _, reason in result.skipped),
+                         set(['cached pass']))
+        self.assertIn('test_002_Cached', result.failures[0][0].id())
+
+    def test_020_Invalidation(self):
+        """Confirm that changes to the case, method or salt invalidate"""
+        self._run(ResultCache(self.path))
+
+        # A changed test case is executed again
+        self.test_cases[0] = {'a': 10, 'b': 11}
+        _, result = self._run(ResultCache(self.path))
+        self.assertEqual(len(result.skipped), 3)
+
+        # A changed test method executes every test case
+        _, result = self._run(ResultCache(self.path), test_method=_subtracts)
+        self.assertEqual(len(result.skipped), 0)
+
+        # As does a changed salt
+        _, result = self._run(ResultCache(self.path, salt='1.1'))
+        self.assertEqual(len(result.skipped), 0)
+
+        cache = ResultCache(self.path)
+        cache.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(len(cache), 0)
+
+    def test_030_Omit(self):
+        """Confirm that cached passes can be omitted entirely"""
+        self._run(ResultCache(self.path))
+        cls_, result = self._run(ResultCache(self.path, omit=True))
+
+        self.assertEqual(list(cls_._RTF_METHODS.indices()), [2])
+        self.assertEqual((result.testsRun, len(result.failures)), (1, 1))
+
+    def test_040_ExpectedFailure(self):
+        """Confirm that unexpected successes are not cached"""
+        cache = ResultCache(self.path)
+        cls_ = expectedFailure(criteria=lambda data: data['a'] == 0)(
+            GenerateTestMethods(
+                test_name='Cached',
+                test_method=_adds,
+                test_cases=self.test_cases,
+                cache=cache,
+                instrumentation=Instrumentation())(
+                type('EmptyClass', (unittest.TestCase, object), {})))
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(cls_).run(result)
+
+        self.assertEqual(len(result.unexpectedSuccesses), 1)
+        self.assertEqual(len(cache), 3)
+
+    @unittest.skipIf(six.PY2, 'subTest requires Python 3.4')
+    def test_050_FailedTearDown(self):
+        """Confirm that a test whose tearDown or subTest fails is not cached"""
+        def tearDown(test):
+            if test.id().endswith('test_000_Cached'):
+                test.fail('tearDown failed')
+
+        # noinspection PyUnusedLocal
+        def sub_tests(index, a, b):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                with self.subTest(a=a):
+                    self.assertNotEqual(a, 1)
+
+            return test_method
+
+        cache = ResultCache(self.path)
+        cls_ = GenerateTestMethods(
+            test_name='Cached',
+            test_method=sub_tests,
+            test_cases=self.test_cases,
+            cache=cache)(type('EmptyClass', (unittest.TestCase, object),
+                              {'tearDown': tearDown}))
+        for _ in range(2):
+            result = unittest.TestResult()
+            unittest.TestLoader().loadTestsFromTestCase(cls_).run(result)
+            self.assertEqual(len(result.failures), 2)
+
+        self.assertEqual(len(cache), 3)
+
+    def test_060_SourcelessFingerprint(self):
+        """Confirm that the fingerprint without source is stable"""
+        source = 'def wrapper(index, a):\n    return {}\n'
+
+        def compiled(value):
+            namespace = {}
+            exec(source.format(value), namespace)
+            return namespace['wrapper']
+
+        first = ResultCache.fingerprint(compiled("{'a': (1, 'x')}"))
+        for _ in range(3):
+            self.assertEqual(
+                ResultCache.fingerprint(compiled("{'a': (1, 'x')}")), first)
+        self.assertNotEqual(
+            ResultCache.fingerprint(compiled("{'a': (2, 'x')}")), first)
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestResultCache]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for combinations.py
+
+Summary :
+    Tests for the combinatorial test cases
+Use Case :
+    As a user I want to test my code with combinations of several parameters
+    So that I don't need to generate millions of test cases
+
+Testable Statements :
+    Can I generate every combination of the axis values lazily
+    Does a pairwise reduction cover every pair of values
+    Are the combinations excluded by the constraints never generated
+    Does each test case record the axis values it came from
+"""
+
+import itertools
+import unittest
+from collections import OrderedDict
+
+import six
+
+from repeatedtestframework import Combinations
+from repeatedtestframework import GenerateTestMethods
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+def _covered(cases, strength):
+    """The set of value n-tuples covered by the test cases"""
+    return set(combination for case in cases
+               for combination in itertools.combinations(
+                   sorted(case.items()), strength))
+
+
+class TestCombinations(unittest.TestCase):
+    def setUp(self):
+        self.axes = OrderedDict([('os', ['linux', 'mac', 'win']),
+                                 ('python', ['2.7', '3.6', '3.8']),
+                                 ('db', ['pg', 'sqlite']),
+                                 ('locale', ['en', 'fr', 'de'])])
+
+    def test_010_InvalidArguments(self):
+        """Confirm that invalid arguments are rejected"""
+        with six.assertRaisesRegex(self, ValueError, r'.*axis.*'):
+            Combinations([])
+        with six.assertRaisesRegex(self, ValueError, r'.*value.*'):
+            Combinations([('os', [])])
+        with six.assertRaisesRegex(self, ValueError, r'strength.*'):
+            Combinations(self.axes, strength=5)
+
+    def test_020_LazyProduct(self):
+        """Confirm that the full product is generated lazily, in order"""
+        axes = [('axis{}'.format(axis), list(range(10)))
+                for axis in range(9)]
+        combinations = Combinations(axes)
+        self.assertEqual(len(combinations), 10 ** 9)
+
+        first = list(itertools.islice(combinations, 3))
+        self.assertEqual([case['axis8'] for case in first], [0, 1, 2])
+        self.assertTrue(all(case['axis0'] == 0 for case in first))
+
+    def test_030_ProductConstraints(self):
+        """Confirm that the constraints exclude combinations"""
+        combinations = Combinations(
+            self.axes, constraints=[lambda case: case['os'] != 'win'])
+        cases = list(combinations)
+        self.assertEqual(len(cases), 2 * 3 * 2 * 3)
+        self.assertEqual(len(combinations), len(cases))
+        self.assertNotIn('win', [case['os'] for case in cases])
+
+    def test_040_PairwiseCoverage(self):
+        """Confirm that every pair of values is covered by fewer cases"""
+        cases = list(Combinations(self.axes, strength=2))
+        product = list(Combinations(self.axes))
+
+        self.assertLess(len(cases), len(product) // 3)
+        self.assertEqual(_covered(cases, 2), _covered(product, 2))
+
+    def test_050_ThreeWiseCoverage(self):
+        """Confirm that every triple of values is covered"""
+        axes = [('axis{}'.format(axis), list(range(3)))
+                for axis in range(6)]
+        cases = list(Combinations(axes, strength=3))
+        product = list(Combinations(axes))
+
+        self.assertLess(len(cases), len(product) // 3)
+        self.assertEqual(_covered(cases, 3), _covered(product, 3))
+
+    def test_060_PairwiseConstraints(self):
+        """Confirm that constraints are applied to a pairwise reduction"""
+        constraint = lambda case: not (  # noqa: E731
+            case['os'] == 'win' and case['db'] == 'sqlite')
+        cases = list(Combinations(self.axes, strength=2,
+                                  constraints=[constraint]))
+        allowed = list(Combinations(self.axes, constraints=[constraint]))
+
+        self.assertTrue(all(constraint(case) for case in cases))
+        self.assertEqual(_covered(cases, 2), _covered(allowed, 2))
+
+    def test_063_ManyAxesConstraints(self):
+        """Confirm that a pair rejected by a constraint is skipped at once"""
+        axes = [('a{}'.format(axis), list(range(8))) for axis in range(12)]
+        constraint = lambda case: not (  # noqa: E731
+            case['a0'] == 0 and case['a1'] == 0)
+        combinations = Combinations(axes, strength=2,
+                                    constraints=[constraint])
+        cases = list(combinations)
+        allowed = set(pair for pair in _covered(Combinations(axes[:3]), 2)
+                      if pair != (('a0', 0), ('a1', 0)))
+
+        self.assertTrue(all(constraint(case) for case in cases))
+        self.assertTrue(allowed <= _covered(cases, 2))
+        self.assertEqual(combinations.uncovered, [])
+
+    def test_065_SearchLimit(self):
+        """Confirm that the pairs the search gives up on are listed"""
+        axes = [('a{}'.format(axis), [0, 1]) for axis in range(3)]
+        # The constraint can't tell anything from a partial test case
+        constraint = lambda case: sum(case.values()) == 0  # noqa: E731
+
+        combinations = Combinations(axes, strength=2,
+                                    constraints=[constraint])
+        self.assertEqual(list(combinations), [{'a0': 0, 'a1': 0, 'a2': 0}])
+        self.assertEqual(combinations.uncovered, [])
+
+        combinations = Combinations(axes, strength=2,
+                                    constraints=[constraint], max_search=1)
+        self.assertEqual(list(combinations), [{'a0': 0, 'a1': 0, 'a2': 0}])
+        self.assertIn({'a0': 1, 'a1': 0}, combinations.uncovered)
+
+    def test_070_Deterministic(self):
+        """Confirm that the same axes always generate the same cases"""
+        self.assertEqual(list(Combinations(self.axes, strength=2)),
+                         list(Combinations(self.axes, strength=2)))
+
+    def test_080_AxisValues(self):
+        """Confirm that each test case records it's axis values"""
+        case = next(iter(Combinations(self.axes)))
+        self.assertEqual(list(case.axis_indices.items()),
+                         [('os', 0), ('python', 0), ('db', 0), ('locale', 0)])
+        self.assertEqual(case.label, 'os=linux, python=2.7, db=pg, locale=en')
+        self.assertEqual(case.slug, 'os_linux__python_2_7__db_pg__locale_en')
+
+    def test_090_Templates(self):
+        """Confirm that the axis values can be used in the templates"""
+        def test_method_wrapper(index, os, python, db, locale):
+            def test_method(self):
+                pass
+            return test_method
+
+        @GenerateTestMethods(
+            test_name='platform',
+            test_method=test_method_wrapper,
+            test_cases=Combinations(self.axes, strength=2),
+            method_name_template='test_{test_name}_{test_data.slug}',
+            method_doc_template='{test_name} on {test_data.label}')
+        class Generated(unittest.TestCase):
+            pass
+
+        method = Generated.test_platform_os_linux__python_2_7__db_pg__locale_en
+        self.assertEqual(method.__doc__,
+                         'platform on os=linux, python=2.7, db=pg, locale=en')
+
+
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestCombinations]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
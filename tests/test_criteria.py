@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for criteria.py
+
+Summary :
+    Tests for the declarative criteria of the decorators
+Use Case :
+    As a user I want to decorate a few test cases out of a huge data set
+    So that decorating the class does not evaluate every test case
+
+Testable Statements :
+    Can I write criteria as field equality, membership and ranges
+    Are the matching test cases found from an index
+    Do declarative and callable criteria select the same test cases
+"""
+
+from decimal import Decimal
+import random
+import unittest
+
+from repeatedtestframework import Criteria
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import MethodRegistry
+from repeatedtestframework import expectedFailure
+from repeatedtestframework import skip
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+class TestCriteria(unittest.TestCase):
+    def setUp(self):
+        self.test_cases = [
+            {'platform': 'win', 'size': 10, 'tags': ['fast']},
+            {'platform': 'linux', 'size': 2000},
+            {'platform': 'win', 'size': 5000.5, 'tags': ['slow']},
+            {'platform': 'mac', 'size': 'unknown'},
+            {'size': 100},
+        ]
+        self.registry = MethodRegistry()
+        for index, case in enumerate(self.test_cases):
+            self.registry.add('test_{:03d}'.format(index), index, case)
+
+    def _select(self, lookups):
+        """The indices selected from the index, checked by evaluation"""
+        criteria = Criteria(lookups)
+        selected = [index for _, index, _ in self.registry.select(criteria)]
+        self.assertEqual(selected, [index for index, case
+                                    in enumerate(self.test_cases)
+                                    if criteria(case)])
+        return selected
+
+    def test_010_Equality(self):
+        """Confirm that equality and membership lookups are answered"""
+        self.assertEqual(self._select({'platform': 'win'}), [0, 2])
+        self.assertEqual(self._select({'platform__ne': 'win'}), [1, 3])
+        self.assertEqual(self._select({'platform__in': ['mac', 'linux']}),
+                         [1, 3])
+        self.assertEqual(self._select({'tags': ['slow']}), [2])
+        self.assertEqual(self._select({'missing': 1}), [])
+        self.assertEqual(self._select({}), [0, 1, 2, 3, 4])
+
+    def test_020_Ranges(self):
+        """Confirm that range lookups only compare compatible values"""
+        self.assertEqual(self._select({'size__gt': 100}), [1, 2])
+        self.assertEqual(self._select({'size__gte': 100}), [1, 2, 4])
+        self.assertEqual(self._select({'size__lt': 2000}), [0, 4])
+        self.assertEqual(self._select({'size__lte': 2000}), [0, 1, 4])
+        self.assertEqual(self._select({'size__gt': 'a'}), [3])
+        self.assertEqual(self._select({'platform': 'win',
+                                       'size__gt': 1000}), [2])
+
+    def test_030_IndexReuse(self):
+        """Confirm that a field index is built once and refreshed on add"""
+        index = self.registry.field_index('size')
+        self.assertIs(self.registry.field_index('size'), index)
+
+        self.registry.add('test_005', 5, {'platform': 'win', 'size': 1})
+        self.assertIsNot(self.registry.field_index('size'), index)
+        self.assertEqual(
+            [name for name, _, _ in self.registry.select(
+                Criteria({'size__lt': 10}))], ['test_005'])
+
+    def test_035_NaNAndUnhashable(self):
+        """Confirm that NaN and unhashable values match as when evaluated"""
+        self.test_cases = [{'size': 1}, {'size': 5}, {'size': float('nan')},
+                           {'size': 3}, {'size': [1, 2]}, {'size': [3]}]
+        self.registry = MethodRegistry()
+        for index, case in enumerate(self.test_cases):
+            self.registry.add('test_{:03d}'.format(index), index, case)
+
+        self.assertEqual(self._select({'size__lt': 4}), [0, 3])
+        self.assertEqual(self._select({'size__gt': [2]}), [5])
+        self.assertEqual(self._select({'size__lte': [1, 2]}), [4])
+        self.assertEqual(self._select({'size': float('nan')}), [])
+        self.assertEqual(self._select({'size__gt': float('nan')}), [])
+
+        # Decimal isn't a Real number, but is ordered against numbers
+        self.test_cases.append({'size': Decimal('5')})
+        self.registry.add('test_006', 6, self.test_cases[6])
+        self.assertEqual(self._select({'size__gt': 3}), [1, 6])
+
+    def test_038_FuzzIndexAgainstCallable(self):
+        """Confirm that the index and the callable always agree"""
+        rng = random.Random(1)
+        values = [0, 1, 2, 2.5, -1, True, float('nan'), float('inf'), 'a',
+                  'b', '', b'a', None, (1, 2), [1], [2, 3], {'k': 1},
+                  set([1]), Decimal('5'), Decimal('1.5'), Decimal('-2')]
+        operators = ['', '__eq', '__ne', '__in', '__gt', '__gte', '__lt',
+                     '__lte']
+
+        for _ in range(50):
+            self.test_cases = []
+            for _ in range(rng.randint(0, 30)):
+                case = {}
+                if rng.random() < 0.9:
+                    case['a'] = rng.choice(values)
+                if rng.random() < 0.5:
+                    case['b'] = rng.choice(values)
+                self.test_cases.append(case)
+            self.registry = MethodRegistry()
+            for index, case in enumerate(self.test_cases):
+                self.registry.add('test_{:03d}'.format(index), index, case)
+
+            for _ in range(20):
+                lookups = {}
+                for field in rng.sample(['a', 'b'], rng.randint(1, 2)):
+                    operator = rng.choice(operators)
+                    if operator == '__in':
+                        # Containment finds NaN by identity
+                        bound = rng.sample(
+                            [value for value in values if value == value], 3)
+                    else:
+                        bound = rng.choice(values)
+                    lookups[field + operator] = bound
+                self._select(lookups)
+
+    def test_040_Decorators(self):
+        """Confirm that the decorators accept declarative criteria"""
+        # noinspection PyUnusedLocal
+        def wrapper(index, platform, size, tags=()):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                self.assertNotEqual(platform, 'mac')
+
+            return test_method
+
+        test_cases = [case for case in self.test_cases if 'platform' in case]
+        stacked_cls_ = expectedFailure(criteria={'platform': 'mac'})(
+            skip('Too large', criteria={'size__gt': 1000})(
+                GenerateTestMethods(
+                    test_name='Criteria',
+                    test_method=wrapper,
+                    test_cases=test_cases)(
+                    type('EmptyClass', (unittest.TestCase, object), {}))))
+        fused_cls_ = GenerateTestMethods(
+            test_name='Criteria',
+            test_method=wrapper,
+            test_cases=test_cases,
+            decorators=[skip('Too large', criteria={'size__gt': 1000}),
+                        expectedFailure(criteria={'platform': 'mac'})])(
+            type('EmptyClass', (unittest.TestCase, object), {}))
+
+        for case_cls_ in (stacked_cls_, fused_cls_):
+            suite = unittest.TestLoader().loadTestsFromTestCase(case_cls_)
+            result = suite.run(unittest.TestResult())
+            self.assertEqual((result.testsRun, len(result.skipped),
+                              len(result.expectedFailures)), (4, 2, 1))
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestCriteria]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for fixtures.py
+
+Summary :
+    Tests for the shared fixture cache
+Use Case :
+    As a user I want many of my test cases to share an expensive resource
+    So that each test method does not create it again
+
+Testable Statements :
+    Is each value created once, and shared by the test methods which need it
+    Are the least recently used values evicted and torn down
+    Is each value created once when the test methods execute in parallel
+    Is a value which is in use torn down only once it is released
+"""
+
+import threading
+import time
+import unittest
+
+import six
+
+from repeatedtestframework import FixtureCache
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import ThreadPoolSuite
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+class TestFixtureCache(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.torn_down = []
+        self.lock = threading.Lock()
+
+    def _factory(self, key):
+        with self.lock:
+            self.created.append(key)
+        time.sleep(0.01)
+        return {'model': key}
+
+    def test_010_InvalidArguments(self):
+        """Confirm that invalid arguments are rejected"""
+        with six.assertRaisesRegex(self, TypeError, r'factory.*'):
+            FixtureCache(None)
+        with six.assertRaisesRegex(self, ValueError, r'max_entries.*'):
+            FixtureCache(self._factory, max_entries=0)
+
+    def test_020_CountEviction(self):
+        """Confirm that the least recently used value is evicted"""
+        cache = FixtureCache(self._factory, key='model', max_entries=2,
+                             teardown=self.torn_down.append)
+
+        first = cache.get({'model': 'a', 'size': 1})
+        self.assertIs(cache.get({'model': 'a', 'size': 2}), first)
+        cache.get({'model': 'b'})
+        cache.get({'model': 'a'})
+        cache.get({'model': 'c'})
+
+        self.assertEqual(self.created, ['a', 'b', 'c'])
+        self.assertEqual(self.torn_down, [{'model': 'b'}])
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        self.assertIn('a', cache)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(len(self.torn_down), 3)
+
+    def test_030_SizeEviction(self):
+        """Confirm that values are evicted to keep within the total size"""
+        cache = FixtureCache(lambda key: 'x' * key, max_size=25, sizeof=len,
+                             teardown=self.torn_down.append)
+        for size in (10, 10, 10, 30):
+            cache.get(size)
+
+        # The newest value is always kept, even if it is too large
+        self.assertEqual(self.torn_down, ['x' * 10])
+        self.assertIn(30, cache)
+        self.assertEqual(len(cache), 1)
+
+    def test_040_ThreadPool(self):
+        """Confirm that values are created once under a thread pool"""
+        cache = FixtureCache(self._factory, key=lambda data: data['a'] % 2,
+                             teardown=self.torn_down.append)
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                with cache.lease({'a': a}) as value:
+                    self.assertEqual(value['model'], a % 2)
+
+            return test_method
+
+        case_cls_ = GenerateTestMethods(
+            test_name='Fixture',
+            test_method=wrapper,
+            test_cases=[{'a': a} for a in range(16)],
+            fixtures=[cache])(
+            type('EmptyClass', (unittest.TestCase, object), {}))
+
+        result = ThreadPoolSuite(case_cls_, max_workers=8).run(
+            unittest.TestResult())
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(sorted(self.created), [0, 1])
+
+        # The class scoped cache is cleared by tearDownClass
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(len(self.torn_down), 2)
+
+    @unittest.skipIf(six.PY2, 'threading.Barrier requires Python 3.2')
+    def test_045_LeasedValuesKept(self):
+        """Confirm that a leased value is not torn down while in use"""
+        cache = FixtureCache(self._factory, max_entries=1,
+                             teardown=self.torn_down.append)
+        barrier = threading.Barrier(4)
+        in_use_torn_down = []
+
+        def worker(key):
+            with cache.lease(key) as value:
+                # Every thread holds it's value while the others evict it
+                barrier.wait()
+                in_use_torn_down.append(value in self.torn_down)
+                barrier.wait()
+
+        threads = [threading.Thread(target=worker, args=(key,))
+                   for key in 'abcd']
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(in_use_torn_down, [False] * 4)
+        # The evicted values are torn down once released
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(len(self.torn_down), 3)
+
+        # A value leased while the cache is cleared is kept until released
+        with cache.lease('e') as value:
+            cache.clear()
+            self.assertNotIn(value, self.torn_down)
+        self.assertIn(value, self.torn_down)
+
+    def test_050_FactoryError(self):
+        """Confirm that a failure to create a value is not cached"""
+        attempts = []
+
+        def factory(key):
+            attempts.append(key)
+            if len(attempts) == 1:
+                raise RuntimeError('first attempt fails')
+            return key
+
+        cache = FixtureCache(factory)
+        with six.assertRaisesRegex(self, RuntimeError, r'first attempt.*'):
+            cache.get('a')
+        self.assertEqual(cache.get('a'), 'a')
+        self.assertEqual(attempts, ['a', 'a'])
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestFixtureCache]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for instrumentation.py
+
+Summary :
+    Tests for the timing of generated test methods
+Use Case :
+    As a user I want to know which of my generated test cases are slow
+    So that I can improve them or schedule them better
+
+Testable Statements :
+    Is a record kept of every test method executed
+    Can I find the slowest test cases
+    Can I export the records as JSON or CSV
+"""
+
+import csv
+import json
+import time
+import unittest
+
+import six
+
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import Instrumentation
+from repeatedtestframework import expectedFailure
+from repeatedtestframework import skip
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b, delay=0):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                time.sleep(delay)
+                if a == 6:
+                    raise RuntimeError('error for a == 6')
+                self.assertEqual(a + 1, b)
+
+            return test_method
+
+        self.test_method = wrapper
+
+    def _generate(self, instrumentation, test_name='Timing', lazy=False):
+        test_cases = [{'a': a, 'b': a + 1 if a not in (2, 5) else 0}
+                      for a in range(7)]
+        test_cases[4]['delay'] = 0.05
+        return expectedFailure(criteria=lambda data: data['a'] == 5)(
+            skip('Skipped because a == 3',
+                 criteria=lambda data: data['a'] == 3)(
+                GenerateTestMethods(
+                    test_name=test_name,
+                    test_method=self.test_method,
+                    test_cases=test_cases,
+                    lazy=lazy,
+                    instrumentation=instrumentation)(
+                    type('EmptyClass', (unittest.TestCase, object), {}))))
+
+    @staticmethod
+    def _run_tests(test_class):
+        loader = unittest.TestLoader()
+        suite = loader.loadTestsFromTestCase(test_class)
+        return suite.run(unittest.TestResult())
+
+    def test_010_Records(self):
+        """Confirm that each executed test method is recorded"""
+        instrumentation = Instrumentation()
+        self._run_tests(self._generate(instrumentation))
+
+        outcomes = dict((record.index, record.outcome)
+                        for record in instrumentation.records)
+        self.assertEqual(outcomes, {0: 'success', 1: 'success',
+                                    2: 'failure', 4: 'success',
+                                    5: 'expectedFailure', 6: 'error'})
+
+        record = instrumentation.records[4]
+        self.assertEqual(record.test_name, 'test_005_Timing')
+        self.assertEqual(record.group, 'Timing')
+        self.assertEqual(record.test_data, {'a': 5, 'b': 0})
+        self.assertIsNone(record.peak_memory)
+
+    def test_020_Slowest(self):
+        """Confirm that the slowest test cases can be found"""
+        instrumentation = Instrumentation()
+        self._run_tests(self._generate(instrumentation, lazy=True))
+
+        slowest = instrumentation.slowest(2)
+        self.assertEqual(len(slowest), 2)
+        self.assertEqual(slowest[0].index, 4)
+        self.assertTrue(slowest[0].wall_time >= 0.05)
+        self.assertTrue(slowest[0].wall_time >= slowest[1].wall_time)
+
+    def test_030_Histogram(self):
+        """Confirm that a histogram is produced for each group"""
+        instrumentation = Instrumentation()
+        self._run_tests(self._generate(instrumentation, test_name='First'))
+        self._run_tests(self._generate(instrumentation, test_name='Second'))
+
+        histograms = instrumentation.histogram(bins=5)
+        self.assertEqual(sorted(histograms), ['First', 'Second'])
+        self.assertEqual(len(histograms['First']), 5)
+        self.assertEqual(sum(count for _, _, count in histograms['First']), 6)
+        self.assertEqual(histograms['First'][-1][2], 1)
+
+    @unittest.skipIf(six.PY2, 'tracemalloc requires Python 3')
+    def test_040_TraceMemory(self):
+        """Confirm that the peak memory can be recorded"""
+        instrumentation = Instrumentation(trace_memory=True)
+        self._run_tests(self._generate(instrumentation))
+
+        self.assertTrue(all(record.peak_memory is not None
+                            for record in instrumentation.records))
+
+    def test_050_Export(self):
+        """Confirm that the records can be exported as JSON and CSV"""
+        instrumentation = Instrumentation()
+        self._run_tests(self._generate(instrumentation))
+
+        stream = six.StringIO()
+        instrumentation.to_json(stream)
+        exported = json.loads(stream.getvalue())
+        self.assertEqual(len(exported), 6)
+        self.assertEqual(exported[0]['test_name'], 'test_000_Timing')
+        self.assertEqual(exported[0]['test_data'], {'a': 0, 'b': 1})
+
+        stream = six.StringIO()
+        instrumentation.to_csv(stream)
+        rows = list(csv.reader(six.StringIO(stream.getvalue())))
+        self.assertEqual(rows[0][:3], ['index', 'test_name', 'group'])
+        self.assertEqual(len(rows), 7)
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestInstrumentation]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
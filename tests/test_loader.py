@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for loader.py
+
+Summary :
+    Tests for the registry aware TestLoader
+Use Case :
+    As a user I want to load a class with a huge number of generated test
+    methods quickly So that my test run starts without delay
+
+Testable Statements :
+    Are the generated test methods loaded in test case index order
+    Are the test methods which are not generated still loaded
+    Can I select the test methods by a range of test case indices
+    Can I select the test methods by name pattern
+"""
+
+import unittest
+
+import six
+
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import RegistryLoader
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+# noinspection PyUnusedLocal
+def _wrapper(index, a):
+    # noinspection PyShadowingNames
+    def test_method(self):
+        pass
+
+    return test_method
+
+
+class TestRegistryLoader(unittest.TestCase):
+    def setUp(self):
+        class Generated(unittest.TestCase):
+            def test_written(self):
+                pass
+
+            def helper(self):
+                pass
+
+        # Names which sort in a different order to the test case indices
+        self.cls_ = GenerateTestMethods(
+            test_name='Loaded',
+            test_method=_wrapper,
+            test_cases=[{'a': a} for a in range(12)],
+            method_name_template='test_{test_name}_{index}')(Generated)
+
+    @staticmethod
+    def _names(suite):
+        return [test._testMethodName for test in suite]
+
+    def test_010_InvalidRange(self):
+        """Confirm that an invalid index range is rejected"""
+        with six.assertRaisesRegex(self, ValueError, r'index_range.*'):
+            RegistryLoader(index_range=(5, 2))
+
+    def test_020_IndexOrder(self):
+        """Confirm that the generated test methods load in index order"""
+        suite = RegistryLoader().loadTestsFromTestCase(self.cls_)
+        self.assertEqual(self._names(suite),
+                         ['test_written'] +
+                         ['test_Loaded_{}'.format(a) for a in range(12)])
+
+        # The same test methods as the standard loader
+        standard = unittest.TestLoader().loadTestsFromTestCase(self.cls_)
+        self.assertEqual(sorted(self._names(suite)),
+                         sorted(self._names(standard)))
+
+    def test_030_IndexRange(self):
+        """Confirm that the test methods are selected by index range"""
+        suite = RegistryLoader(index_range=(9, 11)).loadTestsFromTestCase(
+            self.cls_)
+        self.assertEqual(self._names(suite),
+                         ['test_Loaded_9', 'test_Loaded_10'])
+
+    def test_040_NamePatterns(self):
+        """Confirm that the test methods are selected by name pattern"""
+        loader = RegistryLoader(name_patterns=['Loaded_1', '*.test_written'])
+        suite = loader.loadTestsFromTestCase(self.cls_)
+        self.assertEqual(self._names(suite),
+                         ['test_written', 'test_Loaded_1', 'test_Loaded_10',
+                          'test_Loaded_11'])
+
+    def test_050_OtherClasses(self):
+        """Confirm that other classes are loaded as normal"""
+        class Subclass(self.cls_):
+            def test_added(self):
+                pass
+
+        names = self._names(
+            RegistryLoader().loadTestsFromTestCase(Subclass))
+        self.assertIn('test_added', names)
+        self.assertEqual(len(names), 14)
+
+        collapsed = GenerateTestMethods(
+            test_name='Collapsed',
+            test_method=_wrapper,
+            test_cases=[{'a': a} for a in range(3)],
+            collapse=True)(type('EmptyClass', (unittest.TestCase, object), {}))
+        self.assertEqual(
+            self._names(RegistryLoader().loadTestsFromTestCase(collapsed)),
+            ['test_Collapsed'])
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestRegistryLoader]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
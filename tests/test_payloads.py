@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for payloads.py
+
+Summary :
+    Tests for the shared payloads of test cases
+Use Case :
+    As a user I want test cases with large payloads to execute in several
+    processes So that each process does not hold a copy of every payload
+
+Testable Statements :
+    Can I store the payloads of my test cases in a memory mapped file
+    Can I store the payloads of my test cases in shared memory
+    Is each payload passed to the test method without being copied
+    Are the handles small when the test cases are pickled
+
+.. note::
+
+    This test suite requires Python 3.8 or later.
+"""
+
+import array
+import os
+import pickle
+import unittest
+
+import six
+
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import MappedPayloadStore
+from repeatedtestframework import PayloadSource
+from repeatedtestframework import ProcessPoolSuite
+from repeatedtestframework import SharedPayloadStore
+from repeatedtestframework import case_digest
+from tests import payload_cases
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+class _PayloadStoreTests(object):
+    """Tests common to both payload stores"""
+
+    def _store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.store = self._store()
+        self.test_cases = [{'a': a,
+                            'small': b'small',
+                            'payload': array.array('i', range(a, a + 20000))}
+                           for a in range(4)]
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_010_InvalidArguments(self):
+        """Confirm that invalid arguments are rejected"""
+        with six.assertRaisesRegex(self, ValueError, r'min_size.*'):
+            PayloadSource([], self.store, min_size=0)
+        with six.assertRaisesRegex(self, TypeError, r'test_cases item 1.*'):
+            PayloadSource([{}, 1], self.store)
+
+    def test_020_LargeValuesStored(self):
+        """Confirm that only the large values are moved to the store"""
+        source = PayloadSource(self.test_cases, self.store)
+        case = source[2]
+
+        self.assertIsNone(case.handle('small'))
+        self.assertIsNotNone(case.handle('payload'))
+        self.assertEqual(case['small'], b'small')
+        self.assertEqual(case['a'], 2)
+
+        payload = case['payload']
+        self.assertIsInstance(payload, memoryview)
+        self.assertTrue(payload.readonly)
+        self.assertEqual(payload.format, 'i')
+        self.assertEqual(payload.tolist(), list(range(2, 20002)))
+
+    def test_030_NamedFields(self):
+        """Confirm that the values of the named fields are always stored"""
+        source = PayloadSource(self.test_cases, self.store,
+                               fields=['small'])
+        self.assertIsNotNone(source[0].handle('small'))
+        self.assertIsNone(source[0].handle('payload'))
+        self.assertEqual(source[0]['small'].tobytes(), b'small')
+
+    def test_040_Pickled(self):
+        """Confirm that a pickled test case holds only the handles"""
+        case = PayloadSource(self.test_cases, self.store)[1]
+        pickled = pickle.dumps(case)
+
+        self.assertLess(len(pickled), 1000)
+        self.assertEqual(pickle.loads(pickled)['payload'].tolist(),
+                         list(range(1, 20001)))
+
+    def test_050_Digest(self):
+        """Confirm that the digest depends on the payload content"""
+        first = PayloadSource(self.test_cases, self.store)
+        second = PayloadSource(self.test_cases, self.store)
+        self.assertEqual(case_digest(first[0]), case_digest(second[0]))
+        self.assertNotEqual(case_digest(first[0]), case_digest(first[1]))
+
+    def test_060_Generate(self):
+        """Confirm that the test methods receive the shared payloads"""
+        received = []
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, small, payload):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                received.append(payload)
+                self.assertEqual(payload[0], a)
+
+            return test_method
+
+        case_cls_ = GenerateTestMethods(
+            test_name='Payload',
+            test_method=wrapper,
+            test_cases=PayloadSource(self.test_cases, self.store))(
+            type('EmptyClass', (unittest.TestCase, object), {}))
+        result = unittest.TestResult()
+        unittest.TestLoader().loadTestsFromTestCase(case_cls_).run(result)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(len(received), 4)
+        self.assertTrue(all(isinstance(payload, memoryview)
+                            for payload in received))
+        del received[:]
+
+
+class TestMappedPayloadStore(_PayloadStoreTests, unittest.TestCase):
+    def _store(self):
+        return MappedPayloadStore()
+
+    def test_100_TemporaryFileRemoved(self):
+        """Confirm that a temporary payload file is removed on close"""
+        PayloadSource(self.test_cases, self.store)
+        self.assertTrue(os.path.exists(self.store.path))
+        self.store.close()
+        self.assertFalse(os.path.exists(self.store.path))
+
+    def test_110_ProcessPool(self):
+        """Confirm that worker processes read the shared payloads"""
+        result = unittest.TestResult()
+        ProcessPoolSuite(payload_cases.PayloadCases, max_workers=2,
+                         chunk_size=2).run(result)
+        self.assertEqual(result.testsRun, 6)
+        self.assertTrue(result.wasSuccessful())
+
+
+class TestSharedPayloadStore(_PayloadStoreTests, unittest.TestCase):
+    def _store(self):
+        return SharedPayloadStore()
+
+    def test_100_BlocksRemoved(self):
+        """Confirm that the shared memory blocks are released on close"""
+        PayloadSource(self.test_cases, self.store)
+        self.assertEqual(len(self.store), 4)
+        self.store.close()
+        self.assertEqual(len(self.store), 0)
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestMappedPayloadStore,
+               TestSharedPayloadStore]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
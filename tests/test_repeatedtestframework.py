@@ -13,9 +13,11 @@ Testable Statements :
     ....
 """
 
+import os
 import unittest
 import six
 import inspect
+from array import array
 
 from repeatedtestframework import GenerateTestMethods
 from repeatedtestframework import DecorateTestMethod
@@ -23,6 +25,8 @@ from repeatedtestframework import skip
 from repeatedtestframework import skipIf
 from repeatedtestframework import skipUnless
 from repeatedtestframework import expectedFailure
+from repeatedtestframework import MethodRegistry
+from repeatedtestframework import case_digest
 
 __version__ = "0.1"
 __author__ = 'Tony Flury : anthony.flury@btinternet.com'
@@ -122,6 +126,17 @@ class TestErrorChecking(unittest.TestCase):
                                    r'Invalid type.*not unittest.TestCase'):
             dec_cls = cls_dec(wrong_cls_)
 
+    # noinspection PyUnusedLocal
+    @unittest.skipUnless(six.PY2, 'subTest exists on Python 3')
+    def test_045_CollapsedOnPython2(self):
+        """Test that a collapsed test method is rejected on Python 2"""
+        with six.assertRaisesRegex(self, ValueError, r'.*subTest.*'):
+            dec = GenerateTestMethods(
+                test_name='Collapsed',
+                test_method=lambda x: x,
+                test_cases=[{'dummy': None}],
+                collapse=True)
+
 
 class TestMethodGeneration(unittest.TestCase):
     def setUp(self):
@@ -208,6 +223,78 @@ class TestMethodGeneration(unittest.TestCase):
                                  index=index,
                                  test_data=test_data))
 
+    def test_130_LazyDocStrings(self):
+        """Confirm that the doc strings are only formatted when used"""
+        formatted = []
+
+        class CountingDict(dict):
+            def __repr__(self):
+                formatted.append(self['a'])
+                return super(CountingDict, self).__repr__()
+
+        case_cls_ = GenerateTestMethods(
+            test_name="MethodGeneration",
+            test_method=self.test_method_,
+            test_cases=[CountingDict(a=i, b=[i + 1]) for i in range(3)]
+        )(self.cls_)
+
+        self.assertEqual(formatted, [])
+        test = case_cls_('test_001_MethodGeneration')
+        self.assertEqual(formatted, [])
+        self.assertEqual(test.shortDescription(),
+                         "MethodGeneration 001: {'a': 1, 'b': [2]}")
+
+        # Only the test data for the described test has been formatted
+        self.assertEqual(set(formatted), set([1]))
+
+    def test_132_SmallDocStrings(self):
+        """Confirm that the doc strings of small test cases are strings"""
+        case_cls_ = GenerateTestMethods(
+            test_name="MethodGeneration",
+            test_method=self.test_method_,
+            test_cases=[{'a': 1, 'b': 2}, {'a': 2, 'b': list(range(3))}]
+        )(self.cls_)
+
+        small = case_cls_.test_000_MethodGeneration
+        self.assertIsInstance(small.__doc__, str)
+        self.assertEqual(inspect.getdoc(small),
+                         "MethodGeneration 000: {'a': 1, 'b': 2}")
+
+        # A large test case has a lazy doc string, which isn't a str
+        large = case_cls_.test_001_MethodGeneration
+        self.assertNotIsInstance(large.__doc__, str)
+        self.assertEqual(str(large.__doc__),
+                         "MethodGeneration 001: {'a': 2, 'b': [0, 1, 2]}")
+
+    def test_135_CustomTemplates(self):
+        """Confirm that custom templates are formatted correctly"""
+        case_cls_ = GenerateTestMethods(
+            test_name="Custom",
+            test_method=self.test_method_,
+            test_cases=self._generate_test_data(2),
+            method_name_template="test_{test_name!s:x<8}_{test_data[a]:02d}",
+            method_doc_template="{{{test_name}}} fixed"
+        )(self.cls_)
+
+        method = getattr(case_cls_, 'test_Customxx_01', None)
+        self.assertIsNotNone(method)
+        self.assertEqual(method.__doc__, "{Custom} fixed")
+        self.assertEqual(str(method.__doc__), "{Custom} fixed")
+
+    def test_137_TestNameFields(self):
+        """Confirm that test_name can be indexed within the templates"""
+        case_cls_ = GenerateTestMethods(
+            test_name="Custom",
+            test_method=self.test_method_,
+            test_cases=self._generate_test_data(2),
+            method_name_template="test_{test_name[0]}_{index}",
+            method_doc_template="{test_name.__class__.__name__} {index}"
+        )(self.cls_)
+
+        method = getattr(case_cls_, 'test_C_1', None)
+        self.assertIsNotNone(method)
+        self.assertEqual(method.__doc__, "str 1")
+
 
 class TestMethodExecution(unittest.TestCase):
     def setUp(self):
@@ -732,12 +819,895 @@ class DecoratedTestExecution(unittest.TestCase):
                          )
 
 
+class TestLazyGeneration(unittest.TestCase):
+    def setUp(self):
+        self.built = []
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            self.built.append(index)
+
+            # noinspection PyShadowingNames
+            def test_method(self):
+                self.assertEqual(a + 1, b)
+
+            return test_method
+
+        self.cls_ = type('EmptyClass', (unittest.TestCase, object), {})
+        self.test_method = wrapper
+
+    @staticmethod
+    def _run_tests(test_class):
+        loader = unittest.TestLoader()
+        suite = loader.loadTestsFromTestCase(test_class)
+        result = unittest.result.TestResult()
+        suite.run(result=result)
+        summary = result.testsRun, len(result.errors), len(
+            result.failures), len(result.skipped), len(
+            result.expectedFailures), len(result.unexpectedSuccesses)
+
+        return summary, result
+
+    def test_400_LazyNoMethodsBuilt(self):
+        """Confirm that lazy generation does not build any test methods"""
+        case_cls_ = GenerateTestMethods(
+            test_name='LazyGeneration',
+            test_method=self.test_method,
+            test_cases=[{'a': 1, 'b': 2},
+                        {'a': 2, 'b': 3},
+                        {'a': 3, 'b': 4}, ],
+            lazy=True)(self.cls_)
+
+        self.assertEqual(self.built, [])
+        self.assertEqual(sorted(case_cls_._RTF_METHODS),
+                         ['test_000_LazyGeneration',
+                          'test_001_LazyGeneration',
+                          'test_002_LazyGeneration'])
+
+    def test_405_LazyBuildOnDemand(self):
+        """Confirm that selecting a single test only builds that method"""
+        case_cls_ = GenerateTestMethods(
+            test_name='LazyGeneration',
+            test_method=self.test_method,
+            test_cases=[{'a': 1, 'b': 2},
+                        {'a': 2, 'b': 3},
+                        {'a': 3, 'b': 4}, ],
+            lazy=True)(self.cls_)
+
+        test = case_cls_('test_001_LazyGeneration')
+        self.assertEqual(self.built, [1])
+        self.assertEqual(test.shortDescription(),
+                         "LazyGeneration 001: {'a': 2, 'b': 3}")
+
+        # Once built the method is cached on the class
+        case_cls_('test_001_LazyGeneration')
+        self.assertEqual(self.built, [1])
+        self.assertTrue(inspect.isfunction(
+            case_cls_.__dict__['test_001_LazyGeneration']))
+
+    def test_410_LazyExecution(self):
+        """Confirm that lazily generated methods execute correctly"""
+        case_cls_ = GenerateTestMethods(
+            test_name='LazyGeneration',
+            test_method=self.test_method,
+            test_cases=[{'a': 1, 'b': 2},
+                        {'a': 2, 'b': 3},
+                        {'a': 3, 'b': 3}, ],
+            lazy=True)(self.cls_)
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((3, 0, 1, 0, 0, 0), summary)
+        self.assertEqual(result.failures[0][0].id(),
+                         'tests.test_repeatedtestframework.'
+                         'EmptyClass.test_002_LazyGeneration'
+                         )
+
+    def test_415_LazyDecorated(self):
+        """Confirm that decorators are applied to lazily built methods"""
+        case_dec_ = GenerateTestMethods(
+            test_name='LazyGeneration',
+            test_method=self.test_method,
+            test_cases=[{'a': 1, 'b': 2},
+                        {'a': 2, 'b': 3},
+                        {'a': 3, 'b': 5}, ],
+            lazy=True)
+
+        case_cls_ = expectedFailure(criteria=lambda data: data['a'] == 3)(
+            skip('Skipped because a == 1',
+                 criteria=lambda data: data['a'] == 1)(
+                case_dec_(self.cls_)))
+
+        self.assertEqual(self.built, [])
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((3, 0, 0, 1, 1, 0), summary)
+        self.assertEqual(result.skipped[0][0].id(),
+                         'tests.test_repeatedtestframework.'
+                         'EmptyClass.test_000_LazyGeneration'
+                         )
+        self.assertEqual(result.expectedFailures[0][0].id(),
+                         'tests.test_repeatedtestframework.'
+                         'EmptyClass.test_002_LazyGeneration'
+                         )
+
+    def test_420_LazyStacked(self):
+        """Confirm that lazy methods are built beneath another generator"""
+        inner = GenerateTestMethods(
+            test_name='inner',
+            test_method=self.test_method,
+            test_cases=[{'a': 1, 'b': 2}, {'a': 2, 'b': 4}],
+            lazy=True)
+        outer = GenerateTestMethods(
+            test_name='outer',
+            test_method=self.test_method,
+            test_cases=[{'a': 5, 'b': 6}])
+        case_cls_ = outer(inner(self.cls_))
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((3, 0, 1, 0, 0, 0), summary)
+        self.assertEqual(result.failures[0][0].id(),
+                         'tests.test_repeatedtestframework.'
+                         'EmptyClass.test_001_inner')
+
+
+class TestMethodRegistry(unittest.TestCase):
+    def test_500_RegistryLookup(self):
+        """Confirm that the registry looks up methods by name and index"""
+        registry = MethodRegistry()
+        for index in range(3):
+            registry.add('test_{:03d}'.format(index), index, {'a': index})
+
+        self.assertEqual(len(registry), 3)
+        self.assertEqual(registry.entry('test_001'), (1, {'a': 1}))
+        self.assertEqual(registry.by_index(2), ('test_002', {'a': 2}))
+        self.assertEqual(registry.name_of(0), 'test_000')
+        with self.assertRaises(KeyError):
+            registry.name_of(3)
+        self.assertEqual(list(registry.entries()),
+                         [('test_000', 0, {'a': 0}),
+                          ('test_001', 1, {'a': 1}),
+                          ('test_002', 2, {'a': 2})])
+
+    def test_505_RegistryNonConsecutive(self):
+        """Confirm that lookup by index copes with gaps in the indices"""
+        registry = MethodRegistry()
+        for index in (0, 3, 7):
+            registry.add('test_{:03d}'.format(index), index, {'a': index})
+
+        self.assertEqual(registry.indices(), [0, 3, 7])
+        self.assertEqual(registry.name_of(7), 'test_007')
+        registry.add('test_009', 9, {'a': 9})
+        self.assertEqual(registry.name_of(9), 'test_009')
+        with self.assertRaises(KeyError):
+            registry.name_of(1)
+
+    def test_507_RegistryIndexRange(self):
+        """Confirm that the methods are selected by a range of indices"""
+        registry = MethodRegistry()
+        for index in (0, 3, 7, 9):
+            registry.add('test_{:03d}'.format(index), index, {'a': index})
+        self.assertEqual(registry.names_in_range(1, 9),
+                         ['test_003', 'test_007'])
+        self.assertEqual(registry.names_in_range(10, 20), [])
+
+        # Indices out of order are searched in generation order
+        registry.add('test_002', 2, {'a': 2})
+        self.assertEqual(registry.names_in_range(1, 9),
+                         ['test_003', 'test_007', 'test_002'])
+
+    def test_510_RegistryMapping(self):
+        """Confirm that the registry is a Mapping of name to test data"""
+        # noinspection PyUnusedLocal
+        def wrapper(index, a):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                pass
+            return test_method
+
+        case_cls_ = GenerateTestMethods(
+            test_name='Registry',
+            test_method=wrapper,
+            test_cases=[{'a': 1}, {'a': 2}])(
+            type('EmptyClass', (unittest.TestCase, object), {}))
+
+        registry = case_cls_._RTF_METHODS
+        self.assertIsInstance(registry, MethodRegistry)
+        self.assertIn('test_001_Registry', registry)
+        self.assertEqual(registry['test_001_Registry'],
+                         {'index': 1, 'test_data': {'a': 2}})
+        self.assertEqual(dict(registry.items()),
+                         {'test_000_Registry': {'index': 0,
+                                                'test_data': {'a': 1}},
+                          'test_001_Registry': {'index': 1,
+                                                'test_data': {'a': 2}}})
+
+
+@unittest.skipIf(six.PY2, 'A collapsed test method requires subTest')
+class TestCollapsedGeneration(unittest.TestCase):
+    def setUp(self):
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                self.assertEqual(a + 1, b)
+
+            return test_method
+
+        self.cls_ = type('EmptyClass', (unittest.TestCase, object), {})
+        self.test_method = wrapper
+
+    @staticmethod
+    def _generate_test_data(num_test_cases, fail=()):
+        for i in range(0, num_test_cases):
+            yield {'a': i, 'b': i + 1 if i not in fail else 0}
+
+    @staticmethod
+    def _run_tests(test_class):
+        loader = unittest.TestLoader()
+        suite = loader.loadTestsFromTestCase(test_class)
+        result = unittest.result.TestResult()
+        suite.run(result=result)
+        summary = result.testsRun, len(result.errors), len(
+            result.failures), len(result.skipped), len(
+            result.expectedFailures), len(result.unexpectedSuccesses)
+
+        return summary, result
+
+    def test_600_CollapsedSingleMethod(self):
+        """Confirm that a collapsed class has a single test method"""
+        case_cls_ = GenerateTestMethods(
+            test_name='Collapsed',
+            test_method=self.test_method,
+            test_cases=self._generate_test_data(100),
+            collapse=True)(self.cls_)
+
+        self.assertEqual(
+            unittest.TestLoader().getTestCaseNames(case_cls_),
+            ['test_Collapsed'])
+
+    def test_605_CollapsedSubTestFailures(self):
+        """Confirm that each failing test case is reported separately"""
+        case_cls_ = GenerateTestMethods(
+            test_name='Collapsed',
+            test_method=self.test_method,
+            test_cases=self._generate_test_data(5, fail=(1, 3)),
+            collapse=True)(self.cls_)
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((1, 0, 2, 0, 0, 0), summary)
+        self.assertEqual(result.failures[0][0].params,
+                         {'index': 1, 'a': 1, 'b': 0})
+        self.assertEqual(result.failures[1][0].params,
+                         {'index': 3, 'a': 3, 'b': 0})
+
+    def test_610_CollapsedDecorators(self):
+        """Confirm that decorators apply to individual test cases"""
+        case_dec_ = GenerateTestMethods(
+            test_name='Collapsed',
+            test_method=self.test_method,
+            test_cases=list(self._generate_test_data(5, fail=(1, 3))),
+            collapse=True)
+
+        case_cls_ = expectedFailure(criteria=lambda data: data['a'] in (3, 4))(
+            skip('Skipped because a == 1',
+                 criteria=lambda data: data['a'] == 1)(
+                case_dec_(self.cls_)))
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((1, 0, 1, 1, 0, 0), summary)
+        self.assertEqual(result.skipped[0][0].params,
+                         {'index': 1, 'a': 1, 'b': 0})
+        self.assertEqual(result.failures[0][0].params,
+                         {'index': 4, 'a': 4, 'b': 5})
+        self.assertIn('Unexpected success', result.failures[0][1])
+
+    def test_615_CollapsedMessageKey(self):
+        """Confirm that a msg key doesn't clash with subTest"""
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, msg):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                self.assertEqual(a, 0, msg)
+
+            return test_method
+
+        case_cls_ = GenerateTestMethods(
+            test_name='Collapsed',
+            test_method=wrapper,
+            test_cases=[{'a': i, 'msg': 'a is not zero'} for i in range(3)],
+            collapse=True)(self.cls_)
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((1, 0, 2, 0, 0, 0), summary)
+        self.assertEqual(result.failures[0][0].params, {'index': 1, 'a': 1})
+        self.assertIn('a is not zero', result.failures[0][1])
+
+    def test_620_CollapsedIndexKey(self):
+        """Confirm that a test case with an index key is rejected clearly"""
+        case_cls_ = GenerateTestMethods(
+            test_name='Collapsed',
+            test_method=self.test_method,
+            test_cases=[{'a': 0, 'b': 1}, {'index': 7, 'a': 1, 'b': 2}],
+            collapse=True)(self.cls_)
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((1, 1, 0, 0, 0, 0), summary)
+        self.assertEqual(result.errors[0][0].params, {'index': 1, 'a': 1,
+                                                      'b': 2})
+        self.assertIn("Test case 1 has an 'index' key", result.errors[0][1])
+
+
+class TestBatchGeneration(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.cls_ = type('EmptyClass', (unittest.TestCase, object), {})
+
+    def _records(self, indices, batch):
+        """Batch test method - checks a + 1 == b for each record"""
+        self.batches.append(indices)
+        return [case['a'] + 1 == case['b'] for case in batch]
+
+    def _columns(self, indices, batch):
+        """Batch test method - checks a + 1 == b using columns"""
+        self.batches.append(indices)
+        mask = [a + 1 == b for a, b in zip(batch['a'], batch['b'])]
+        messages = ['{} + 1 != {}'.format(a, b)
+                    for a, b in zip(batch['a'], batch['b'])]
+        return mask, messages
+
+    @staticmethod
+    def _generate_test_data(num_test_cases, fail=()):
+        return [{'a': i, 'b': i + 1 if i not in fail else 0}
+                for i in range(0, num_test_cases)]
+
+    @staticmethod
+    def _run_tests(test_class):
+        loader = unittest.TestLoader()
+        suite = loader.loadTestsFromTestCase(test_class)
+        result = unittest.result.TestResult()
+        suite.run(result=result)
+        summary = result.testsRun, len(result.errors), len(
+            result.failures), len(result.skipped), len(
+            result.expectedFailures), len(result.unexpectedSuccesses)
+
+        return summary, result
+
+    def test_700_BatchInvalidArguments(self):
+        """Confirm that invalid batch arguments are rejected"""
+        with six.assertRaisesRegex(self, ValueError, r'batch_size.*'):
+            GenerateTestMethods(test_name='Batch',
+                                test_method=self._records,
+                                test_cases=[], batch_size=0)
+        with six.assertRaisesRegex(self, ValueError, r'batch_format.*'):
+            GenerateTestMethods(test_name='Batch',
+                                test_method=self._records,
+                                test_cases=[], batch_size=2,
+                                batch_format='rows')
+
+    def test_705_BatchRecords(self):
+        """Confirm that test_method is called once per batch"""
+        case_cls_ = GenerateTestMethods(
+            test_name='Batch',
+            test_method=self._records,
+            test_cases=self._generate_test_data(7, fail=(4,)),
+            batch_size=3)(self.cls_)
+        self.assertEqual(self.batches, [])
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((7, 0, 1, 0, 0, 0), summary)
+        self.assertEqual(self.batches, [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(result.failures[0][0].id(),
+                         'tests.test_repeatedtestframework.'
+                         'EmptyClass.test_004_Batch')
+        self.assertIn('test case 4 failed', result.failures[0][1])
+
+    def test_710_BatchColumnsMessages(self):
+        """Confirm that columns are passed and messages are reported"""
+        case_cls_ = expectedFailure(criteria=lambda data: data['a'] == 1)(
+            GenerateTestMethods(
+                test_name='Batch',
+                test_method=self._columns,
+                test_cases=self._generate_test_data(4, fail=(1, 2)),
+                batch_size=4,
+                batch_format='columns')(self.cls_))
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((4, 0, 1, 0, 1, 0), summary)
+        self.assertEqual(self.batches, [[0, 1, 2, 3]])
+        self.assertIn('2 + 1 != 0', result.failures[0][1])
+
+    def test_715_BatchError(self):
+        """Confirm that an error in test_method is reported for the batch"""
+        # noinspection PyUnusedLocal
+        def broken(indices, batch):
+            return [True]
+
+        case_cls_ = GenerateTestMethods(
+            test_name='Batch',
+            test_method=broken,
+            test_cases=self._generate_test_data(4),
+            batch_size=2)(self.cls_)
+
+        summary, result = self._run_tests(case_cls_)
+
+        self.assertEqual((4, 4, 0, 0, 0, 0), summary)
+        self.assertIn('mask of 1 entries for a batch of 2',
+                      result.errors[0][1])
+
+    def test_718_BatchStacked(self):
+        """Confirm that a batch is taken from it's own generator's cases"""
+        # noinspection PyUnusedLocal
+        def negative(indices, batch):
+            return [case['a'] < 0 for case in batch]
+
+        inner = GenerateTestMethods(
+            test_name='Batch',
+            test_method=negative,
+            test_cases=[{'a': -1}, {'a': -2}],
+            batch_size=2)
+        outer = GenerateTestMethods(
+            test_name='Outer',
+            test_method=self._records,
+            test_cases=self._generate_test_data(2),
+            batch_size=2)
+        case_cls_ = outer(inner(self.cls_))
+
+        summary, _ = self._run_tests(case_cls_)
+
+        self.assertEqual((4, 0, 0, 0, 0, 0), summary)
+
+    def test_720_BatchReleased(self):
+        """Confirm that a batch is released when test methods are skipped"""
+        generator = GenerateTestMethods(
+            test_name='Batch',
+            test_method=self._records,
+            test_cases=self._generate_test_data(8),
+            batch_size=4)
+        case_cls_ = skip('Skipped', criteria=lambda data: data['a'] == 1)(
+            generator(self.cls_))
+
+        result = unittest.TestResult()
+        case_cls_('test_000_Batch').run(result)
+        case_cls_('test_002_Batch').run(result)
+        case_cls_('test_003_Batch').run(result)
+        self.assertEqual(generator._batches, {})
+
+        # A batch whose test methods were not all executed is released at
+        # the end of the class
+        unittest.TestSuite([case_cls_('test_004_Batch')]).run(result)
+        self.assertEqual((result.testsRun, len(result.failures)), (4, 0))
+        self.assertEqual(generator._batches, {})
+
+
+class TestSharding(unittest.TestCase):
+    def setUp(self):
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                self.assertEqual(a + 1, b)
+
+            return test_method
+
+        self.test_method = wrapper
+        self.test_cases = [{'a': i, 'b': i + 1} for i in range(20)]
+
+        # Make sure the environment cannot change the shard
+        environment = os.environ.pop('RTF_SHARD', None)
+        if environment is not None:
+            self.addCleanup(os.environ.__setitem__, 'RTF_SHARD', environment)
+
+    def _shard(self, shard, shard_by='index', test_cases=None):
+        cls_ = GenerateTestMethods(
+            test_name='Shard',
+            test_method=self.test_method,
+            test_cases=self.test_cases if test_cases is None else test_cases,
+            shard=shard,
+            shard_by=shard_by)(
+            type('EmptyClass', (unittest.TestCase, object), {}))
+        return list(cls_._RTF_METHODS.indices())
+
+    def test_800_ShardInvalidArguments(self):
+        """Confirm that invalid shards are rejected"""
+        for shard in [(3, 3), (-1, 3), (0, 0), (1, 2, 3)]:
+            with six.assertRaisesRegex(self, ValueError, r'shard.*'):
+                GenerateTestMethods(test_name='Shard',
+                                    test_method=self.test_method,
+                                    test_cases=[], shard=shard)
+        with six.assertRaisesRegex(self, ValueError, r'shard_by.*'):
+            GenerateTestMethods(test_name='Shard',
+                                test_method=self.test_method,
+                                test_cases=[], shard=(0, 2),
+                                shard_by='name')
+
+    def test_805_ShardByIndex(self):
+        """Confirm that each shard only generates it's own test cases"""
+        self.assertEqual(self._shard((1, 3)), [1, 4, 7, 10, 13, 16, 19])
+
+        # The shards cover every test case exactly once, from a generator
+        indices = []
+        for k in range(3):
+            indices.extend(self._shard(
+                (k, 3), test_cases=(case for case in self.test_cases)))
+        self.assertEqual(sorted(indices), list(range(20)))
+
+    def test_810_ShardByHash(self):
+        """Confirm that hashed shards are stable and cover every test case"""
+        shards = [self._shard((k, 4), shard_by='hash') for k in range(4)]
+        self.assertEqual(sorted(sum(shards, [])), list(range(20)))
+        self.assertTrue(all(shards))
+
+        # Removing a test case does not move the others between shards
+        reduced = [self._shard((k, 4), shard_by='hash',
+                               test_cases=self.test_cases[1:])
+                   for k in range(4)]
+        self.assertEqual([[index + 1 for index in shard] for shard in reduced],
+                         [[index for index in shard if index != 0]
+                          for shard in shards])
+
+    def test_815_ShardEnvironment(self):
+        """Confirm that the environment variable overrides the shard"""
+        os.environ['RTF_SHARD'] = '2/5'
+        self.addCleanup(os.environ.pop, 'RTF_SHARD', None)
+        self.assertEqual(self._shard(None), [2, 7, 12, 17])
+        self.assertEqual(self._shard((0, 2)), [2, 7, 12, 17])
+
+        os.environ['RTF_SHARD'] = '2'
+        with six.assertRaisesRegex(self, ValueError, r'RTF_SHARD.*'):
+            self._shard(None)
+
+    def test_820_CaseDigest(self):
+        """Confirm that the case digest ignores ordering of dicts and sets"""
+        self.assertEqual(case_digest({'a': 1, 'b': [1, {2, 3}]}),
+                         case_digest({'b': [1, {3, 2}], 'a': 1}))
+        self.assertNotEqual(case_digest({'a': [1, 2]}),
+                            case_digest({'a': (1, 2)}))
+
+    def test_825_CaseDigestValues(self):
+        """Confirm that buffers are digested by content, and addresses fail"""
+        first, second = array('d', [0.0] * 2000), array('d', [0.0] * 2000)
+        second[1000] = 1.0
+        self.assertNotEqual(case_digest({'a': first}),
+                            case_digest({'a': second}))
+        self.assertEqual(case_digest({'a': first}),
+                         case_digest({'a': array('d', [0.0] * 2000)}))
+        self.assertEqual(case_digest({'a': memoryview(b'data')}),
+                         case_digest({'a': memoryview(bytearray(b'data'))}))
+
+        with six.assertRaisesRegex(self, TypeError, r'.*address.*'):
+            case_digest({'a': object()})
+
+        # Only a default repr is rejected, not text mentioning an address
+        self.assertEqual(case_digest({'asm': 'jmp at 0x1F'}),
+                         case_digest({'asm': u'jmp at 0x1F'}))
+        case_digest({'a': b'at 0x1F', 'b': ['<op at 0x1F>']})
+
+
+class TestFusedDecorators(unittest.TestCase):
+    def setUp(self):
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                self.assertEqual(a + 1, b)
+
+            return test_method
+
+        self.test_method = wrapper
+        self.test_cases = [{'a': a, 'b': a + 1 if a not in (2, 5) else 0}
+                           for a in range(8)]
+        self.wrapped = []
+
+    def _tag(self, method):
+        """A custom decorator which records each method it decorates"""
+        self.wrapped.append(method)
+        method.tagged = True
+        return method
+
+    def _decorators(self):
+        return [skip('Skipped because a == 3',
+                     criteria=lambda data: data['a'] == 3),
+                skipIf(False, 'Never skipped'),
+                skipUnless(True, 'Never skipped'),
+                expectedFailure(criteria=lambda data: data['a'] == 5),
+                DecorateTestMethod(criteria=lambda data: data['a'] > 5,
+                                   decorator_method=self._tag)]
+
+    def _generate(self, **kwargs):
+        return GenerateTestMethods(
+            test_name='Fused',
+            test_method=self.test_method,
+            test_cases=self.test_cases,
+            **kwargs)(type('EmptyClass', (unittest.TestCase, object), {}))
+
+    @staticmethod
+    def _run_tests(test_class):
+        suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        result = suite.run(unittest.TestResult())
+        return result.testsRun, len(result.errors), len(
+            result.failures), len(result.skipped), len(
+            result.expectedFailures), len(result.unexpectedSuccesses)
+
+    def test_900_FusedDecorators(self):
+        """Confirm that decorators applied during generation are honoured"""
+        case_cls_ = self._generate(decorators=self._decorators())
+
+        self.assertEqual(len(self.wrapped), 2)
+        self.assertTrue(case_cls_.test_007_Fused.tagged)
+        self.assertEqual(case_cls_.test_004_Fused.__name__,
+                         'test_004_Fused')
+        self.assertEqual(case_cls_.test_004_Fused.__doc__,
+                         "Fused 004: {'a': 4, 'b': 5}")
+        self.assertEqual((8, 0, 1, 1, 1, 0), self._run_tests(case_cls_))
+
+    def test_905_FusedMatchesStacked(self):
+        """Confirm that fused decorators match stacked decorators"""
+        stacked_cls_ = self._generate()
+        for decorator in self._decorators():
+            stacked_cls_ = decorator(stacked_cls_)
+
+        self.assertEqual(self._run_tests(stacked_cls_),
+                         self._run_tests(self._generate(
+                             decorators=self._decorators())))
+
+    def test_910_FusedLazy(self):
+        """Confirm that fused decorators are applied to lazy methods"""
+        case_cls_ = self._generate(decorators=self._decorators(), lazy=True)
+        self.assertEqual(self.wrapped, [])
+
+        self.assertEqual((8, 0, 1, 1, 1, 0), self._run_tests(case_cls_))
+        self.assertEqual(len(self.wrapped), 2)
+
+    def test_912_SkipStubs(self):
+        """Confirm that skipped test cases share a stub and are not built"""
+        built = []
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            built.append(index)
+
+            # noinspection PyShadowingNames
+            def test_method(self):
+                pass
+
+            return test_method
+
+        case_cls_ = GenerateTestMethods(
+            test_name='Fused',
+            test_method=wrapper,
+            test_cases=self.test_cases,
+            decorators=[skip('Odd', criteria=lambda data: data['a'] % 2),
+                        skip('Large', criteria=lambda data: data['a'] > 4)])(
+            type('EmptyClass', (unittest.TestCase, object), {}))
+
+        self.assertEqual(built, [0, 2, 4])
+        self.assertIs(case_cls_.test_001_Fused, case_cls_.test_003_Fused)
+        self.assertIsNot(case_cls_.test_001_Fused, case_cls_.test_006_Fused)
+
+        suite = unittest.TestLoader().loadTestsFromTestCase(case_cls_)
+        result = suite.run(unittest.TestResult())
+        self.assertEqual(result.testsRun, 8)
+        self.assertEqual([reason for _, reason in result.skipped],
+                         ['Odd', 'Odd', 'Large', 'Large', 'Large'])
+
+    def test_913_StackedSkipStub(self):
+        """Confirm that a stacked skip stub keeps the documentation string"""
+        for lazy in (True, False):
+            case_cls_ = skip('Skipped', criteria=lambda data: data['a'] > 3)(
+                self._generate(lazy=lazy))
+            self.assertTrue(getattr(case_cls_.test_004_Fused,
+                                    '_rtf_skip_stub', False))
+            self.assertTrue(str(case_cls_.test_004_Fused.__doc__).startswith(
+                'Fused 004: '))
+            self.assertTrue(str(case_cls_.test_007_Fused.__doc__).startswith(
+                'Fused 007: '))
+
+        self.assertEqual((8, 0, 1, 4, 0, 0), self._run_tests(
+            expectedFailure(criteria=lambda data: data['a'] == 5)(
+                case_cls_)))
+
+    def test_914_DecoratorFactory(self):
+        """Confirm that the decorator_method is called for each test method"""
+        def retries(count):
+            attempts = []
+
+            def decorator(method):
+                def wrapper(self):
+                    attempts.append(self._testMethodName)
+                    return method(self)
+                wrapper.attempts = attempts
+                return wrapper
+            return decorator
+
+        decoration = DecorateTestMethod(
+            criteria=lambda data: data['a'] > 5, decorator_method=retries,
+            decorator_args=(3,))
+        for case_cls_ in (decoration(self._generate()),
+                          self._generate(decorators=[decoration])):
+            self.assertIsNot(case_cls_.test_006_Fused.attempts,
+                             case_cls_.test_007_Fused.attempts)
+            self._run_tests(case_cls_)
+            self.assertEqual(case_cls_.test_006_Fused.attempts,
+                             ['test_006_Fused'])
+
+    def test_915_InvalidDecorator(self):
+        """Confirm that only DecorateTestMethod decorators are accepted"""
+        with six.assertRaisesRegex(self, TypeError,
+                                   r'decorators item 1 is not.*'):
+            self._generate(decorators=[skip('Skipped'), unittest.skip])
+
+
+class TestDuplicateCases(unittest.TestCase):
+    def setUp(self):
+        self.built = []
+        suite_test = self
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            suite_test.built.append(index)
+
+            # noinspection PyShadowingNames
+            def test_method(self):
+                self.assertEqual(a + 1, b['value'])
+
+            return test_method
+
+        self.test_method = wrapper
+
+        # Nested, unhashable values with different key orders
+        self.test_cases = [{'a': 1, 'b': {'value': 2, 'tags': ['x']}},
+                           {'a': 2, 'b': {'value': 3, 'tags': []}},
+                           {'b': {'tags': ['x'], 'value': 2}, 'a': 1},
+                           {'a': 2, 'b': {'value': 3, 'tags': []}},
+                           {'a': 1, 'b': {'value': 2, 'tags': ['y']}}]
+
+    def _generate(self, **kwargs):
+        return GenerateTestMethods(
+            test_name='Duplicate',
+            test_method=self.test_method,
+            test_cases=self.test_cases,
+            **kwargs)(type('EmptyClass', (unittest.TestCase, object), {}))
+
+    def test_950_InvalidDuplicates(self):
+        """Confirm that an invalid duplicates argument is rejected"""
+        with six.assertRaisesRegex(self, ValueError, r'duplicates.*'):
+            self._generate(duplicates='ignore')
+
+    def test_955_CollapseDuplicates(self):
+        """Confirm that duplicates are collapsed and recorded as aliases"""
+        case_cls_ = self._generate(duplicates='collapse')
+        registry = case_cls_._RTF_METHODS
+
+        self.assertEqual(self.built, [0, 1, 4])
+        self.assertEqual(registry.indices(), [0, 1, 4])
+        self.assertEqual(registry.aliases(0), [2])
+        self.assertEqual(registry.aliases(4), [])
+        self.assertEqual(registry.duplicates(), {0: [2], 1: [3]})
+
+        # Without the option every test case is generated
+        self.assertEqual(len(self._generate()._RTF_METHODS), 5)
+
+    def test_960_RaiseDuplicates(self):
+        """Confirm that duplicates can be rejected"""
+        with six.assertRaisesRegex(self, ValueError,
+                                   r'test_cases item 2 is a duplicate of '
+                                   r'item 0'):
+            self._generate(duplicates='raise')
+
+    def test_965_CollapsedMethod(self):
+        """Confirm that duplicates are removed from a collapsed method"""
+        case_cls_ = self._generate(duplicates='collapse', collapse=True)
+        result = unittest.TestResult()
+        case_cls_('test_Duplicate').run(result)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(self.built, [0, 1, 4])
+        self.assertEqual(case_cls_._RTF_METHODS.duplicates(),
+                         {0: [2], 1: [3]})
+
+
+class TestFailureLimit(unittest.TestCase):
+    def setUp(self):
+        self.executed = []
+        suite_test = self
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, passes):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                suite_test.executed.append(a)
+                self.assertTrue(passes)
+
+            return test_method
+
+        self.test_method = wrapper
+
+    def _generate(self, test_name, passes, **kwargs):
+        return GenerateTestMethods(
+            test_name=test_name,
+            test_method=self.test_method,
+            test_cases=[{'a': a, 'passes': passes} for a in range(10)],
+            **kwargs)(type('EmptyClass', (unittest.TestCase, object), {}))
+
+    @staticmethod
+    def _run(*classes):
+        result = unittest.TestResult()
+        loader = unittest.TestLoader()
+        unittest.TestSuite(loader.loadTestsFromTestCase(cls_)
+                           for cls_ in classes).run(result)
+        return result
+
+    def test_970_InvalidMaxFailures(self):
+        """Confirm that an invalid max_failures is rejected"""
+        with six.assertRaisesRegex(self, ValueError, r'max_failures.*'):
+            self._generate('Limit', False, max_failures=0)
+
+    def test_975_AbortGroup(self):
+        """Confirm that a group is skipped once the limit is reached"""
+        failing = self._generate('Failing', False, max_failures=3)
+        passing = self._generate('Passing', True, max_failures=3)
+        result = self._run(failing, passing)
+
+        self.assertEqual(result.testsRun, 20)
+        self.assertEqual(len(result.failures), 3)
+        self.assertEqual(set(reason for _, reason in result.skipped),
+                         {'Failing aborted after 3 failures'})
+        self.assertEqual(len(result.skipped), 7)
+
+        # The other group executes every test case
+        self.assertEqual(self.executed, [0, 1, 2] + list(range(10)))
+
+    def test_980_ExpectedFailures(self):
+        """Confirm that expected failures are not counted"""
+        failing = expectedFailure(criteria=lambda data: data['a'] < 5)(
+            self._generate('Expected', False, max_failures=2))
+        result = self._run(failing)
+
+        self.assertEqual(len(result.expectedFailures), 5)
+        self.assertEqual(len(result.failures), 2)
+        self.assertEqual(len(result.skipped), 3)
+
+    def test_985_CollapsedMethod(self):
+        """Confirm that the limit applies to a collapsed test method"""
+        failing = self._generate('Collapsed', False, max_failures=2,
+                                 collapse=True)
+        result = self._run(failing)
+
+        self.assertEqual(self.executed, [0, 1])
+        self.assertEqual(len(result.failures), 2)
+        self.assertEqual(len(result.skipped), 8)
+
+    def test_990_RepeatedRuns(self):
+        """Confirm that each run of the class counts it's own failures"""
+        failing = self._generate('Repeated', False, max_failures=3)
+        for _ in range(2):
+            result = self._run(failing)
+            self.assertEqual(len(result.failures), 3)
+            self.assertEqual(len(result.skipped), 7)
+
+
 # noinspection PyUnusedLocal
 def load_tests(loader, tests=None, pattern=None):
     classes = [TestErrorChecking,
                TestMethodGeneration,
                TestMethodExecution,
-               DecoratedTestExecution]
+               DecoratedTestExecution,
+               TestLazyGeneration,
+               TestMethodRegistry,
+               TestCollapsedGeneration,
+               TestBatchGeneration,
+               TestSharding,
+               TestFusedDecorators,
+               TestDuplicateCases,
+               TestFailureLimit]
     suite = unittest.TestSuite()
     for test_class in classes:
         tests = loader.loadTestsFromTestCase(test_class)
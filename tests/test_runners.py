@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for runners.py
+
+Summary :
+    Tests for the parallel execution of generated test methods
+Use Case :
+    As a user I want to execute generated test methods in parallel
+    So that large test suites complete quickly
+
+Testable Statements :
+    Can I execute the generated test methods in a pool of processes
+    Can I execute the generated test methods in a pool of threads
+    Can I execute the test methods which failed recently first
+    Can I limit a run to a time budget
+    Are failures, skips and expected failures reported as normal
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import six
+
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import PrioritySuite
+from repeatedtestframework import ProcessPoolSuite
+from repeatedtestframework import ResultStore
+from repeatedtestframework import ThreadPoolSuite
+from repeatedtestframework import expectedFailure
+from repeatedtestframework import skip
+from repeatedtestframework.runners import BUDGET_SKIP
+from tests import sample_cases
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+def _summary(result):
+    return result.testsRun, len(result.errors), len(
+        result.failures), len(result.skipped), len(
+        result.expectedFailures), len(result.unexpectedSuccesses)
+
+
+class TestProcessPoolSuite(unittest.TestCase):
+    def test_010_NotDecorated(self):
+        """Confirm that an undecorated class is rejected"""
+        with six.assertRaisesRegex(self, TypeError, r'Incorrect usage.*'):
+            ProcessPoolSuite(unittest.TestCase)
+
+    def test_015_NotImportable(self):
+        """Confirm that a class which cannot be imported is rejected"""
+        # noinspection PyUnusedLocal
+        def wrapper(index, a):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                pass
+            return test_method
+
+        cls_ = GenerateTestMethods(
+            test_name='NotImportable',
+            test_method=wrapper,
+            test_cases=[{'a': 1}])(
+            type('EmptyClass', (unittest.TestCase, object), {}))
+
+        with six.assertRaisesRegex(self, TypeError,
+                                   r'.*cannot be imported.*'):
+            ProcessPoolSuite(cls_)
+
+    def test_020_InvalidChunkSize(self):
+        """Confirm that the chunk size must be positive"""
+        with six.assertRaisesRegex(self, ValueError, r'chunk_size.*'):
+            ProcessPoolSuite(sample_cases.AdditionCases, chunk_size=0)
+
+    def test_030_Execution(self):
+        """Confirm that outcomes from the workers are reported in order"""
+        suite = ProcessPoolSuite(sample_cases.AdditionCases,
+                                 max_workers=2, chunk_size=3)
+        self.assertEqual(suite.countTestCases(), 8)
+
+        result = suite.run(unittest.TestResult())
+
+        self.assertEqual((8, 0, 1, 1, 1, 0), _summary(result))
+        self.assertEqual(result.failures[0][0].id(),
+                         'tests.sample_cases.AdditionCases.test_002_Addition')
+        self.assertIn('AssertionError', result.failures[0][1])
+        self.assertEqual(result.skipped[0][0].id(),
+                         'tests.sample_cases.AdditionCases.test_003_Addition')
+        self.assertEqual(result.skipped[0][1], 'Skipped because a == 3')
+        self.assertEqual(result.expectedFailures[0][0].id(),
+                         'tests.sample_cases.AdditionCases.test_005_Addition')
+
+    def test_035_FailFast(self):
+        """Confirm that remaining chunks are abandoned when stopping"""
+        suite = ProcessPoolSuite(sample_cases.AdditionCases,
+                                 max_workers=1, chunk_size=3)
+        result = unittest.TestResult()
+        result.failfast = True
+
+        suite.run(result)
+
+        self.assertEqual(result.testsRun, 3)
+        self.assertTrue(result.shouldStop)
+
+
+class TestThreadPoolSuite(unittest.TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.class_fixtures = []
+        suite_test = self
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                with suite_test.lock:
+                    suite_test.running += 1
+                    suite_test.peak = max(suite_test.peak,
+                                          suite_test.running)
+                time.sleep(0.01)
+                with suite_test.lock:
+                    suite_test.running -= 1
+                self.assertEqual(a + 1, b)
+
+            return test_method
+
+        # noinspection PyUnusedLocal
+        def set_up_class(cls):
+            suite_test.class_fixtures.append('setUpClass')
+
+        # noinspection PyUnusedLocal
+        def tear_down_class(cls):
+            suite_test.class_fixtures.append('tearDownClass')
+
+        self.cls_ = type('EmptyClass', (unittest.TestCase, object),
+                         {'setUpClass': classmethod(set_up_class),
+                          'tearDownClass': classmethod(tear_down_class)})
+        self.test_method = wrapper
+
+    def _generate(self, num_test_cases, fail=()):
+        return GenerateTestMethods(
+            test_name='ThreadPool',
+            test_method=self.test_method,
+            test_cases=[{'a': a, 'b': a + 1 if a not in fail else 0}
+                        for a in range(num_test_cases)])(self.cls_)
+
+    def test_110_InvalidMaxWorkers(self):
+        """Confirm that max_workers must be positive"""
+        with six.assertRaisesRegex(self, ValueError, r'max_workers.*'):
+            ThreadPoolSuite(self._generate(2), max_workers=0)
+
+    def test_115_Collapsed(self):
+        """Confirm that a collapsed test method is rejected"""
+        case_cls_ = GenerateTestMethods(
+            test_name='ThreadPool',
+            test_method=self.test_method,
+            test_cases=[{'a': 1, 'b': 2}],
+            collapse=True)(self.cls_)
+        with six.assertRaisesRegex(self, TypeError, r'.*collapsed.*'):
+            ThreadPoolSuite(case_cls_)
+        with six.assertRaisesRegex(self, TypeError, r'.*collapsed.*'):
+            PrioritySuite(case_cls_, ResultStore())
+
+    def test_120_Concurrency(self):
+        """Confirm that test methods execute concurrently within the bound"""
+        suite = ThreadPoolSuite(self._generate(12), max_workers=3)
+
+        result = suite.run(unittest.TestResult())
+
+        self.assertEqual((12, 0, 0, 0, 0, 0), _summary(result))
+        self.assertTrue(1 < self.peak <= 3)
+        self.assertEqual(self.class_fixtures,
+                         ['setUpClass', 'tearDownClass'])
+
+    def test_130_Decorators(self):
+        """Confirm that skip and expectedFailure are honoured"""
+        case_cls_ = expectedFailure(criteria=lambda data: data['a'] == 5)(
+            skip('Skipped because a == 3',
+                 criteria=lambda data: data['a'] == 3)(
+                self._generate(8, fail=(2, 5))))
+
+        result = ThreadPoolSuite(case_cls_).run(unittest.TestResult())
+
+        self.assertEqual((8, 0, 1, 1, 1, 0), _summary(result))
+        self.assertEqual(result.failures[0][0].id(),
+                         'tests.test_runners.EmptyClass.test_002_ThreadPool')
+        self.assertEqual(result.skipped[0][0].id(),
+                         'tests.test_runners.EmptyClass.test_003_ThreadPool')
+        self.assertEqual(result.expectedFailures[0][0].id(),
+                         'tests.test_runners.EmptyClass.test_005_ThreadPool')
+
+    def test_140_FailFast(self):
+        """Confirm that no more test methods start once told to stop"""
+        result = unittest.TestResult()
+        result.failfast = True
+
+        ThreadPoolSuite(self._generate(20, fail=(0,)),
+                        max_workers=2).run(result)
+
+        self.assertTrue(result.shouldStop)
+        self.assertTrue(result.testsRun < 20)
+        self.assertEqual(len(result.failures), 1)
+
+
+class TestPrioritySuite(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'results.json')
+        self.executed = []
+        self.fail = set()
+        self.clock = [0]
+        suite_test = self
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                suite_test.executed.append(a)
+                suite_test.clock[0] += 1
+                self.assertNotIn(a, suite_test.fail)
+
+            return test_method
+
+        self.test_method = wrapper
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _run(self, num_test_cases, result=None, budget=None):
+        cls_ = skip('Skipped because a == 1',
+                    criteria=lambda data: data['a'] == 1)(
+            GenerateTestMethods(
+                test_name='Priority',
+                test_method=self.test_method,
+                test_cases=[{'a': a} for a in range(num_test_cases)])(
+                type('EmptyClass', (unittest.TestCase, object), {})))
+        del self.executed[:]
+        self.clock[0] = 0
+        suite = PrioritySuite(cls_, ResultStore(self.path), budget=budget)
+        # Each test method takes one second of the fake clock
+        suite._clock = lambda: self.clock[0]
+        return suite.run(result or unittest.TestResult())
+
+    def test_200_FailuresFirst(self):
+        """Confirm that failures, then new test cases, execute first"""
+        self.fail.update([3, 5])
+        result = self._run(6)
+        self.assertEqual(self.executed, [0, 2, 3, 4, 5])
+        self.assertEqual((6, 0, 2, 1, 0, 0), _summary(result))
+
+        # The failures first, then the new test case, then the skip
+        self.fail.clear()
+        self._run(7)
+        self.assertEqual(self.executed, [3, 5, 6, 0, 2, 4])
+
+    def test_210_FailFast(self):
+        """Confirm that a repeated failure is reported immediately"""
+        self.fail.add(4)
+        self._run(6)
+
+        result = unittest.TestResult()
+        result.failfast = True
+        self._run(6, result)
+
+        self.assertEqual(self.executed, [4])
+        self.assertEqual(len(result.failures), 1)
+
+        # The interrupted run is saved too
+        self.assertEqual(ResultStore(self.path).run, 3)
+
+    def test_220_Budget(self):
+        """Confirm that no test method starts once the budget is used"""
+        result = self._run(8, budget=3)
+        self.assertEqual(self.executed, [0, 2, 3])
+
+        # The skip is executed, and the rest are reported as not run
+        not_run = [test.id().rsplit('.', 1)[1]
+                   for test, reason in result.skipped
+                   if reason == BUDGET_SKIP]
+        self.assertEqual(not_run, ['test_004_Priority', 'test_005_Priority',
+                                   'test_006_Priority', 'test_007_Priority'])
+        self.assertEqual(result.testsRun, 8)
+
+    def test_230_BudgetRotation(self):
+        """Confirm that a series of budgeted runs executes every case"""
+        self._run(8)
+
+        self.fail.add(6)
+        self._run(8, budget=3)
+        self.assertEqual(self.executed, [0, 2, 3])
+        self._run(8, budget=3)
+        self.assertEqual(self.executed, [4, 5, 6])
+
+        # The failure first, then the least recently executed
+        self.fail.clear()
+        self._run(8, budget=3)
+        self.assertEqual(self.executed, [6, 7, 0])
+        self._run(8, budget=3)
+        self.assertEqual(self.executed, [6, 2, 3])
+
+    def test_240_BudgetLazy(self):
+        """Confirm that lazy test methods which are not run aren't built"""
+        built = []
+
+        def wrapper(index, a):
+            built.append(index)
+            return self.test_method(index, a)
+
+        cls_ = GenerateTestMethods(
+            test_name='Priority',
+            test_method=wrapper,
+            test_cases=[{'a': a} for a in range(8)],
+            lazy=True)(type('EmptyClass', (unittest.TestCase, object), {}))
+        suite = PrioritySuite(cls_, ResultStore(self.path), budget=3)
+        suite._clock = lambda: self.clock[0]
+        result = suite.run(unittest.TestResult())
+
+        self.assertEqual(self.executed, [0, 1, 2])
+        self.assertEqual(built, [0, 1, 2])
+
+        # The not run test methods are still described in full
+        test, reason = result.skipped[0]
+        self.assertEqual(reason, BUDGET_SKIP)
+        expected = cls_('test_003_Priority')
+        self.assertEqual(test.id(), expected.id())
+        self.assertEqual(str(test), str(expected))
+        self.assertEqual(test.shortDescription(),
+                         expected.shortDescription())
+        self.assertEqual(result.testsRun, 8)
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestProcessPoolSuite,
+               TestThreadPoolSuite,
+               TestPrioritySuite]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for scheduling.py
+
+Summary :
+    Tests for the duration balanced scheduling of generated test methods
+Use Case :
+    As a user I want my shards and workers to finish at the same time
+    So that the whole suite completes as quickly as possible
+
+Testable Statements :
+    Can I record the duration of each test case and save it to a file
+    Is a cost estimated for test cases with no history
+    Are the test cases balanced between shards by duration
+    Are the test cases which failed recently executed first
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import six
+
+from repeatedtestframework import DurationHistory
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import Instrumentation
+from repeatedtestframework import ProcessPoolSuite
+from repeatedtestframework import ResultStore
+from repeatedtestframework import ThreadPoolSuite
+from repeatedtestframework import lpt_partition
+from tests import sample_cases
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+class TestDurationScheduling(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.executed = []
+        suite_test = self
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                suite_test.executed.append(index)
+
+            return test_method
+
+        self.test_method = wrapper
+
+        # The slow test cases are clustered at the start of the data set
+        self.test_cases = [{'a': a} for a in range(12)]
+        self.history = DurationHistory()
+        for case in self.test_cases:
+            self.history.record('Duration', case,
+                                10.0 if case['a'] < 4 else 1.0)
+
+        environment = os.environ.pop('RTF_SHARD', None)
+        if environment is not None:
+            self.addCleanup(os.environ.__setitem__, 'RTF_SHARD', environment)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _generate(self, **kwargs):
+        return GenerateTestMethods(
+            test_name='Duration',
+            test_method=self.test_method,
+            test_cases=self.test_cases,
+            **kwargs)(type('EmptyClass', (unittest.TestCase, object), {}))
+
+    def test_010_LPTPartition(self):
+        """Confirm that items are partitioned longest first"""
+        partition = lpt_partition([('a', 1), ('b', 7), ('c', 3), ('d', 4),
+                                   ('e', 5)], 2)
+        self.assertEqual(partition, [['b', 'c'], ['e', 'd', 'a']])
+        self.assertEqual(lpt_partition([], 3), [[], [], []])
+
+    def test_020_SaveAndLoad(self):
+        """Confirm that durations from an Instrumentation are saved"""
+        instrumentation = Instrumentation()
+        cls_ = self._generate(instrumentation=instrumentation)
+        unittest.TestLoader().loadTestsFromTestCase(cls_).run(
+            unittest.TestResult())
+
+        path = os.path.join(self.dir, 'durations.json')
+        history = DurationHistory(path, smoothing=1.0)
+        history.update(instrumentation.records)
+        history.save()
+
+        loaded = DurationHistory(path)
+        self.assertEqual(len(loaded), 12)
+        self.assertEqual(loaded.estimate('Duration', {'a': 3}),
+                         history.estimate('Duration', {'a': 3}))
+
+        with six.assertRaisesRegex(self, ValueError, r'No path.*'):
+            DurationHistory().save()
+
+    def test_030_Estimates(self):
+        """Confirm that test cases with no history are estimated"""
+        self.history.record('Other', {'a': 1}, 20.0)
+        self.history.record('Duration', {'a': 0}, 20.0)
+
+        # Smoothing averages the new duration with the stored duration
+        self.assertEqual(self.history.estimate('Duration', {'a': 0}), 15.0)
+        self.assertEqual(self.history.estimate('Duration', {'a': 99}), 1.0)
+        self.assertEqual(self.history.estimate('Unknown', {'a': 99}), 1.0)
+        self.assertEqual(DurationHistory(default=2.5).estimate(
+            'Unknown', {'a': 1}), 2.5)
+
+    def test_040_DurationShards(self):
+        """Confirm that shards are balanced by duration"""
+        with six.assertRaisesRegex(self, ValueError, r'.*requires a history'):
+            self._generate(shard=(0, 2), shard_by='duration')
+
+        shards = [list(self._generate(
+            shard=(k, 4), shard_by='duration',
+            history=self.history)._RTF_METHODS.indices()) for k in range(4)]
+
+        self.assertEqual(sorted(sum(shards, [])), list(range(12)))
+        totals = [sum(self.history.estimate('Duration', {'a': index})
+                      for index in shard) for shard in shards]
+        self.assertEqual(totals, [12.0] * 4)
+
+    def test_050_PoolOrder(self):
+        """Confirm that a pool executes the longest test methods first"""
+        self.history.record('Duration', {'a': 9}, 50.0)
+        suite = ThreadPoolSuite(self._generate(), max_workers=1,
+                                history=self.history)
+        result = suite.run(unittest.TestResult())
+
+        self.assertEqual(result.testsRun, 12)
+        self.assertEqual(self.executed,
+                         [9, 0, 1, 2, 3, 4, 5, 6, 7, 8, 10, 11])
+
+    def test_055_ProcessPoolChunks(self):
+        """Confirm that the chunks of a process pool are balanced"""
+        history = DurationHistory()
+        for _, index, case in sample_cases.AdditionCases._RTF_METHODS.\
+                entries():
+            history.record('Addition', case, 10.0 if index < 4 else 1.0)
+        suite = ProcessPoolSuite(sample_cases.AdditionCases, chunk_size=2,
+                                 history=history)
+        chunks = suite._chunks()
+
+        self.assertEqual(sorted(sum(chunks, [])), list(range(8)))
+        self.assertEqual([len(chunk) for chunk in chunks], [2] * 4)
+        # Each chunk has one of the slow test cases, longest first
+        self.assertEqual(sorted(chunk[0] for chunk in chunks), [0, 1, 2, 3])
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'results.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_100_Priorities(self):
+        """Confirm that recent failures come first, then new test cases"""
+        store = ResultStore(self.path, recent=2)
+        for a in range(4):
+            store.record('Store', {'a': a}, failed=a == 2)
+        store.save()
+
+        store = ResultStore(self.path, recent=2)
+        self.assertEqual(store.run, 2)
+        store.record('Store', {'a': 3}, failed=True)
+        self.assertEqual(store.order('Store', enumerate(
+            [{'a': a} for a in range(6)])), [3, 2, 4, 5, 0, 1])
+        self.assertEqual(store.last_run('Store', {'a': 0}), 1)
+        self.assertIsNone(store.last_run('Other', {'a': 0}))
+        store.save()
+
+        # The failure in the first run is no longer recent
+        store = ResultStore(self.path, recent=2)
+        store.save()
+        store = ResultStore(self.path, recent=2)
+        self.assertEqual(store.order('Store', enumerate(
+            [{'a': a} for a in range(4)])), [3, 0, 1, 2])
+
+    def test_110_InvalidArguments(self):
+        """Confirm that invalid arguments are rejected"""
+        with six.assertRaisesRegex(self, ValueError, r'recent.*'):
+            ResultStore(recent=0)
+        with six.assertRaisesRegex(self, ValueError, r'No path.*'):
+            ResultStore().save()
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestDurationScheduling,
+               TestResultStore]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+# Repeated Test Framework : Test Suite for sources.py
+
+Summary :
+    Tests for the file backed sources of test cases
+Use Case :
+    As a user I want to generate test methods from a large data file
+    So that I do not need to load the whole data set into memory
+
+Testable Statements :
+    Can I generate test methods from a JSON Lines file
+    Can I generate test methods from a CSV file
+    Is each record only parsed when it is used
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import six
+
+from repeatedtestframework import GenerateTestMethods
+from repeatedtestframework import CSVSource
+from repeatedtestframework import JSONLSource
+
+__version__ = "0.1"
+__author__ = 'Tony Flury : anthony.flury@btinternet.com'
+__created__ = '17 Oct 2026'
+
+
+class TestFileSources(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+        # noinspection PyUnusedLocal
+        def wrapper(index, a, b):
+            # noinspection PyShadowingNames
+            def test_method(self):
+                self.assertEqual(int(a) + 1, int(b))
+
+            return test_method
+
+        self.cls_ = type('EmptyClass', (unittest.TestCase, object), {})
+        self.test_method = wrapper
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with open(path, 'wb') as data_file:
+            data_file.write(content.encode('utf-8'))
+        return path
+
+    def _jsonl(self, cases):
+        return self._write('cases.jsonl', '\n'.join(
+            json.dumps(case) for case in cases) + '\n')
+
+    @staticmethod
+    def _run_tests(test_class):
+        loader = unittest.TestLoader()
+        suite = loader.loadTestsFromTestCase(test_class)
+        result = unittest.result.TestResult()
+        suite.run(result=result)
+        summary = result.testsRun, len(result.errors), len(
+            result.failures), len(result.skipped), len(
+            result.expectedFailures), len(result.unexpectedSuccesses)
+
+        return summary, result
+
+    def test_010_JSONLIndex(self):
+        """Confirm that a JSONL source indexes each record by offset"""
+        path = self._write('cases.jsonl',
+                           '{"a": 1, "b": 2}\n\n{"a": 2, "b": 3}\n')
+        with JSONLSource(path) as source:
+            self.assertEqual(len(source), 2)
+            self.assertEqual(source.offset(0), 0)
+            self.assertEqual(source.offset(1), 18)
+            self.assertEqual(source[1].offset, 18)
+            self.assertEqual(dict(source[1]), {'a': 2, 'b': 3})
+            self.assertEqual(dict(source[-1]), {'a': 2, 'b': 3})
+            with self.assertRaises(IndexError):
+                source[2]
+
+    def test_015_JSONLNotObject(self):
+        """Confirm that a JSONL record which is not an object is rejected"""
+        path = self._write('cases.jsonl', '[1, 2]\n')
+        with JSONLSource(path) as source:
+            with six.assertRaisesRegex(self, ValueError,
+                                       r'record 0 .* not a JSON object'):
+                source.load(0)
+
+    def test_020_JSONLEmpty(self):
+        """Confirm that an empty file is an empty source"""
+        with JSONLSource(self._write('empty.jsonl', '')) as source:
+            self.assertEqual(len(source), 0)
+
+    def test_030_CSVQuotedNewline(self):
+        """Confirm that a CSV source copes with quoted newlines"""
+        path = self._write('cases.csv',
+                           'a,b,text\n1,2,"first\nsecond"\n2,3,plain\n')
+        with CSVSource(path, converters={'a': int}) as source:
+            self.assertEqual(len(source), 2)
+            self.assertEqual(dict(source[0]),
+                             {'a': 1, 'b': '2', 'text': 'first\nsecond'})
+            self.assertEqual(dict(source[1]),
+                             {'a': 2, 'b': '3', 'text': 'plain'})
+
+    def test_040_GenerateFromJSONL(self):
+        """Confirm that test methods can be generated from a JSONL source"""
+        source = JSONLSource(self._jsonl([{'a': 1, 'b': 2},
+                                          {'a': 2, 'b': 3},
+                                          {'a': 3, 'b': 3}]))
+        self.addCleanup(source.close)
+
+        case_cls_ = GenerateTestMethods(
+            test_name='FileSource',
+            test_method=self.test_method,
+            test_cases=source,
+            lazy=True)(self.cls_)
+
+        summary, result = self._run_tests(case_cls_)
+        self.assertEqual((3, 0, 1, 0, 0, 0), summary)
+        self.assertEqual(result.failures[0][0].id(),
+                         'tests.test_sources.'
+                         'EmptyClass.test_002_FileSource')
+        self.assertEqual(
+            case_cls_._RTF_METHODS['test_002_FileSource']['test_data'].offset,
+            source.offset(2))
+
+    def test_045_GenerateFromCSV(self):
+        """Confirm that test methods can be generated from a CSV source"""
+        source = CSVSource(self._write('cases.csv', 'a,b\n1,2\n2,3\n'))
+        self.addCleanup(source.close)
+
+        case_cls_ = GenerateTestMethods(
+            test_name='FileSource',
+            test_method=self.test_method,
+            test_cases=source)(self.cls_)
+
+        summary, result = self._run_tests(case_cls_)
+        self.assertEqual((2, 0, 0, 0, 0, 0), summary)
+
+
+# noinspection PyUnusedLocal
+def load_tests(loader, tests=None, pattern=None):
+    classes = [TestFileSources]
+    suite = unittest.TestSuite()
+    for test_class in classes:
+        tests = loader.loadTestsFromTestCase(test_class)
+        suite.addTests(tests)
+    return suite
+
+
+if __name__ == '__main__':
+    ldr = unittest.TestLoader()
+
+    test_suite = load_tests(ldr)
+
+    unittest.TextTestRunner(verbosity=2).run(test_suite)